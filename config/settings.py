@@ -1,5 +1,7 @@
 # Game Configuration Settings
 
+from enum import IntEnum
+
 # Screen dimensions
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
@@ -56,14 +58,26 @@ CONTROL_PAUSE = ['p', 'P', 'ESCAPE']
 ENABLE_SOUND = True
 MASTER_VOLUME = 0.7
 
-# Game states
-STATE_MENU = "menu"
-STATE_PLAYING = "playing"
-STATE_PAUSED = "paused"
-STATE_GAME_OVER = "game_over"
-STATE_LEVEL_COMPLETE = "level_complete"
-STATE_EDITOR = "editor"
-STATE_BACKSTORY = "backstory"
+# Game states (small ints: cheap to compare and to hash as handler keys)
+class GameState(IntEnum):
+    MENU = 0
+    PLAYING = 1
+    PAUSED = 2
+    GAME_OVER = 3
+    LEVEL_COMPLETE = 4
+    EDITOR = 5
+    BLOCK_EDITOR = 6
+    BACKSTORY = 7
+
+
+STATE_MENU = GameState.MENU
+STATE_PLAYING = GameState.PLAYING
+STATE_PAUSED = GameState.PAUSED
+STATE_GAME_OVER = GameState.GAME_OVER
+STATE_LEVEL_COMPLETE = GameState.LEVEL_COMPLETE
+STATE_EDITOR = GameState.EDITOR
+STATE_BLOCK_EDITOR = GameState.BLOCK_EDITOR
+STATE_BACKSTORY = GameState.BACKSTORY
 
 # Levels
 NUM_LEVELS = 3
@@ -4,12 +4,34 @@ Implements rule-based logic, machine learning, and behavior trees
 """
 
 import math
+import os
 import random
+from collections import namedtuple
+from functools import cached_property
+from operator import attrgetter
 from typing import Dict, List, Tuple, Optional
 from enum import Enum
 from numpy import array as np_array
 import numpy as np
 
+from src.nn_kernels import nn_backward, nn_forward
+
+
+# Set DEBUG_AI=1 to log and skip failing rules instead of raising
+DEBUG_AI = bool(os.environ.get('DEBUG_AI'))
+
+Rule = namedtuple('Rule', 'condition action priority')
+
+# Precision used for neural network weights and activations
+NN_DTYPE = np.float32
+
+# Shared generator for weight initialization, seeded once per process
+_rng = np.random.default_rng()
+
+
+def _noop():
+    """Stand-in for an action the controlled enemy does not have"""
+
 
 class AIType(Enum):
     """Types of AI behavior"""
@@ -30,9 +52,12 @@ class RuleBasedAI:
             enemy: Enemy object to control
         """
         self.enemy = enemy
-        self.rules = []
+        self.rules: List[Rule] = []  # Kept sorted by priority, highest first
         self.priorities = {}
 
+        if DEBUG_AI:
+            self.update = self._update_debug
+
     def add_rule(self, condition_func, action_func, priority: int = 5):
         """
         Add a rule to the AI
@@ -42,13 +67,11 @@ class RuleBasedAI:
             action_func: Function to execute if condition is True
             priority: Higher priority rules execute first (0-10)
         """
+        assert callable(condition_func) and callable(action_func), "Rule parts must be callable"
         rule_id = len(self.rules)
-        self.rules.append({
-            'id': rule_id,
-            'condition': condition_func,
-            'action': action_func,
-            'priority': priority
-        })
+        self.rules.append(Rule(condition_func, action_func, priority))
+        # Stable sort keeps insertion order among rules of equal priority
+        self.rules.sort(key=attrgetter('priority'), reverse=True)
         self.priorities[rule_id] = priority
 
     def add_default_patrol_ai(self):
@@ -78,14 +101,20 @@ class RuleBasedAI:
         Returns:
             True if any action was executed
         """
-        # Sort rules by priority
-        sorted_rules = sorted(self.rules, key=lambda r: r['priority'], reverse=True)
+        # Execute first rule that matches (rules are already sorted by priority)
+        for condition, action, _ in self.rules:
+            if condition():
+                action()
+                return True
 
-        # Execute first rule that matches
-        for rule in sorted_rules:
+        return False
+
+    def _update_debug(self, player, level) -> bool:
+        """Same as update, but logs and skips rules that raise"""
+        for condition, action, _ in self.rules:
             try:
-                if rule['condition']():
-                    rule['action']()
+                if condition():
+                    action()
                     return True
             except Exception as e:
                 print(f"Rule error: {e}")
@@ -94,14 +123,34 @@ class RuleBasedAI:
         return False
 
 
+class BTNode:
+    """Single behavior tree node"""
+    __slots__ = ('kind', 'children', 'fn', 'key')
+
+    def __init__(self, kind: int, children: Tuple['BTNode', ...] = (), fn=None, key=None):
+        """
+        Initialize tree node
+
+        Args:
+            kind: One of the BehaviorTree.NodeType constants
+            children: Child nodes (composites only)
+            fn: Condition or action callable (leaves only)
+            key: Cache key shared by identical conditions within a tick
+        """
+        self.kind = kind
+        self.children = tuple(children)
+        self.fn = fn
+        self.key = key
+
+
 class BehaviorTree:
     """Behavior tree implementation for complex AI"""
 
-    class NodeType(Enum):
-        SEQUENCE = "sequence"      # All children must succeed
-        SELECTOR = "selector"      # First successful child wins
-        ACTION = "action"           # Performs an action
-        CONDITION = "condition"     # Checks a condition
+    class NodeType:
+        SEQUENCE = 0      # All children must succeed
+        SELECTOR = 1      # First successful child wins
+        CONDITION = 2     # Checks a condition
+        ACTION = 3        # Performs an action
 
     def __init__(self, enemy):
         """
@@ -112,71 +161,158 @@ class BehaviorTree:
         """
         self.enemy = enemy
         self.root = None
+        self._ticked_fn = None  # Root compiled into plain closures
+        self._tick_cache = {}  # Condition results for the current execute() call
+
+        if DEBUG_AI:
+            self.execute = self._execute_debug
 
     def create_patrol_and_chase_tree(self):
         """Create a simple patrol -> chase behavior tree"""
+        NodeType = self.NodeType
+        enemy = self.enemy
         # Root is a selector (try approaches in order)
-        self.root = {
-            'type': self.NodeType.SELECTOR,
-            'children': [
-                # Try chase first if player visible
-                {
-                    'type': self.NodeType.SEQUENCE,
-                    'children': [
-                        {
-                            'type': self.NodeType.CONDITION,
-                            'condition': lambda: self.enemy.can_see_player(range=200)
-                        },
-                        {
-                            'type': self.NodeType.ACTION,
-                            'action': lambda: self.enemy.chase_mode()
-                        }
-                    ]
-                },
-                # Otherwise patrol
-                {
-                    'type': self.NodeType.ACTION,
-                    'action': lambda: self.enemy.patrol()
-                }
-            ]
-        }
+        self.set_root(BTNode(NodeType.SELECTOR, (
+            # Try chase first if player visible
+            BTNode(NodeType.SEQUENCE, (
+                BTNode(NodeType.CONDITION, fn=lambda: enemy.can_see_player(range=200),
+                       key='see_player_200'),
+                BTNode(NodeType.ACTION, fn=enemy.chase_mode),
+            )),
+            # Otherwise patrol
+            BTNode(NodeType.ACTION, fn=enemy.patrol),
+        )))
+
+    def set_root(self, root: BTNode):
+        """
+        Install a tree, validating it and compiling it for execution
 
-    def execute(self):
-        """Execute the behavior tree"""
-        if self.root:
-            return self._execute_node(self.root)
-        return False
+        Args:
+            root: Root node of the new tree
+        """
+        self._validate(root)
+        self.root = root
+        self._ticked_fn = self._compile(root, self._shared_keys(root))
 
-    def _execute_node(self, node):
-        """Execute a single tree node"""
-        try:
-            if node['type'] == self.NodeType.SEQUENCE:
-                # All children must succeed
-                for child in node.get('children', []):
-                    if not self._execute_node(child):
-                        return False
-                return True
+    def _validate(self, node: BTNode):
+        """
+        Check a tree's structure once so ticks can run without guards
 
-            elif node['type'] == self.NodeType.SELECTOR:
-                # First successful child wins
-                for child in node.get('children', []):
-                    if self._execute_node(child):
-                        return True
-                return False
+        Args:
+            node: Root of the (sub)tree to check
+        """
+        NodeType = self.NodeType
+        if node.kind in (NodeType.SEQUENCE, NodeType.SELECTOR):
+            if node.fn is not None:
+                raise ValueError("Composite behavior tree nodes cannot have a callable")
+            for child in node.children:
+                self._validate(child)
+        elif node.kind in (NodeType.CONDITION, NodeType.ACTION):
+            if not callable(node.fn):
+                raise ValueError("Behavior tree leaf nodes need a callable")
+            if node.children:
+                raise ValueError("Behavior tree leaf nodes cannot have children")
+        else:
+            raise ValueError(f"Unknown behavior tree node kind: {node.kind}")
+
+    def _shared_keys(self, root: BTNode) -> set:
+        """Find condition keys used by more than one node in a tree"""
+        seen, shared = set(), set()
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.kind == self.NodeType.CONDITION and node.key is not None:
+                if node.key in seen:
+                    shared.add(node.key)
+                seen.add(node.key)
+            stack.extend(node.children)
+        return shared
+
+    def _compile(self, node: BTNode, shared_keys: set):
+        """
+        Partially evaluate a node into a zero-argument callable
 
-            elif node['type'] == self.NodeType.CONDITION:
-                return node.get('condition', lambda: False)()
+        Node kinds are resolved here once, so a tick is just nested closure
+        calls. Only conditions whose key appears more than once go through
+        the per-tick cache.
 
-            elif node['type'] == self.NodeType.ACTION:
-                node.get('action', lambda: None)()
+        Args:
+            node: Node to compile
+            shared_keys: Condition keys that need per-tick memoization
+
+        Returns:
+            Callable returning the node's success
+        """
+        NodeType = self.NodeType
+        kind = node.kind
+
+        if kind == NodeType.CONDITION:
+            condition = node.fn
+            if node.key not in shared_keys:
+                return condition
+            key, tick_cache = node.key, self._tick_cache
+
+            def cached_condition():
+                if key not in tick_cache:
+                    tick_cache[key] = condition()
+                return tick_cache[key]
+            return cached_condition
+
+        if kind == NodeType.ACTION:
+            action = node.fn
+
+            def run_action():
+                action()
                 return True
+            return run_action
+
+        children = node.children
+        if (kind == NodeType.SEQUENCE and len(children) == 2
+                and children[0].kind == NodeType.CONDITION and children[1].kind == NodeType.ACTION):
+            # Guarded action: the common "if condition then act" shape
+            condition = self._compile(children[0], shared_keys)
+            action = children[1].fn
+
+            def guarded_action():
+                if condition():
+                    action()
+                    return True
+                return False
+            return guarded_action
+
+        fns = tuple(self._compile(child, shared_keys) for child in children)
+        if kind == NodeType.SEQUENCE:
+            # All children must succeed
+            def sequence():
+                for fn in fns:
+                    if not fn():
+                        return False
+                return True
+            return sequence
 
-        except Exception as e:
-            print(f"Tree execution error: {e}")
+        # SELECTOR - first successful child wins
+        def selector():
+            for fn in fns:
+                if fn():
+                    return True
             return False
+        return selector
 
+    def execute(self):
+        """Execute the behavior tree"""
+        if self._ticked_fn:
+            self._tick_cache.clear()
+            return self._ticked_fn()
         return False
 
+    def _execute_debug(self):
+        """Same as execute, but logs and recovers from errors raised during the tick"""
+        try:
+            return BehaviorTree.execute(self)
+        except Exception as e:
+            print(f"Tree execution error: {e}")
+            return False
+
 
 class SimpleNeuralNet:
     """Simple neural network for ML-based AI"""
@@ -194,42 +330,45 @@ class SimpleNeuralNet:
         self.hidden_size = hidden_size
         self.output_size = output_size
 
-        # Initialize weights randomly
-        self.w1 = np.random.randn(input_size, hidden_size) * 0.01
-        self.b1 = np.zeros((1, hidden_size))
-        self.w2 = np.random.randn(hidden_size, output_size) * 0.01
-        self.b2 = np.zeros((1, output_size))
+        # Initialize weights randomly (float32 is plenty for enemy control)
+        scale = np.float32(0.01)
+        self.w1 = _rng.standard_normal((input_size, hidden_size), dtype=NN_DTYPE) * scale
+        self.b1 = np.zeros((1, hidden_size), dtype=NN_DTYPE)
+        self.w2 = _rng.standard_normal((hidden_size, output_size), dtype=NN_DTYPE) * scale
+        self.b2 = np.zeros((1, output_size), dtype=NN_DTYPE)
 
         self.learning_rate = 0.01
 
+        # Reusable buffers for single-sample inference
+        self._a1 = np.empty((1, hidden_size), dtype=NN_DTYPE)
+        self._a2 = np.empty((1, output_size), dtype=NN_DTYPE)
+
     def forward(self, x):
-        """Forward pass through network"""
-        self.z1 = np.dot(x, self.w1) + self.b1
-        self.a1 = np.tanh(self.z1)  # Tanh activation
-        self.z2 = np.dot(self.a1, self.w2) + self.b2
-        self.a2 = 1 / (1 + np.exp(-self.z2))  # Sigmoid activation
-        return self.a2
+        """
+        Forward pass through network
+
+        Single-sample calls reuse preallocated buffers, so the returned
+        array is only valid until the next forward pass.
+        """
+        x = np.ascontiguousarray(x, dtype=NN_DTYPE)  # No copy for the float32 buffers used in-game
+        if x.ndim == 1:
+            return self.forward(x.reshape(1, -1))[0]
+        if x.shape[0] == 1:
+            a1, a2 = self._a1, self._a2
+        else:
+            rows = x.shape[0]
+            a1 = np.empty((rows, self.hidden_size), dtype=NN_DTYPE)
+            a2 = np.empty((rows, self.output_size), dtype=NN_DTYPE)
+
+        nn_forward(x, self.w1, self.b1, self.w2, self.b2, a1, a2)
+        self.a1, self.a2 = a1, a2
+        return a2
 
     def backward(self, x, y, output):
         """Simple backpropagation"""
-        m = x.shape[0]
-
-        # Output layer error
-        dz2 = output * (1 - output)
-        dw2 = np.dot(self.a1.T, dz2) / m
-        db2 = np.sum(dz2, axis=0, keepdims=True) / m
-
-        # Hidden layer error
-        da1 = np.dot(dz2, self.w2.T)
-        dz1 = da1 * (1 - self.a1 * self.a1)
-        dw1 = np.dot(x.T, dz1) / m
-        db1 = np.sum(dz1, axis=0, keepdims=True) / m
-
-        # Update weights
-        self.w1 -= self.learning_rate * dw1
-        self.b1 -= self.learning_rate * db1
-        self.w2 -= self.learning_rate * dw2
-        self.b2 -= self.learning_rate * db2
+        x = np.ascontiguousarray(x, dtype=NN_DTYPE).reshape(-1, self.input_size)
+        output = np.ascontiguousarray(output, dtype=NN_DTYPE).reshape(-1, self.output_size)
+        nn_backward(x, self.a1, output, self.w1, self.b1, self.w2, self.b2, self.learning_rate)
 
     def predict(self, x):
         """Get prediction"""
@@ -239,6 +378,13 @@ class SimpleNeuralNet:
 class MachineLearningAI:
     """Machine learning based AI that learns from experience"""
 
+    # Frames a chosen action is repeated before the network is asked again
+    DECISION_INTERVAL = 6
+    # Size of the experience ring buffer
+    EXPERIENCE_CAPACITY = 10
+    # New experiences collected between training sessions
+    TRAIN_INTERVAL = 10
+
     def __init__(self, enemy):
         """
         Initialize ML AI
@@ -249,8 +395,28 @@ class MachineLearningAI:
         self.enemy = enemy
         self.net = SimpleNeuralNet(input_size=6, hidden_size=8, output_size=4)
         # Actions: 0=patrol, 1=chase, 2=jump, 3=attack
-        self.experience_buffer = []
+        # Bound once; jump/attack become no-ops if the enemy lacks them
+        self._action_fns = (
+            enemy.patrol,
+            enemy.chase_mode,
+            getattr(enemy, 'jump', _noop),
+            getattr(enemy, 'attack', _noop),
+        )
         self.training_sessions = 0
+        self._tick_counter = 0
+        self._last_action = 0
+        self._state_buf = np.empty((1, 6), dtype=NN_DTYPE)
+
+        # Experience ring buffer; _buf_len counts every experience ever stored
+        self._states = np.empty((self.EXPERIENCE_CAPACITY, 6), dtype=NN_DTYPE)
+        self._actions = np.empty(self.EXPERIENCE_CAPACITY, dtype=np.int32)
+        self._rewards = np.empty(self.EXPERIENCE_CAPACITY, dtype=NN_DTYPE)
+        self._buf_len = 0
+
+    @property
+    def experience_count(self) -> int:
+        """Experiences collected since the last training session"""
+        return self._buf_len % self.TRAIN_INTERVAL
 
     def get_state(self, player, level) -> np_array:
         """
@@ -261,18 +427,18 @@ class MachineLearningAI:
             level: Level object
 
         Returns:
-            Feature vector
+            Feature vector (a reused buffer, overwritten on the next call)
         """
+        enemy = self.enemy
+        features = self._state_buf[0]
         # Features: player_distance, player_visible, health, on_ground, player_above, player_below
-        features = [
-            min(abs(self.enemy.x - player.x), 500) / 500,  # Normalized distance
-            float(self.enemy.can_see_player(range=200)),   # Visibility
-            self.enemy.health / 3.0,                        # Normalized health
-            float(self.enemy.on_ground) if hasattr(self.enemy, 'on_ground') else 0.5,  # On ground
-            float(player.y < self.enemy.y),                 # Player above
-            float(player.y > self.enemy.y),                 # Player below
-        ]
-        return np_array([features])
+        features[0] = min(abs(enemy.x - player.x), 500) / 500           # Normalized distance
+        features[1] = enemy.can_see_player(range=200)                  # Visibility
+        features[2] = enemy.health / 3.0                                # Normalized health
+        features[3] = enemy.on_ground if hasattr(enemy, 'on_ground') else 0.5  # On ground
+        features[4] = player.y < enemy.y                                # Player above
+        features[5] = player.y > enemy.y                                # Player below
+        return self._state_buf
 
     def choose_action(self, player, level):
         """
@@ -291,47 +457,39 @@ class MachineLearningAI:
 
     def execute_action(self, action):
         """Execute chosen action"""
-        if action == 0:
-            self.enemy.patrol()
-        elif action == 1:
-            self.enemy.chase_mode()
-        elif action == 2:
-            self.enemy.jump() if hasattr(self.enemy, 'jump') else None
-        elif action == 3:
-            self.enemy.attack() if hasattr(self.enemy, 'attack') else None
+        self._action_fns[action]()
 
     def remember_experience(self, state, action, reward, next_state, done):
-        """Store experience in buffer"""
-        self.experience_buffer.append({
-            'state': state,
-            'action': action,
-            'reward': reward,
-            'next_state': next_state,
-            'done': done
-        })
-
-        # Train if buffer is full enough
-        if len(self.experience_buffer) >= 10:
+        """
+        Store experience in buffer
+
+        Only state, action and reward are used for training; next_state and
+        done are accepted for interface compatibility.
+        """
+        i = self._buf_len % self.EXPERIENCE_CAPACITY
+        self._states[i] = state.ravel()
+        self._actions[i] = action
+        self._rewards[i] = reward
+        self._buf_len += 1
+
+        # Train every TRAIN_INTERVAL experiences; old entries are simply overwritten
+        if self._buf_len % self.TRAIN_INTERVAL == 0:
             self.train()
-            self.experience_buffer.clear()
 
     def train(self):
-        """Train on accumulated experience"""
-        if not self.experience_buffer:
+        """Train on the experiences currently in the ring buffer"""
+        batch_size = min(self._buf_len, self.EXPERIENCE_CAPACITY)
+        if not batch_size:
             return
 
-        batch_size = len(self.experience_buffer)
-        states = np_array([exp['state'].flatten() for exp in self.experience_buffer])
-        actions = np_array([[exp['action']] for exp in self.experience_buffer])
-        rewards = np_array([[exp['reward']] for exp in self.experience_buffer])
+        states = self._states[:batch_size]
 
         # Forward pass
         output = self.net.forward(states)
 
         # Create target output with rewards
         target = output.copy()
-        for i in range(batch_size):
-            target[i, int(actions[i, 0])] = rewards[i, 0]
+        target[np.arange(batch_size), self._actions[:batch_size]] = self._rewards[:batch_size]
 
         # Backward pass
         self.net.backward(states, target, output)
@@ -339,15 +497,24 @@ class MachineLearningAI:
 
     def update(self, player, level) -> bool:
         """Update AI"""
+        # Between decisions, keep repeating the last chosen action
+        latched = self._tick_counter
+        self._tick_counter = (latched + 1) % self.DECISION_INTERVAL
+        if latched:
+            self.execute_action(self._last_action)
+            return True
+
         action = self.choose_action(player, level)
+        self._last_action = action
         self.execute_action(action)
 
         # Calculate reward signal
         distance_to_player = abs(self.enemy.x - player.x)
         reward = 1.0 if distance_to_player < 100 else -0.1  # Reward for being close to player
 
-        next_state = self.get_state(player, level)
-        self.remember_experience(self.get_state(player, level), action, reward, next_state, False)
+        # State after acting serves as both the stored state and next state
+        state = self.get_state(player, level)
+        self.remember_experience(state, action, reward, state, False)
 
         return True
 
@@ -365,17 +532,45 @@ class AIEngine:
         """
         self.enemy = enemy
         self.ai_type = ai_type
-        self.rule_based_ai = RuleBasedAI(enemy)
-        self.behavior_tree = BehaviorTree(enemy)
-        self.ml_ai = MachineLearningAI(enemy)
 
-        # Set up default behaviors
-        self.rule_based_ai.add_default_patrol_ai()
-        self.behavior_tree.create_patrol_and_chase_tree()
+        # AI backends are built on first use, so only the active type costs anything
+        self.set_ai_type(ai_type)
+
+    @cached_property
+    def rule_based_ai(self) -> 'RuleBasedAI':
+        """Rule-based AI with the default patrol rules"""
+        ai = RuleBasedAI(self.enemy)
+        ai.add_default_patrol_ai()
+        return ai
+
+    @cached_property
+    def behavior_tree(self) -> 'BehaviorTree':
+        """Behavior tree with the default patrol and chase tree"""
+        tree = BehaviorTree(self.enemy)
+        tree.create_patrol_and_chase_tree()
+        return tree
+
+    @cached_property
+    def ml_ai(self) -> 'MachineLearningAI':
+        """Machine learning AI"""
+        return MachineLearningAI(self.enemy)
 
     def set_ai_type(self, ai_type: AIType):
         """Switch AI type"""
         self.ai_type = ai_type
+        self._update = self._resolve_update(ai_type)
+
+    def _resolve_update(self, ai_type: AIType):
+        """Get the update callable for an AI type"""
+        if ai_type == AIType.RULE_BASED or ai_type == AIType.SCRIPTED:
+            # Scripted AI defaults to rule-based patrolling
+            return self.rule_based_ai.update
+        elif ai_type == AIType.BEHAVIOR_TREE:
+            execute = self.behavior_tree.execute
+            return lambda player, level: execute()
+        elif ai_type == AIType.MACHINE_LEARNING:
+            return self.ml_ai.update
+        return lambda player, level: False
 
     def update(self, player, level) -> bool:
         """
@@ -388,27 +583,18 @@ class AIEngine:
         Returns:
             True if action was taken
         """
-        if self.ai_type == AIType.RULE_BASED:
-            return self.rule_based_ai.update(player, level)
-
-        elif self.ai_type == AIType.BEHAVIOR_TREE:
-            return self.behavior_tree.execute()
-
-        elif self.ai_type == AIType.MACHINE_LEARNING:
-            return self.ml_ai.update(player, level)
-
-        elif self.ai_type == AIType.SCRIPTED:
-            # Default patrolling
-            return self.rule_based_ai.update(player, level)
-
-        return False
+        return self._update(player, level)
 
     def get_ai_info(self) -> str:
         """Get current AI type info"""
+        # Report unused backends as empty rather than building them
+        built = self.__dict__
+        rules = len(built['rule_based_ai'].rules) if 'rule_based_ai' in built else 0
+        ml_ai = built.get('ml_ai')
         info = {
             'type': self.ai_type.value,
-            'rule_based': f"Rules: {len(self.rule_based_ai.rules)}",
-            'ml_training': f"Sessions: {self.ml_ai.training_sessions}",
-            'ml_buffer': f"Experiences: {len(self.ml_ai.experience_buffer)}"
+            'rule_based': f"Rules: {rules}",
+            'ml_training': f"Sessions: {ml_ai.training_sessions if ml_ai else 0}",
+            'ml_buffer': f"Experiences: {ml_ai.experience_count if ml_ai else 0}"
         }
         return info
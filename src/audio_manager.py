@@ -3,17 +3,99 @@ Audio Manager - Handle game sounds and music
 Generates procedural sounds for game events
 """
 
+import os
 import pygame
 import numpy as np
-from typing import Optional
+from typing import Dict, List, Optional
+
+
+SAMPLE_RATE = 22050
+
+# Shared time base (one second) that every generator slices; treat as read-only
+MAX_SOUND_SAMPLES = SAMPLE_RATE
+_T_MASTER = np.arange(MAX_SOUND_SAMPLES, dtype=np.float32) / SAMPLE_RATE
+
+# Scratch buffer reused by every exponential-decay envelope
+_ENV_BUF = np.empty(MAX_SOUND_SAMPLES, dtype=np.float32)
+
+
+def _chirp(f0: float, f1: float, duration: float, samples: int, out: np.ndarray) -> np.ndarray:
+    """
+    Write a linear frequency sweep into a buffer
+
+    The phase is the integral of the ramp, 2*pi*(f0*t + (f1-f0)/(2*duration)*t^2),
+    so the instantaneous frequency really ends at f1.
+
+    Args:
+        f0: Start frequency in Hz
+        f1: End frequency in Hz
+        duration: Sweep length in seconds
+        samples: Number of samples to write
+        out: Float32 buffer of at least `samples` length
+
+    Returns:
+        The filled slice of `out`
+    """
+    t = _T_MASTER[:samples]
+    out = out[:samples]
+    # Horner form (k*t + f0)*t keeps every step in place
+    np.multiply(t, np.float32((f1 - f0) / (2 * duration)), out=out)
+    out += f0
+    out *= t
+    out *= np.float32(2 * np.pi)
+    np.sin(out, out=out)
+    return out
+
+
+def _apply_decay(wave: np.ndarray, decay: float):
+    """
+    Multiply a wave in place by exp(-decay * t)
+
+    Args:
+        wave: Float32 samples starting at t=0
+        decay: Exponential decay rate per second
+    """
+    envelope = _ENV_BUF[:len(wave)]
+    np.multiply(_T_MASTER[:len(wave)], -decay, out=envelope)
+    np.exp(envelope, out=envelope)
+    wave *= envelope
+
+# Sound effect names, for queueing sounds during a frame (see AudioManager.play_sounds)
+SND_JUMP = 'jump'
+SND_LAND = 'land'
+SND_COLLECT = 'collect'
+SND_ENEMY_DEFEAT = 'enemy_defeat'
+SND_LEVEL_COMPLETE = 'level_complete'
+SND_GAME_OVER = 'game_over'
+SND_MENU_SELECT = 'menu_select'
+SFX_NAMES = frozenset((SND_JUMP, SND_LAND, SND_COLLECT, SND_ENEMY_DEFEAT, SND_LEVEL_COMPLETE,
+                       SND_GAME_OVER, SND_MENU_SELECT))
+
+# Bump the version whenever a generator changes so stale caches are ignored
+SFX_CACHE_VERSION = 2
+SFX_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "cecilsgame",
+                              f"sfx_v{SFX_CACHE_VERSION}.npz")
 
 
 class AudioManager:
     """Manages all game audio - sounds and music"""
 
+    # Mixer format the generated sounds are synthesized in (rate, format, channels)
+    MIXER_FORMAT = (SAMPLE_RATE, -16, 1)
+    MIXER_BUFFER = 512
+
+    # Sound objects shared by every AudioManager, built by the first instance
+    _shared_sounds: Optional[Dict[str, pygame.mixer.Sound]] = None
+    _shared_mixer = None  # Mixer settings the shared sounds were built for
+
+    @staticmethod
+    def pre_init():
+        """Request the native SFX format; call before pygame.init()"""
+        pygame.mixer.pre_init(*AudioManager.MIXER_FORMAT, AudioManager.MIXER_BUFFER)
+
     def __init__(self):
         """Initialize audio manager"""
-        pygame.mixer.init()
+        pygame.mixer.init(*self.MIXER_FORMAT, self.MIXER_BUFFER)
         self.master_volume = 0.7
         self.sfx_volume = 0.6
         self.music_volume = 0.5
@@ -24,183 +106,149 @@ class AudioManager:
         self._generate_sounds()
 
     def _generate_sounds(self):
-        """Pre-generate all sound effects"""
-        # Jump sound - ascending pitch
-        self.sounds['jump'] = self._generate_jump_sound()
-
-        # Land sound - descending pitch
-        self.sounds['land'] = self._generate_land_sound()
-
-        # Coin/collectible - ascending ping
-        self.sounds['collect'] = self._generate_collect_sound()
-
-        # Enemy defeated - dropping pitch
-        self.sounds['enemy_defeat'] = self._generate_enemy_defeat_sound()
+        """Pre-generate all sound effects, reusing the on-disk cache when present"""
+        mixer = pygame.mixer.get_init()
+        if AudioManager._shared_sounds is not None and AudioManager._shared_mixer == mixer:
+            self.sounds = AudioManager._shared_sounds
+            self._update_volumes()
+            return
+
+        waves = self._load_cached_waves()
+        if waves is None:
+            waves = {
+                'jump': self._generate_jump_sound(),                      # Ascending pitch
+                'land': self._generate_land_sound(),                      # Descending pitch
+                'collect': self._generate_collect_sound(),                # Ascending ping
+                'enemy_defeat': self._generate_enemy_defeat_sound(),      # Dropping pitch
+                'level_complete': self._generate_level_complete_sound(),  # Success chord
+                'game_over': self._generate_game_over_sound(),            # Descending failure
+                'menu_select': self._generate_menu_select_sound(),        # Click
+            }
+            self._save_cached_waves(waves)
+
+        # Raw sample bytes can be handed over as-is when the mixer matches the
+        # synthesis format; otherwise let pygame convert the array
+        native = mixer == self.MIXER_FORMAT
+        for name, wave in waves.items():
+            if native:
+                sound = pygame.mixer.Sound(buffer=np.ascontiguousarray(wave, dtype=np.int16).tobytes())
+            else:
+                sound = pygame.mixer.Sound(wave)
+            sound.set_volume(self.sfx_volume * self.master_volume)
+            self.sounds[name] = sound
+        AudioManager._shared_sounds = self.sounds
+        AudioManager._shared_mixer = mixer
 
-        # Level complete - success chord
-        self.sounds['level_complete'] = self._generate_level_complete_sound()
+    def _load_cached_waves(self) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Load previously generated waveforms from the disk cache
 
-        # Game over - descending failure sound
-        self.sounds['game_over'] = self._generate_game_over_sound()
+        Returns:
+            The waveforms by sound name, or None if the cache is missing, unreadable
+            or incomplete (the sounds are then regenerated and the cache rewritten)
+        """
+        try:
+            with np.load(SFX_CACHE_FILE) as data:
+                if set(data.files) != SFX_NAMES:
+                    return None
+                waves = {name: data[name] for name in data.files}
+        except Exception:  # Missing, truncated or corrupt file; cold path, any failure is a miss
+            return None
+        if not all(wave.ndim == 1 and wave.dtype == np.int16 for wave in waves.values()):
+            return None
+        return waves
+
+    def _save_cached_waves(self, waves: Dict[str, np.ndarray]):
+        """Store generated waveforms so later launches skip synthesis"""
+        try:
+            os.makedirs(os.path.dirname(SFX_CACHE_FILE), exist_ok=True)
+            np.savez(SFX_CACHE_FILE, **waves)
+        except OSError as e:
+            print(f"Could not write sound cache {SFX_CACHE_FILE}: {e}")
 
-        # Menu select - click sound
-        self.sounds['menu_select'] = self._generate_menu_select_sound()
+    def _synth(self, f0: float, f1: float, duration: float, decay: float, amp: float,
+               noise: float = 0.0) -> np.ndarray:
+        """
+        Synthesize a decaying frequency sweep
 
-    def _generate_jump_sound(self) -> pygame.mixer.Sound:
-        """Generate jump sound effect"""
-        sample_rate = 22050
-        duration = 0.15
-        samples = int(sample_rate * duration)
+        Args:
+            f0: Start frequency in Hz
+            f1: End frequency in Hz
+            duration: Length in seconds
+            decay: Exponential envelope decay rate
+            amp: Output amplitude (0.0-1.0)
+            noise: Amount of white noise mixed in
+
+        Returns:
+            Mono int16 sample array
+        """
+        samples = int(SAMPLE_RATE * duration)
+        wave = _chirp(f0, f1, duration, samples, np.empty(samples, dtype=np.float32))
 
-        # Ascending frequency sweep
-        frequencies = np.linspace(400, 800, samples)
-        t = np.linspace(0, duration, samples)
+        if noise:
+            wave += np.random.randn(samples).astype(np.float32) * noise
 
-        # Envelope - quick attack, decay
-        envelope = np.exp(-t * 8)
+        _apply_decay(wave, decay)
 
-        wave = np.sin(2 * np.pi * frequencies * t) * envelope
-        wave = np.int16(wave * 32767 * 0.3)
+        wave *= 32767 * amp
+        return wave.astype(np.int16, copy=False)
 
-        sound = pygame.mixer.Sound(wave)
-        sound.set_volume(self.sfx_volume * self.master_volume)
-        return sound
+    def _generate_jump_sound(self) -> np.ndarray:
+        """Generate jump sound effect"""
+        return self._synth(400, 800, 0.15, decay=8, amp=0.3)
 
-    def _generate_land_sound(self) -> pygame.mixer.Sound:
+    def _generate_land_sound(self) -> np.ndarray:
         """Generate land/thud sound effect"""
-        sample_rate = 22050
-        duration = 0.1
-        samples = int(sample_rate * duration)
-
-        # Descending frequency
-        frequencies = np.linspace(300, 100, samples)
-        t = np.linspace(0, duration, samples)
+        return self._synth(300, 100, 0.1, decay=20, amp=0.4)
 
-        # Sharp envelope
-        envelope = np.exp(-t * 20)
-
-        wave = np.sin(2 * np.pi * frequencies * t) * envelope
-        wave = np.int16(wave * 32767 * 0.4)
-
-        sound = pygame.mixer.Sound(wave)
-        sound.set_volume(self.sfx_volume * self.master_volume)
-        return sound
-
-    def _generate_collect_sound(self) -> pygame.mixer.Sound:
+    def _generate_collect_sound(self) -> np.ndarray:
         """Generate collectible/coin sound"""
-        sample_rate = 22050
         duration = 0.2
-        samples = int(sample_rate * duration)
+        samples = int(SAMPLE_RATE * duration)
 
         # Rising tones
-        t = np.linspace(0, duration, samples)
-
-        # Two quick tones
-        wave1 = np.sin(2 * np.pi * 800 * t[:samples // 2])
-        wave2 = np.sin(2 * np.pi * 1200 * t[samples // 2:])
-
-        envelope = np.exp(-t * 15)
+        t = _T_MASTER[:samples]
 
-        wave = np.concatenate([wave1, wave2]) * envelope
-        wave = np.int16(wave * 32767 * 0.3)
+        # Two quick tones, each written straight into its half of one buffer
+        half = samples // 2
+        wave = t * np.float32(2 * np.pi)
+        wave[:half] *= 800
+        wave[half:] *= 1200
+        np.sin(wave, out=wave)
 
-        sound = pygame.mixer.Sound(wave)
-        sound.set_volume(self.sfx_volume * self.master_volume)
-        return sound
+        _apply_decay(wave, 15)
+        return np.int16(wave * 32767 * 0.3)
 
-    def _generate_enemy_defeat_sound(self) -> pygame.mixer.Sound:
+    def _generate_enemy_defeat_sound(self) -> np.ndarray:
         """Generate enemy defeat sound"""
-        sample_rate = 22050
-        duration = 0.3
-        samples = int(sample_rate * duration)
+        return self._synth(500, 100, 0.3, decay=6, amp=0.3, noise=0.3)
 
-        # Descending pitch with noise
-        t = np.linspace(0, duration, samples)
-        frequencies = np.linspace(500, 100, samples)
-
-        # Add some noise
-        noise = np.random.randn(samples) * 0.3
-        wave = np.sin(2 * np.pi * frequencies * t) + noise
-
-        # Envelope - fade out
-        envelope = np.exp(-t * 6)
-        wave = wave * envelope
-
-        wave = np.int16(wave * 32767 * 0.3)
-
-        sound = pygame.mixer.Sound(wave)
-        sound.set_volume(self.sfx_volume * self.master_volume)
-        return sound
-
-    def _generate_level_complete_sound(self) -> pygame.mixer.Sound:
+    def _generate_level_complete_sound(self) -> np.ndarray:
         """Generate level complete - success fanfare"""
-        sample_rate = 22050
         duration = 0.5
-        samples = int(sample_rate * duration)
+        samples = int(SAMPLE_RATE * duration)
 
-        t = np.linspace(0, duration, samples)
+        t = _T_MASTER[:samples]
 
         # Chord - C major (frequencies for C, E, G)
-        freqs = [262, 330, 392]  # C, E, G
-        wave = np.zeros(samples)
-
-        for freq in freqs:
-            wave += np.sin(2 * np.pi * freq * t)
+        freqs = np.array([262, 330, 392], dtype=np.float32)  # C, E, G
+        wave = np.sin(np.outer(t, freqs * np.float32(2 * np.pi))).sum(axis=1)
 
         # Envelope - attack and sustain
-        envelope = np.ones(samples)
+        envelope = np.ones(samples, dtype=np.float32)
         envelope[:int(samples * 0.1)] = np.linspace(0, 1, int(samples * 0.1))
         envelope[int(samples * 0.8):] = np.linspace(1, 0, int(samples * 0.2))
 
         wave = wave * envelope / len(freqs)
-        wave = np.int16(wave * 32767 * 0.3)
+        return np.int16(wave * 32767 * 0.3)
 
-        sound = pygame.mixer.Sound(wave)
-        sound.set_volume(self.sfx_volume * self.master_volume)
-        return sound
-
-    def _generate_game_over_sound(self) -> pygame.mixer.Sound:
+    def _generate_game_over_sound(self) -> np.ndarray:
         """Generate game over - sad trombone effect"""
-        sample_rate = 22050
-        duration = 0.8
-        samples = int(sample_rate * duration)
-
-        t = np.linspace(0, duration, samples)
-
-        # Descending glissando
-        frequencies = np.linspace(400, 80, samples)
-        wave = np.sin(2 * np.pi * frequencies * t)
-
-        # Envelope - slow fade
-        envelope = np.exp(-t * 3)
-        wave = wave * envelope
-
-        wave = np.int16(wave * 32767 * 0.4)
+        return self._synth(400, 80, 0.8, decay=3, amp=0.4)
 
-        sound = pygame.mixer.Sound(wave)
-        sound.set_volume(self.sfx_volume * self.master_volume)
-        return sound
-
-    def _generate_menu_select_sound(self) -> pygame.mixer.Sound:
+    def _generate_menu_select_sound(self) -> np.ndarray:
         """Generate menu selection click"""
-        sample_rate = 22050
-        duration = 0.08
-        samples = int(sample_rate * duration)
-
-        t = np.linspace(0, duration, samples)
-
-        # Simple beep
-        wave = np.sin(2 * np.pi * 600 * t)
-
-        # Sharp envelope
-        envelope = np.exp(-t * 30)
-        wave = wave * envelope
-
-        wave = np.int16(wave * 32767 * 0.4)
-
-        sound = pygame.mixer.Sound(wave)
-        sound.set_volume(self.sfx_volume * self.master_volume)
-        return sound
+        return self._synth(600, 600, 0.08, decay=30, amp=0.4)
 
     def play_sound(self, sound_name: str):
         """
@@ -212,6 +260,16 @@ class AudioManager:
         if sound_name in self.sounds:
             self.sounds[sound_name].play()
 
+    def play_sounds(self, sound_names: List[str]):
+        """
+        Play the sounds queued during a frame, each at most once
+
+        Args:
+            sound_names: Names of the sounds to play, in order
+        """
+        for sound_name in dict.fromkeys(sound_names):
+            self.play_sound(sound_name)
+
     def play_jump(self):
         """Play jump sound"""
         self.play_sound('jump')
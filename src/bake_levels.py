@@ -0,0 +1,37 @@
+"""
+Bake Levels - Convert JSON level files to MessagePack for faster loading
+Run after editing levels (requires msgpack):
+
+    python -m src.bake_levels
+
+Writes level_N.mpk next to each level_N.json. Level.load_level prefers the
+.mpk while it is at least as new as the JSON, so a stale bake is ignored.
+"""
+
+import glob
+import json
+import os
+
+import msgpack
+
+from src.level import LEVELS_DIR
+
+
+def bake(levels_dir: str = LEVELS_DIR):
+    """
+    Bake every JSON level in a directory
+
+    Args:
+        levels_dir: Directory holding level_N.json files
+    """
+    for json_path in sorted(glob.glob(os.path.join(levels_dir, "level_*.json"))):
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+        baked_path = os.path.splitext(json_path)[0] + ".mpk"
+        with open(baked_path, 'wb') as f:
+            f.write(msgpack.packb(data, use_bin_type=True))
+        print(f"Baked {json_path} -> {baked_path}")
+
+
+if __name__ == "__main__":
+    bake()
@@ -4,10 +4,38 @@ Scratch-style programming interface for creating enemy behaviors
 """
 
 import pygame
-import json
 import os
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, List, Dict, Tuple, Optional
 from config.settings import *
+from src.sprite_manager import to_display_format
+from src.json_codec import dump_json, load_json
+from src.ui import get_font
+
+# Generated code for each block command: (source template, default params)
+COMMAND_TEMPLATES = {
+    "Patrol": ("{indent}enemy.patrol(speed={speed}, range={range})\n", {'speed': 2, 'range': 100}),
+    "Chase Player": ("{indent}if enemy.can_see_player(player, range=200):\n"
+                     "{indent}    enemy.chase(player, speed={speed})\n", {'speed': 3}),
+    "See Player": ("{indent}can_see = enemy.can_see_player(player, range={range})\n", {'range': 200}),
+    "Jump": ("{indent}enemy.jump(power={power})\n", {'power': 10}),
+    "Attack": ("{indent}enemy.attack()\n", {}),
+    "Die": ("{indent}enemy.die()\n", {}),
+    "If-Then": ("{indent}if can_see:\n"
+                "{indent}    pass  # Add conditions here\n", {}),
+    "Wait": ("{indent}enemy.wait({duration})\n", {'duration': 1}),
+}
+
+COMPILED_HEADER = (
+    "# Auto-generated AI behavior code\n"
+    "def enemy_behavior(enemy, player, level):\n"
+    "    \"\"\"\n"
+    "    Generated enemy AI behavior\n"
+    "    \"\"\"\n"
+)
+COMPILED_FOOTER = "    return True\n"
+
+# Behavior functions compiled from generated code, keyed by source
+_compiled_behaviors: Dict[str, Callable] = {}
 
 
 class AIBlock:
@@ -22,6 +50,16 @@ class AIBlock:
         'action': (255, 100, 150),
         'control': (200, 100, 255),
     }
+    DEFAULT_COLOR = (150, 150, 150)
+    # Lightened variants used while a block is selected
+    BLOCK_COLORS_SELECTED = {block_type: tuple(min(c + 50, 255) for c in color)
+                             for block_type, color in BLOCK_COLORS.items()}
+    DEFAULT_COLOR_SELECTED = tuple(min(c + 50, 255) for c in DEFAULT_COLOR)
+
+    CONNECTOR_RADIUS = 5
+
+    # Rendered command labels shared by all blocks, keyed by (font id, command)
+    _label_cache: Dict[Tuple[int, str], pygame.Surface] = {}
 
     def __init__(self, x: float, y: float, block_type: str, command: str, params: Dict = None):
         """
@@ -42,6 +80,8 @@ class AIBlock:
         self.selected = False
         self.next_block = None  # Block that comes after this one
         self.input_block = None  # Block that feeds input to this one
+        self._cached_surface = None  # Pre-rendered look, see get_surface()
+        self._cached_state = None
 
     def draw(self, surface: pygame.Surface, font: pygame.font.Font):
         """
@@ -51,28 +91,63 @@ class AIBlock:
             surface: Pygame surface to draw on
             font: Font for text
         """
+        surface.blit(self.get_surface(font), self.get_blit_pos())
+
+    def get_blit_pos(self) -> Tuple[int, int]:
+        """Screen position of the cached surface (it overhangs the rect for the connectors)"""
+        return (self.rect.x, self.rect.y - self.CONNECTOR_RADIUS)
+
+    def get_surface(self, font: pygame.font.Font) -> pygame.Surface:
+        """
+        Get the block's pre-rendered image, rebuilding it if its look changed
+
+        Args:
+            font: Font for text
+
+        Returns:
+            Surface with background, border, label and connectors
+        """
+        state = (self.block_type, self.command, self.selected, id(font))
+        if self._cached_surface is None or self._cached_state != state:
+            self._cached_surface = self._rebuild_surface(font)
+            self._cached_state = state
+        return self._cached_surface
+
+    def _rebuild_surface(self, font: pygame.font.Font) -> pygame.Surface:
+        """Render the block into a new transparent surface"""
+        radius = self.CONNECTOR_RADIUS
+        image = pygame.Surface((self.BLOCK_WIDTH, self.BLOCK_HEIGHT + radius * 2), pygame.SRCALPHA)
+        rect = pygame.Rect(0, radius, self.BLOCK_WIDTH, self.BLOCK_HEIGHT)
+
         # Draw block background
-        color = self.BLOCK_COLORS.get(self.block_type, (150, 150, 150))
         if self.selected:
-            color = tuple(min(c + 50, 255) for c in color)
+            color = self.BLOCK_COLORS_SELECTED.get(self.block_type, self.DEFAULT_COLOR_SELECTED)
+        else:
+            color = self.BLOCK_COLORS.get(self.block_type, self.DEFAULT_COLOR)
 
-        pygame.draw.rect(surface, color, self.rect)
-        pygame.draw.rect(surface, COLOR_WHITE if self.selected else COLOR_DARK_GRAY, self.rect, 2)
+        pygame.draw.rect(image, color, rect)
+        pygame.draw.rect(image, COLOR_WHITE if self.selected else COLOR_DARK_GRAY, rect, 2)
 
         # Draw command text
-        text = font.render(self.command, True, COLOR_WHITE)
-        text_rect = text.get_rect(center=self.rect.center)
-        surface.blit(text, text_rect)
+        key = (id(font), self.command)
+        text = AIBlock._label_cache.get(key)
+        if text is None:
+            text = AIBlock._label_cache[key] = font.render(self.command, True, COLOR_WHITE)
+        text_rect = text.get_rect(center=rect.center)
+        image.blit(text, text_rect)
 
         # Draw connection points
         # Input connector (top)
-        pygame.draw.circle(surface, COLOR_YELLOW, (self.rect.centerx, self.rect.top), 5)
+        pygame.draw.circle(image, COLOR_YELLOW, (rect.centerx, rect.top), radius)
         # Output connector (bottom)
-        pygame.draw.circle(surface, COLOR_YELLOW, (self.rect.centerx, self.rect.bottom), 5)
+        pygame.draw.circle(image, COLOR_YELLOW, (rect.centerx, rect.bottom), radius)
+        return to_display_format(image)
 
     def contains_point(self, x: float, y: float) -> bool:
         """Check if point is inside block"""
-        return self.rect.collidepoint(x, y)
+        left = self.x
+        top = self.y
+        return left <= x < left + self.BLOCK_WIDTH and top <= y < top + self.BLOCK_HEIGHT
 
     def to_dict(self) -> Dict:
         """Serialize to dictionary"""
@@ -122,6 +197,9 @@ class BlockEditor:
         ],
     }
 
+    # Hit-test grid cell size; a block spans at most two cells on each axis
+    GRID_CELL_SIZE = AIBlock.BLOCK_WIDTH
+
     def __init__(self, screen_width: int = SCREEN_WIDTH, screen_height: int = SCREEN_HEIGHT):
         """
         Initialize block editor
@@ -137,9 +215,120 @@ class BlockEditor:
         self.dragging = False
         self.drag_offset = (0, 0)
         self.current_ai_name = "Custom AI"
-        self.font_large = pygame.font.Font(None, 48)
-        self.font_medium = pygame.font.Font(None, 32)
-        self.font_small = pygame.font.Font(None, 24)
+        self.font_large = get_font(48)
+        self.font_medium = get_font(32)
+        self.font_small = get_font(24)
+        self._text_cache: Dict[Tuple[int, Tuple[int, int, int], str], pygame.Surface] = {}
+        self._static_bg = None  # Background, title and work area (under the blocks)
+        self._overlay = None  # Palette and instructions (over the blocks)
+        self._dirty_rects: List[pygame.Rect] = []
+        self._full_redraw = True
+        self._grid: Dict[Tuple[int, int], List[AIBlock]] = {}  # Cell of a block's top-left -> blocks
+        self._grid_cells: Dict[AIBlock, Tuple[int, int]] = {}
+        self._ai_list_cache: Optional[Tuple[int, List[str]]] = None  # (dir mtime, AI names)
+
+    def _render(self, text: str, font: pygame.font.Font, color: Tuple[int, int, int]) -> pygame.Surface:
+        """
+        Render text, reusing the surface from earlier frames
+
+        Args:
+            text: Text to render
+            font: Font to render with
+            color: Text color
+
+        Returns:
+            Rendered (shared) text surface
+        """
+        key = (id(font), color, text)
+        rendered = self._text_cache.get(key)
+        if rendered is None:
+            rendered = self._text_cache[key] = font.render(text, True, color)
+        return rendered
+
+    def clear_text_cache(self):
+        """Drop cached text and block surfaces (e.g. after fonts, colors or the display mode change)"""
+        self._text_cache.clear()
+        AIBlock._label_cache.clear()
+        for block in self.blocks:
+            block._cached_surface = None
+        self._static_bg = None
+        self._overlay = None
+        self.invalidate()
+
+    def invalidate(self):
+        """Repaint the whole editor on the next draw (e.g. after another screen was shown)"""
+        self._full_redraw = True
+        self._dirty_rects.clear()
+
+    def _mark_dirty(self, block: AIBlock):
+        """
+        Queue the screen area covered by a block and its connection lines for redraw
+
+        Args:
+            block: Block whose current area changed
+        """
+        radius = AIBlock.CONNECTOR_RADIUS
+        dirty = block.rect.inflate(4, radius * 2 + 4)
+        for other in self.blocks:
+            if other.next_block is block or block.next_block is other:
+                dirty.union_ip(other.rect.inflate(4, radius * 2 + 4))
+        self._dirty_rects.append(dirty)
+
+    def _grid_cell(self, x: float, y: float) -> Tuple[int, int]:
+        """Grid cell containing a point"""
+        return (int(x) // self.GRID_CELL_SIZE, int(y) // self.GRID_CELL_SIZE)
+
+    def _grid_insert(self, block: AIBlock):
+        """Register a block in the cell of its top-left corner"""
+        cell = self._grid_cell(block.rect.x, block.rect.y)
+        self._grid.setdefault(cell, []).append(block)
+        self._grid_cells[block] = cell
+
+    def _grid_remove(self, block: AIBlock):
+        """Unregister a block from the hit-test grid"""
+        cell = self._grid_cells.pop(block, None)
+        if cell is not None:
+            bucket = self._grid[cell]
+            bucket.remove(block)
+            if not bucket:
+                del self._grid[cell]
+
+    def _grid_move(self, block: AIBlock):
+        """Move a block to a new cell if its top-left crossed a cell boundary"""
+        if self._grid_cells.get(block) != self._grid_cell(block.rect.x, block.rect.y):
+            self._grid_remove(block)
+            self._grid_insert(block)
+
+    def _rebuild_grid(self):
+        """Rebuild the hit-test grid after self.blocks was replaced"""
+        self._grid.clear()
+        self._grid_cells.clear()
+        for block in self.blocks:
+            self._grid_insert(block)
+
+    def block_at(self, x: float, y: float) -> Optional[AIBlock]:
+        """
+        Find the block under a point
+
+        Args:
+            x, y: Point on screen
+
+        Returns:
+            First block in self.blocks containing the point, or None
+        """
+        cx, cy = self._grid_cell(x, y)
+        width = AIBlock.BLOCK_WIDTH
+        height = AIBlock.BLOCK_HEIGHT
+        hit = None
+        for cell in ((cx, cy), (cx - 1, cy), (cx, cy - 1), (cx - 1, cy - 1)):
+            for block in self._grid.get(cell, ()):
+                # Inline copy of block.contains_point, saves a method call per candidate
+                bx = block.x
+                by = block.y
+                if bx <= x < bx + width and by <= y < by + height:
+                    if hit is None or self.blocks.index(block) < self.blocks.index(hit):
+                        hit = block
+        return hit
 
     def add_block(self, block_type: str, command: str, x: float = 100, y: float = 100) -> AIBlock:
         """
@@ -152,12 +341,16 @@ class BlockEditor:
         """
         block = AIBlock(x, y, block_type, command)
         self.blocks.append(block)
+        self._grid_insert(block)
+        self._mark_dirty(block)
         return block
 
     def remove_block(self, block: AIBlock):
         """Remove a block"""
         if block in self.blocks:
+            self._mark_dirty(block)
             self.blocks.remove(block)
+            self._grid_remove(block)
             if self.selected_block == block:
                 self.selected_block = None
 
@@ -188,73 +381,120 @@ class BlockEditor:
         if mouse_buttons[0]:  # Left click
             if not self.dragging:
                 # Check if clicking on a block
-                for block in self.blocks:
-                    if block.contains_point(mouse_pos[0], mouse_pos[1]):
-                        self.selected_block = block
-                        self.dragging = True
-                        self.drag_offset = (mouse_pos[0] - block.x, mouse_pos[1] - block.y)
-                        break
+                block = self.block_at(mouse_pos[0], mouse_pos[1])
+                if block:
+                    self.selected_block = block
+                    self.dragging = True
+                    self.drag_offset = (mouse_pos[0] - block.x, mouse_pos[1] - block.y)
             else:
                 # Drag the selected block
-                if self.selected_block:
-                    self.selected_block.x = mouse_pos[0] - self.drag_offset[0]
-                    self.selected_block.y = mouse_pos[1] - self.drag_offset[1]
-                    self.selected_block.rect.topleft = (self.selected_block.x, self.selected_block.y)
+                block = self.selected_block
+                if block:
+                    x = mouse_pos[0] - self.drag_offset[0]
+                    y = mouse_pos[1] - self.drag_offset[1]
+                    if (x, y) != (block.x, block.y):
+                        self._mark_dirty(block)
+                        block.x = x
+                        block.y = y
+                        block.rect.topleft = (x, y)
+                        self._grid_move(block)
+                        self._mark_dirty(block)
         else:
             self.dragging = False
 
-    def draw(self, surface: pygame.Surface):
+    def draw(self, surface: pygame.Surface) -> List[pygame.Rect]:
         """
-        Draw the block editor interface
+        Draw the block editor interface, repainting only the areas that changed
 
         Args:
             surface: Pygame surface to draw on
+
+        Returns:
+            Rects that were repainted, for pygame.display.update()
         """
-        surface.fill(COLOR_DARK_GRAY)
+        if self._static_bg is None or self._static_bg.get_size() != surface.get_size():
+            self._build_static_layers(surface.get_size())
+
+        if self._full_redraw:
+            dirty = [surface.get_rect()]
+            self._full_redraw = False
+        else:
+            dirty = self._dirty_rects
+        self._dirty_rects = []
+
+        font = self.font_small
+        radius = AIBlock.CONNECTOR_RADIUS
+        # Connection lines, collected once for all dirty areas
+        lines = [((block.rect.centerx, block.rect.bottom),
+                  (block.next_block.rect.centerx, block.next_block.rect.top))
+                 for block in self.blocks if block.next_block]
+        for area in dirty:
+            surface.set_clip(area)
+            surface.blit(self._static_bg, area, area)
+
+            # Draw the blocks touching this area from their cached images in one batched call
+            surface.blits([(block.get_surface(font), block.get_blit_pos()) for block in self.blocks
+                           if block.rect.inflate(0, radius * 2).colliderect(area)],
+                          doreturn=False)
+
+            # Draw connection lines
+            for start, end in lines:
+                pygame.draw.line(surface, COLOR_YELLOW, start, end, 2)
+
+            # Palette and instructions stay on top of the blocks
+            surface.blit(self._overlay, area, area)
+        surface.set_clip(None)
+        return dirty
+
+    def _build_static_layers(self, size: Tuple[int, int]):
+        """
+        Pre-render the parts of the editor that never change
+
+        Args:
+            size: Size of the target surface
+        """
+        self._static_bg = pygame.Surface(size)
+        self._static_bg.fill(COLOR_DARK_GRAY)
 
         # Draw title
-        title = self.font_large.render("BLOCK EDITOR - Design Enemy AI", True, COLOR_CYAN)
-        surface.blit(title, (50, 20))
+        title = self._render("BLOCK EDITOR - Design Enemy AI", self.font_large, COLOR_CYAN)
+        self._static_bg.blit(title, (50, 20))
 
         # Draw work area
-        pygame.draw.rect(surface, COLOR_BLACK, (50, 100, 900, 500))
-        pygame.draw.rect(surface, COLOR_LIGHT_GRAY, (50, 100, 900, 500), 2)
+        pygame.draw.rect(self._static_bg, COLOR_BLACK, (50, 100, 900, 500))
+        pygame.draw.rect(self._static_bg, COLOR_LIGHT_GRAY, (50, 100, 900, 500), 2)
 
-        # Draw blocks
-        for block in self.blocks:
-            block.draw(surface, self.font_small)
-
-            # Draw connection lines
-            if block.next_block:
-                start = (block.rect.centerx, block.rect.bottom)
-                end = (block.next_block.rect.centerx, block.next_block.rect.top)
-                pygame.draw.line(surface, COLOR_YELLOW, start, end, 2)
+        self._overlay = pygame.Surface(size, pygame.SRCALPHA)
 
         # Draw block palette on the right
-        self.draw_palette(surface)
+        self.draw_palette(self._overlay)
 
         # Draw instructions
-        self.draw_instructions(surface)
+        self.draw_instructions(self._overlay)
+
+        self._static_bg = to_display_format(self._static_bg)
+        self._overlay = to_display_format(self._overlay)
+        self._full_redraw = True
 
     def draw_palette(self, surface: pygame.Surface):
         """Draw palette of available blocks"""
         palette_x = 1000
         palette_y = 120
 
-        title = self.font_medium.render("Block Types", True, COLOR_WHITE)
+        title = self._render("Block Types", self.font_medium, COLOR_WHITE)
         surface.blit(title, (palette_x, palette_y))
 
         y = palette_y + 40
         for block_type, blocks in self.BLOCK_TEMPLATES.items():
             # Type header
-            color = AIBlock.BLOCK_COLORS.get(block_type, (150, 150, 150))
-            type_text = self.font_small.render(block_type.upper(), True, color)
+            color = AIBlock.BLOCK_COLORS.get(block_type, AIBlock.DEFAULT_COLOR)
+            type_text = self._render(block_type.upper(), self.font_small, color)
             surface.blit(type_text, (palette_x, y))
             y += 28
 
             # Show 2 example blocks
             for i, block_data in enumerate(blocks[:2]):
-                block_text = self.font_small.render(f"• {block_data['command']}", True, COLOR_LIGHT_GRAY)
+                block_text = self._render(f"• {block_data['command']}", self.font_small, COLOR_LIGHT_GRAY)
                 surface.blit(block_text, (palette_x + 10, y))
                 y += 24
 
@@ -271,7 +511,7 @@ class BlockEditor:
 
         y = 620
         for instruction in instructions:
-            text = self.font_small.render(instruction, True, COLOR_WHITE)
+            text = self._render(instruction, self.font_small, COLOR_WHITE)
             surface.blit(text, (50, y))
             y += 25
 
@@ -282,36 +522,29 @@ class BlockEditor:
         Returns:
             Python code string
         """
-        code = "# Auto-generated AI behavior code\n"
-        code += "def enemy_behavior(enemy, player, level):\n"
-        code += "    \"\"\"\n"
-        code += "    Generated enemy AI behavior\n"
-        code += "    \"\"\"\n"
-
-        for i, block in enumerate(self.blocks):
-            indent = "    "
-
-            if block.command == "Patrol":
-                code += f"{indent}enemy.patrol(speed={block.params.get('speed', 2)}, range={block.params.get('range', 100)})\n"
-            elif block.command == "Chase Player":
-                code += f"{indent}if enemy.can_see_player(player, range=200):\n"
-                code += f"{indent}    enemy.chase(player, speed={block.params.get('speed', 3)})\n"
-            elif block.command == "See Player":
-                code += f"{indent}can_see = enemy.can_see_player(player, range={block.params.get('range', 200)})\n"
-            elif block.command == "Jump":
-                code += f"{indent}enemy.jump(power={block.params.get('power', 10)})\n"
-            elif block.command == "Attack":
-                code += f"{indent}enemy.attack()\n"
-            elif block.command == "Die":
-                code += f"{indent}enemy.die()\n"
-            elif block.command == "If-Then":
-                code += f"{indent}if can_see:\n"
-                code += f"{indent}    pass  # Add conditions here\n"
-            elif block.command == "Wait":
-                code += f"{indent}enemy.wait({block.params.get('duration', 1)})\n"
-
-        code += "    return True\n"
-        return code
+        parts = [COMPILED_HEADER]
+        for block in self.blocks:
+            template = COMMAND_TEMPLATES.get(block.command)
+            if template:
+                source, defaults = template
+                parts.append(source.format(indent="    ", **{**defaults, **block.params}))
+        parts.append(COMPILED_FOOTER)
+        return "".join(parts)
+
+    def compile_behavior(self) -> Callable:
+        """
+        Compile blocks to a callable enemy_behavior(enemy, player, level)
+
+        Returns:
+            Behavior function, shared by all layouts that generate the same code
+        """
+        source = self.compile_to_python()
+        behavior = _compiled_behaviors.get(source)
+        if behavior is None:
+            namespace = {}
+            exec(compile(source, "<block ai>", "exec"), namespace)
+            behavior = _compiled_behaviors[source] = namespace["enemy_behavior"]
+        return behavior
 
     def save_ai(self, filename: str = None):
         """
@@ -333,8 +566,8 @@ class BlockEditor:
         }
 
         filepath = os.path.join(ai_dir, f"{filename}.json")
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        with open(filepath, 'wb') as f:
+            f.write(dump_json(data))
 
         print(f"AI saved: {filepath}")
 
@@ -349,23 +582,36 @@ class BlockEditor:
         filepath = os.path.join(ai_dir, f"{filename}.json")
 
         if os.path.exists(filepath):
-            with open(filepath, 'r') as f:
-                data = json.load(f)
+            with open(filepath, 'rb') as f:
+                data = load_json(f.read())
 
             self.current_ai_name = data['name']
             self.blocks = [AIBlock.from_dict(block_data) for block_data in data['blocks']]
+            self.selected_block = None
+            self._rebuild_grid()
+            self.invalidate()
             print(f"AI loaded: {filepath}")
 
     def get_list_of_ais(self) -> List[str]:
         """Get list of saved AIs"""
         ai_dir = "assets/ai"
-        if os.path.exists(ai_dir):
-            return [f[:-5] for f in os.listdir(ai_dir) if f.endswith('.json')]
-        return []
+        try:
+            mtime = os.stat(ai_dir).st_mtime_ns
+        except OSError:
+            return []
+
+        # Rescan only when files were added, removed or renamed since the last call
+        if self._ai_list_cache is None or self._ai_list_cache[0] != mtime:
+            with os.scandir(ai_dir) as entries:
+                names = [entry.name[:-5] for entry in entries if entry.name.endswith('.json')]
+            self._ai_list_cache = (mtime, names)
+        return list(self._ai_list_cache[1])
 
     def create_example_ai(self):
         """Create an example patrol + chase AI"""
         self.blocks.clear()
+        self._rebuild_grid()
+        self.invalidate()
         self.add_block('movement', 'Patrol', 150, 150)
         self.add_block('sensing', 'See Player', 150, 250)
         self.add_block('movement', 'Chase Player', 150, 350)
@@ -0,0 +1,39 @@
+"""
+Build Kernels - Ahead-of-time compile the Numba kernels into an extension module
+Run once after installing the dependencies:
+
+    python -m src.build_kernels
+
+The game then loads src/_aot_kernels instead of JIT-compiling the kernels on
+first launch. Without the extension, the kernels are JIT-compiled (when Numba is
+installed) or fall back to NumPy.
+"""
+
+import os
+
+from numba.pycc import CC
+
+# Importing the kernel modules registers their kernels and signatures in KERNELS
+import src.collision_kernels
+import src.enemy_kernels
+import src.nn_kernels
+import src.platform_kernels
+import src.projection_kernels
+from src.kernels import KERNELS
+
+
+def build():
+    """Compile the kernels into src/_aot_kernels"""
+    cc = CC('_aot_kernels')
+    cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+    cc.verbose = True
+
+    # Same signatures as the eager JIT builds. pycc has no parallel mode, so
+    # the threaded AI step for large groups stays JIT-only.
+    for name, (loop_fn, signature) in KERNELS.items():
+        cc.export(name, signature)(loop_fn)
+    cc.compile()
+
+
+if __name__ == "__main__":
+    build()
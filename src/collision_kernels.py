@@ -0,0 +1,47 @@
+"""
+Collision Kernels - Broad-phase rectangle overlap tests over platform bounds
+"""
+
+import numpy as np
+
+from src.kernels import select_kernel
+
+FIRST_OVERLAP_IN_SIGNATURE = "i8(i8, i8, i8, i8, i8[::1], i8[::1], i8[::1], i8[::1], i8[::1], i8)"
+
+
+def _first_overlap_in_numpy(left, top, right, bottom, lefts, tops, rights, bottoms, candidates, start):
+    """
+    Find the first candidate at or after position start that overlaps the given rectangle
+
+    Uses the same test as pygame.Rect.colliderect. All bounds arrays are
+    contiguous int64, one entry per rectangle.
+
+    Args:
+        left, top, right, bottom: Rectangle to test
+        lefts, tops, rights, bottoms: Bounds of all rectangles
+        candidates: Contiguous int64 indices of the rectangles to consider, ascending
+        start: First position in candidates to consider
+
+    Returns:
+        Position in candidates of the first overlapping rectangle, or -1
+    """
+    indices = candidates[start:]
+    hits = np.flatnonzero((lefts[indices] < right) & (left < rights[indices]) &
+                          (tops[indices] < bottom) & (top < bottoms[indices]))
+    return start + int(hits[0]) if hits.size else -1
+
+
+def _first_overlap_in_loop(left, top, right, bottom, lefts, tops, rights, bottoms, candidates, start):
+    """Early-exit version of _first_overlap_in_numpy, compiled by Numba"""
+    for k in range(start, candidates.shape[0]):
+        i = candidates[k]
+        if lefts[i] < right and left < rights[i] and tops[i] < bottom and top < bottoms[i]:
+            return k
+    return -1
+
+
+first_overlap_in = select_kernel('first_overlap_in', _first_overlap_in_loop, _first_overlap_in_numpy,
+                                 FIRST_OVERLAP_IN_SIGNATURE)
+
+# Whether first_overlap_in is compiled; the NumPy fallback pays per-call overhead on small inputs
+COMPILED = first_overlap_in is not _first_overlap_in_numpy
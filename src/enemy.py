@@ -4,13 +4,20 @@ Enemy - Enemy class with AI behavior
 
 import pygame
 import math
+import numpy as np
+from typing import Dict, Tuple
 from config.settings import *
-from src.sprite_manager import SpriteManager
+from src.sprite_manager import SpriteManager, to_display_format
+from src.ai_engine import AIEngine
+from src.enemy_kernels import AI_NONE, AI_PATROL, AI_CODES, step_legacy_ai
 
 
 class Enemy(pygame.sprite.Sprite):
     """Enemy with basic AI and patrol behavior"""
 
+    # Rendered sprites shared by all enemies, keyed by (width, height, uses sprite manager)
+    _image_cache: Dict[Tuple[int, int, bool], pygame.Surface] = {}
+
     def __init__(self, x: float, y: float, width: int, height: int, sprite_manager: SpriteManager = None, ai_type: str = "patrol"):
         """
         Initialize enemy
@@ -34,30 +41,106 @@ class Enemy(pygame.sprite.Sprite):
         self.ai_type = ai_type
         self.start_x = x
         self.start_y = y
-        self.patrol_range = 150
+        self.patrol_range = 150  # Also sets _patrol_range_sq, see the property
         self.patrol_direction = 1
         self.health = 1
-        self.is_alive = True
+        self._is_alive = True  # See the is_alive property
         self.on_ground = True
         self.ai_engine = None  # Will be set later
+        self.pending_ai_type = None  # AIType of an AIEngine to build on the first update
         self.animation_frame = 0
-        self.animation_counter = 0
+        self.animation_counter = 0  # Integer tick, wraps every 16 updates
 
-        # Create enemy sprite
-        if sprite_manager:
-            self.image = sprite_manager.create_placeholder_sprite(width, height, (255, 100, 100))
-        else:
-            self.image = pygame.Surface((width, height))
-            pygame.draw.rect(self.image, (255, 100, 100), (0, 0, width, height))
-            pygame.draw.rect(self.image, (200, 50, 50), (0, 0, width, height), 2)
-            # Draw simple eyes
-            pygame.draw.circle(self.image, (0, 0, 0), (width // 3, height // 3), 3)
-            pygame.draw.circle(self.image, (0, 0, 0), (2 * width // 3, height // 3), 3)
+        # Share one enemy sprite per size and style; the image is never modified
+        key = (width, height, sprite_manager is not None)
+        self.image = Enemy._image_cache.get(key)
+        if self.image is None:
+            self.image = Enemy._image_cache[key] = self._build_image(width, height, sprite_manager)
 
         self.rect = self.image.get_rect(topleft=(x, y))
         self._last_player = None  # For AIEngine callbacks
         self._last_platforms = None  # For AIEngine callbacks
 
+    @property
+    def is_alive(self) -> bool:
+        """Whether the enemy is still alive"""
+        return self._is_alive
+
+    @is_alive.setter
+    def is_alive(self, alive: bool):
+        alive = bool(alive)
+        if alive != self._is_alive:
+            self._is_alive = alive
+            # Keep the alive sets of the groups holding this enemy current
+            for group in self.groups():
+                if isinstance(group, EnemyGroup):
+                    if alive:
+                        group._alive[self] = None
+                    else:
+                        group._alive.pop(self, None)
+
+    @property
+    def ai_type(self) -> str:
+        """Legacy AI type ("patrol", "chase", "patrol_vertical")"""
+        return self._ai_type
+
+    @ai_type.setter
+    def ai_type(self, ai_type: str):
+        self._ai_type = ai_type
+        # Resolve the legacy AI step once instead of comparing strings every update
+        if ai_type == "patrol":
+            self._ai_step = self.patrol_horizontal
+        elif ai_type == "chase":
+            self._ai_step = self._chase_last_player
+        elif ai_type == "patrol_vertical":
+            self._ai_step = self.patrol_vertical
+        else:
+            self._ai_step = self._no_ai_step
+
+    def _chase_last_player(self):
+        """Legacy chase step, chasing the player passed to update()"""
+        if self._last_player:
+            self.chase_player(self._last_player)
+
+    def _no_ai_step(self):
+        """Legacy AI step for unknown AI types"""
+
+    @property
+    def patrol_range(self) -> float:
+        """Patrol distance from the start position"""
+        return self._patrol_range
+
+    @patrol_range.setter
+    def patrol_range(self, patrol_range: float):
+        self._patrol_range = patrol_range
+        self._patrol_range_sq = patrol_range * patrol_range  # Compared against squared offsets
+
+    @staticmethod
+    def _build_image(width: int, height: int, sprite_manager: SpriteManager = None) -> pygame.Surface:
+        """
+        Render the enemy sprite
+
+        Args:
+            width: Width
+            height: Height
+            sprite_manager: SpriteManager instance
+
+        Returns:
+            Enemy sprite surface
+        """
+        if sprite_manager:
+            image = sprite_manager.create_placeholder_sprite(width, height, (255, 100, 100))
+        else:
+            image = pygame.Surface((width, height))
+            pygame.draw.rect(image, (255, 100, 100), (0, 0, width, height))
+            pygame.draw.rect(image, (200, 50, 50), (0, 0, width, height), 2)
+            # Draw simple eyes
+            pygame.draw.circle(image, (0, 0, 0), (width // 3, height // 3), 3)
+            pygame.draw.circle(image, (0, 0, 0), (2 * width // 3, height // 3), 3)
+            # Match the display format so every blit takes the fast path
+            image = to_display_format(image)
+        return image
+
     def update(self, player=None, platforms=None):
         """
         Update enemy
@@ -69,6 +152,11 @@ class Enemy(pygame.sprite.Sprite):
         if not self.is_alive:
             return
 
+        # Build a deferred AIEngine now, so level loading does not pay for it
+        if self.ai_engine is None and self.pending_ai_type is not None:
+            self.ai_engine = AIEngine(self, self.pending_ai_type)
+            self.pending_ai_type = None
+
         # Store player reference for use in AIEngine callbacks
         self._last_player = player
         self._last_platforms = platforms
@@ -77,14 +165,18 @@ class Enemy(pygame.sprite.Sprite):
         if self.ai_engine:
             self.ai_engine.update(player, platforms)
         else:
-            # Fallback to legacy AI system
-            if self.ai_type == "patrol":
-                self.patrol_horizontal()
-            elif self.ai_type == "chase" and player:
-                self.chase_player(player)
-            elif self.ai_type == "patrol_vertical":
-                self.patrol_vertical()
+            # Fallback to legacy AI system, bound when ai_type was set
+            self._ai_step()
+
+        self.step_physics(platforms)
 
+    def step_physics(self, platforms=None):
+        """
+        Apply gravity, move by the current velocity and resolve collisions
+
+        Args:
+            platforms: Platform group (for collision)
+        """
         # Apply gravity
         self.apply_gravity()
 
@@ -97,16 +189,17 @@ class Enemy(pygame.sprite.Sprite):
         if platforms:
             self.check_platform_collisions(platforms)
 
-        self.animation_counter += 0.1
-        if self.animation_counter >= 1:
-            self.animation_counter = 0
+        # Integer ticker: 16-tick cycle, 4 ticks per animation frame
+        self.animation_counter = (self.animation_counter + 1) & 15
+        self.animation_frame = self.animation_counter >> 2
 
     def patrol_horizontal(self):
         """Patrol back and forth horizontally"""
         self.velocity_x = self.speed * self.patrol_direction
 
         # Reverse direction at patrol range limits
-        if abs(self.x - self.start_x) > self.patrol_range:
+        offset = self.x - self.start_x
+        if offset * offset > self._patrol_range_sq:
             self.patrol_direction *= -1
             self.velocity_x = self.speed * self.patrol_direction
 
@@ -154,23 +247,25 @@ class Enemy(pygame.sprite.Sprite):
         self.velocity_y = self.speed * self.patrol_direction
 
         # Reverse direction at patrol range limits
-        if abs(self.y - self.start_y) > self.patrol_range:
+        offset = self.y - self.start_y
+        if offset * offset > self._patrol_range_sq:
             self.patrol_direction *= -1
             self.velocity_y = self.speed * self.patrol_direction
 
     def chase_player(self, player):
         """Chase the player when spotted"""
-        # Calculate distance to player
+        # Calculate squared distance to player
         dx = player.x - self.x
         dy = player.y - self.y
-        distance = math.sqrt(dx**2 + dy**2)
+        distance_sq = dx * dx + dy * dy
 
         # Only chase if player is in range (200 pixels)
-        if distance < 200:
+        if distance_sq < 200 * 200:
             # Normalize and apply speed
-            if distance > 0:
-                self.velocity_x = (dx / distance) * self.speed
-                self.velocity_y = (dy / distance) * (self.speed * 0.5)
+            if distance_sq > 0:
+                scale = self.speed / math.sqrt(distance_sq)
+                self.velocity_x = dx * scale
+                self.velocity_y = dy * scale * 0.5
         else:
             # Return to patrol
             self.ai_type = "patrol"
@@ -210,10 +305,9 @@ class Enemy(pygame.sprite.Sprite):
 
         dx = player.x - self.x
         dy = player.y - self.y
-        distance = math.sqrt(dx**2 + dy**2)
 
-        # Can see if within range and not blocked
-        return distance < range
+        # Can see if within range and not blocked (compared squared, no sqrt needed)
+        return dx * dx + dy * dy < range * range
 
     def jump(self):
         """Make enemy jump"""
@@ -262,8 +356,21 @@ class EnemyGroup(pygame.sprite.Group):
 
     def __init__(self):
         """Initialize enemy group"""
+        # Alive enemies as an insertion-ordered set, maintained by add/remove_internal and Enemy.is_alive
+        self._alive: Dict[Enemy, None] = {}
         super().__init__()
 
+    def add_internal(self, sprite, layer=None):
+        """Track alive enemies as they join the group"""
+        super().add_internal(sprite, layer)
+        if getattr(sprite, 'is_alive', False):
+            self._alive[sprite] = None
+
+    def remove_internal(self, sprite):
+        """Track alive enemies as they leave the group"""
+        super().remove_internal(sprite)
+        self._alive.pop(sprite, None)
+
     def create_enemy(self, x: float, y: float, width: int = ENEMY_WIDTH, height: int = ENEMY_HEIGHT, sprite_manager: SpriteManager = None, ai_type: str = "patrol"):
         """
         Create and add an enemy
@@ -291,8 +398,55 @@ class EnemyGroup(pygame.sprite.Group):
             player: Player object
             platforms: Platform group
         """
+        legacy = []
         for enemy in self:
-            enemy.update(player, platforms)
+            if enemy.ai_engine or enemy.pending_ai_type is not None or not enemy.is_alive:
+                enemy.update(player, platforms)
+            else:
+                legacy.append(enemy)
+        if legacy:
+            self._update_legacy(legacy, player, platforms)
+
+    def _update_legacy(self, enemies, player, platforms):
+        """
+        Update enemies without an AIEngine, running their AI as one vectorized step
+
+        Args:
+            enemies: Alive enemies using the legacy AI
+            player: Player object
+            platforms: Platform group
+        """
+        # Gather the AI inputs as structure-of-arrays (one row per field)
+        state = np.array([(e.x, e.y, e.velocity_x, e.velocity_y, e.speed, e.start_x, e.start_y,
+                           e._patrol_range_sq, e.patrol_direction, AI_CODES.get(e.ai_type, AI_NONE))
+                          for e in enemies], dtype=np.float64).T
+        state = np.ascontiguousarray(state)
+        (x, y, velocity_x, velocity_y, speed, start_x, start_y,
+         patrol_range_sq, patrol_direction, ai_code) = state
+        step_legacy_ai(x, y, velocity_x, velocity_y, speed, start_x, start_y, patrol_range_sq,
+                       patrol_direction, ai_code, float(player.x) if player else 0.0,
+                       float(player.y) if player else 0.0, bool(player))
+
+        # Scatter the results back and finish each enemy's update
+        for enemy, vx, vy, direction, code in zip(enemies, velocity_x.tolist(), velocity_y.tolist(),
+                                                  patrol_direction.tolist(), ai_code.tolist()):
+            enemy._last_player = player
+            enemy._last_platforms = platforms
+            enemy.velocity_x = vx
+            enemy.velocity_y = vy
+            enemy.patrol_direction = int(direction)
+            if code == AI_PATROL and enemy.ai_type == "chase":
+                enemy.ai_type = "patrol"  # Lost sight of the player
+            enemy.step_physics(platforms)
+
+    def draw_alive(self, surface: pygame.Surface):
+        """
+        Draw all alive enemies in one batched blit call
+
+        Args:
+            surface: Pygame surface to draw on
+        """
+        surface.blits([(enemy.image, enemy.rect) for enemy in self._alive], doreturn=False)
 
     def check_collisions(self, player):
         """
@@ -304,12 +458,21 @@ class EnemyGroup(pygame.sprite.Group):
         Returns:
             List of collided enemies
         """
-        collided = []
-        for enemy in self:
-            if enemy.check_collision_with_player(player):
-                collided.append(enemy)
-        return collided
+        enemies = self.sprites()
+        return [enemies[i] for i in player.rect.collidelistall([enemy.rect for enemy in enemies])]
+
+    def count_collisions(self, player) -> int:
+        """
+        Count the enemies touching the player
+
+        Args:
+            player: Player object
+
+        Returns:
+            Number of collided enemies
+        """
+        return len(player.rect.collidelistall([enemy.rect for enemy in self.sprites()]))
 
     def get_alive_count(self):
         """Get count of alive enemies"""
-        return sum(1 for enemy in self if enemy.is_alive)
+        return len(self._alive)
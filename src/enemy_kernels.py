@@ -0,0 +1,120 @@
+"""
+Enemy Kernels - Batched AI steps for enemies without an AIEngine
+"""
+
+import math
+import numpy as np
+
+from src.kernels import HAVE_NUMBA, aot_kernel, jit, prange, select_kernel
+
+STEP_LEGACY_AI_SIGNATURE = "void(" + ", ".join(["f8[::1]"] * 10) + ", f8, f8, b1)"
+
+
+# Legacy (non-AIEngine) AI types as codes for the batched step
+AI_NONE = -1
+AI_PATROL = 0
+AI_CHASE = 1
+AI_PATROL_VERTICAL = 2
+AI_CODES = {"patrol": AI_PATROL, "chase": AI_CHASE, "patrol_vertical": AI_PATROL_VERTICAL}
+
+# Below this many enemies thread start-up costs more than the parallel kernel saves
+PARALLEL_MIN_ENEMIES = 256
+
+
+def _step_legacy_ai_numpy(x, y, velocity_x, velocity_y, speed, start_x, start_y, patrol_range_sq,
+                           patrol_direction, ai_code, player_x, player_y, has_player):
+    """
+    Run the legacy patrol/chase AI for many enemies at once
+
+    Same rules as Enemy.patrol_horizontal, patrol_vertical and chase_player.
+    All arrays are contiguous float64, one entry per enemy; velocities,
+    patrol directions and AI codes are updated in place.
+
+    Args:
+        x, y, velocity_x, velocity_y, speed, start_x, start_y, patrol_range_sq,
+        patrol_direction, ai_code: Per-enemy state arrays
+        player_x, player_y: Player position
+        has_player: False to skip the chase rule (no player to chase)
+    """
+    patrol = ai_code == AI_PATROL
+    vertical = ai_code == AI_PATROL_VERTICAL
+
+    # Reverse direction at patrol range limits
+    offset = np.where(vertical, y - start_y, x - start_x)
+    flip = (patrol | vertical) & (offset * offset > patrol_range_sq)
+    np.negative(patrol_direction, out=patrol_direction, where=flip)
+    velocity = speed * patrol_direction
+    np.copyto(velocity_x, velocity, where=patrol)
+    np.copyto(velocity_y, velocity, where=vertical)
+
+    if not has_player:
+        return
+
+    # Chase only if player is in range (200 pixels), otherwise return to patrol
+    chase = ai_code == AI_CHASE
+    dx = player_x - x
+    dy = player_y - y
+    distance = np.sqrt(dx * dx + dy * dy)
+    near = chase & (distance < 200)
+    moving = near & (distance > 0)
+    distance[~moving] = 1.0
+    np.copyto(velocity_x, dx / distance * speed, where=moving)
+    np.copyto(velocity_y, dy / distance * (speed * 0.5), where=moving)
+    lost = chase & ~near
+    velocity_x[lost] = 0
+    velocity_y[lost] = 0
+    ai_code[lost] = AI_PATROL
+
+
+def _step_legacy_ai_loop(x, y, velocity_x, velocity_y, speed, start_x, start_y, patrol_range_sq,
+                         patrol_direction, ai_code, player_x, player_y, has_player):
+    """
+    Single-pass version of _step_legacy_ai_numpy, compiled by Numba
+
+    Each iteration only touches index i, so the loop is safe to run in parallel.
+    """
+    for i in prange(x.shape[0]):
+        code = ai_code[i]
+        if code == AI_PATROL:
+            # Reverse direction at patrol range limits
+            offset = x[i] - start_x[i]
+            if offset * offset > patrol_range_sq[i]:
+                patrol_direction[i] = -patrol_direction[i]
+            velocity_x[i] = speed[i] * patrol_direction[i]
+        elif code == AI_PATROL_VERTICAL:
+            offset = y[i] - start_y[i]
+            if offset * offset > patrol_range_sq[i]:
+                patrol_direction[i] = -patrol_direction[i]
+            velocity_y[i] = speed[i] * patrol_direction[i]
+        elif code == AI_CHASE and has_player:
+            dx = player_x - x[i]
+            dy = player_y - y[i]
+            distance_sq = dx * dx + dy * dy
+            if distance_sq < 200 * 200:
+                if distance_sq > 0:
+                    scale = speed[i] / math.sqrt(distance_sq)
+                    velocity_x[i] = dx * scale
+                    velocity_y[i] = dy * scale * 0.5
+            else:
+                velocity_x[i] = 0.0
+                velocity_y[i] = 0.0
+                ai_code[i] = AI_PATROL
+
+
+_step_legacy_ai_serial = select_kernel('step_legacy_ai_serial', _step_legacy_ai_loop, _step_legacy_ai_numpy,
+                                       STEP_LEGACY_AI_SIGNATURE, fastmath=True)
+
+if HAVE_NUMBA:
+    # pycc has no parallel mode, so the threaded kernel is always JIT-compiled. Next to an
+    # AOT serial kernel it compiles on first use by a large group rather than at start-up.
+    _parallel_signature = None if aot_kernel('step_legacy_ai_serial') is not None else STEP_LEGACY_AI_SIGNATURE
+    _step_legacy_ai_parallel = jit(_step_legacy_ai_loop, _parallel_signature, parallel=True, fastmath=True)
+
+    def step_legacy_ai(x, y, velocity_x, velocity_y, speed, start_x, start_y, patrol_range_sq,
+                       patrol_direction, ai_code, player_x, player_y, has_player):
+        """Run the compiled AI step, spreading it over threads for large groups"""
+        kernel = _step_legacy_ai_parallel if x.shape[0] >= PARALLEL_MIN_ENEMIES else _step_legacy_ai_serial
+        kernel(x, y, velocity_x, velocity_y, speed, start_x, start_y, patrol_range_sq,
+               patrol_direction, ai_code, player_x, player_y, has_player)
+else:
+    step_legacy_ai = _step_legacy_ai_serial
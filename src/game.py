@@ -4,27 +4,71 @@ Game - Main game engine and loop
 
 import pygame
 import sys
+from typing import Dict, List, Tuple
 from config.settings import *
 from src.player import Player
-from src.platform import PlatformGroup
-from src.enemy import EnemyGroup
+from src.platform import Platform, PlatformGroup
+from src.enemy import Enemy, EnemyGroup
 from src.level import Level
-from src.ui import HUD, Menu, PauseMenu, BackstoryScreen
-from src.sprite_manager import SpriteManager
+from src.ui import HUD, Menu, PauseMenu, BackstoryScreen, get_font
+from src.sprite_manager import SpriteManager, to_display_format
 from src.tinkercad_editor import CharacterDesigner
 from src.block_editor import BlockEditor
-from src.audio_manager import AudioManager
+from src.audio_manager import AudioManager, SND_JUMP, SND_LAND, SND_ENEMY_DEFEAT, SND_LEVEL_COMPLETE, SND_GAME_OVER
 from src.transitions import TransitionManager
 
 
 class Game:
     """Main game class"""
 
+    # Fixed attribute layout: the per-frame code reads these through slots, not a __dict__
+    __slots__ = (
+        'screen',
+        'clock',
+        'running',
+        'state',
+        'current_level_number',
+        'fullscreen',
+        'audio_manager',
+        '_sound_events',
+        'transition_manager',
+        'pending_level',
+        'sprite_manager',
+        'player',
+        'level',
+        'hud',
+        'menu',
+        'pause_menu',
+        'backstory_screen',
+        'character_designer',
+        'block_editor',
+        'current_events',
+        '_keys_this_frame',
+        'last_drawn_state',
+        'last_frame_key',
+        'level_complete_overlay',
+        'game_over_overlay',
+        'font_96',
+        'font_72',
+        'font_48',
+        '_text_cache',
+        'final_score_text',
+        'level_complete_blits',
+        'game_over_blits',
+        '_keydown_handlers',
+        '_update_handlers',
+        '_draw_handlers',
+    )
+
     def __init__(self):
         """Initialize game"""
+        AudioManager.pre_init()
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Cecil's Big Game - Platform Adventure")
+        # Only queue events the game reacts to; keyboard and mouse state are polled directly
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.VIDEOEXPOSE])
         self.clock = pygame.time.Clock()
         self.running = True
         self.state = STATE_BACKSTORY
@@ -33,9 +77,11 @@ class Game:
 
         # Initialize audio manager
         self.audio_manager = AudioManager()
+        self._sound_events: List[str] = []  # Sounds queued during the current gameplay update
 
         # Initialize transition manager
         self.transition_manager = TransitionManager()
+        self.pending_level = None  # Level to load once the running fade out finishes
 
         # Initialize sprite manager
         self.sprite_manager = SpriteManager()
@@ -50,8 +96,101 @@ class Game:
         self.character_designer = CharacterDesigner(SCREEN_WIDTH, SCREEN_HEIGHT)
         self.block_editor = BlockEditor(SCREEN_WIDTH, SCREEN_HEIGHT)
         self.block_editor.create_example_ai()
-        self.fps_clock = pygame.time.Clock()
         self.current_events = []  # Store events for passing to editors
+        self._keys_this_frame = None  # Keyboard state snapshot, set during update()
+        self.last_drawn_state = None  # State shown by the previous frame
+        self.last_frame_key = None  # See _static_frame_key()
+
+        # Fixed full-screen overlays for the level complete and game over screens
+        self.level_complete_overlay = self._create_overlay(180)
+        self.game_over_overlay = self._create_overlay(200)
+
+        # Fonts and rendered text for the level complete and game over screens
+        self.font_96 = get_font(96)
+        self.font_72 = get_font(72)
+        self.font_48 = get_font(48)
+        self._text_cache: Dict[Tuple[str, int, Tuple[int, int, int], int], Tuple[pygame.Surface, pygame.Rect]] = {}
+        self.final_score_text = None  # (score, surface, rect) of the last rendered final score
+
+        self._build_end_screen_blits()
+
+        # Per-state handlers, one dict lookup per event/frame instead of an if/elif chain
+        self._keydown_handlers = {
+            STATE_MENU: self._keydown_menu,
+            STATE_EDITOR: self._keydown_editor,
+            STATE_BLOCK_EDITOR: self._keydown_block_editor,
+            STATE_PLAYING: self._keydown_playing,
+            STATE_PAUSED: self._keydown_paused,
+            STATE_BACKSTORY: self._keydown_backstory,
+            STATE_LEVEL_COMPLETE: self._keydown_level_complete,
+            STATE_GAME_OVER: self._keydown_game_over,
+        }
+        self._update_handlers = {
+            STATE_BACKSTORY: self._update_backstory,
+            STATE_EDITOR: self._update_editor,
+            STATE_BLOCK_EDITOR: self._update_block_editor,
+            STATE_PLAYING: self._update_playing,
+        }
+        self._draw_handlers = {
+            STATE_MENU: self._draw_menu,
+            STATE_EDITOR: self._draw_editor,
+            STATE_BLOCK_EDITOR: self._draw_block_editor,
+            STATE_PLAYING: self._draw_playing,
+            STATE_PAUSED: self._draw_paused,
+            STATE_BACKSTORY: self._draw_backstory,
+            STATE_LEVEL_COMPLETE: self._draw_level_complete,
+            STATE_GAME_OVER: self._draw_game_over,
+        }
+
+    def _centered_text(self, text: str, font: pygame.font.Font, color: Tuple[int, int, int],
+                       y_offset: int) -> Tuple[pygame.Surface, pygame.Rect]:
+        """
+        Render static text centered horizontally, reusing it across frames
+
+        Args:
+            text: Text to render
+            font: Font to render with
+            color: Text color
+            y_offset: Vertical offset of the text center from the screen center
+
+        Returns:
+            (surface, rect) ready to blit
+        """
+        key = (text, id(font), color, y_offset)
+        rendered = self._text_cache.get(key)
+        if rendered is None:
+            surface = font.render(text, True, color)
+            rect = surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + y_offset))
+            rendered = self._text_cache[key] = (surface, rect)
+        return rendered
+
+    def _create_overlay(self, alpha: int) -> pygame.Surface:
+        """
+        Create a translucent black full-screen overlay in the display format
+
+        Args:
+            alpha: Overlay opacity (0-255)
+
+        Returns:
+            Overlay surface
+        """
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        overlay.fill(COLOR_BLACK)
+        overlay.set_alpha(alpha)
+        return overlay
+
+    def _build_end_screen_blits(self):
+        """Collect the static layers of the end-of-level screens, drawn with one blits call each"""
+        self.level_complete_blits = [
+            (self.level_complete_overlay, (0, 0)),
+            self._centered_text("LEVEL COMPLETE!", self.font_72, COLOR_YELLOW, -100),
+            self._centered_text("Press SPACE for next level", self.font_48, COLOR_WHITE, 100),
+        ]
+        self.game_over_blits = [
+            (self.game_over_overlay, (0, 0)),
+            self._centered_text("GAME OVER", self.font_96, COLOR_RED, -150),
+            self._centered_text("Press SPACE to retry or ENTER for menu", self.font_48, COLOR_CYAN, 100),
+        ]
 
     def start_new_game(self):
         """Start a new game"""
@@ -61,13 +200,54 @@ class Game:
 
     def toggle_fullscreen(self):
         """Toggle fullscreen mode"""
+        old_format = (self.screen.get_bitsize(), self.screen.get_masks())
         self.fullscreen = not self.fullscreen
         if self.fullscreen:
             self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
         else:
             self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.last_drawn_state = None
         pygame.display.set_caption("Cecil's Big Game - Platform Adventure")
 
+        # Surfaces converted for the old display would be translated per pixel on every blit
+        if (self.screen.get_bitsize(), self.screen.get_masks()) != old_format:
+            self._reconvert_surfaces()
+
+    def _reconvert_surfaces(self):
+        """Convert every cached and live surface to the current display format"""
+        converted: Dict[int, pygame.Surface] = {}
+
+        def convert(surface: pygame.Surface) -> pygame.Surface:
+            # Surfaces shared between sprites are converted once and stay shared
+            new = converted.get(id(surface))
+            if new is None:
+                new = converted[id(surface)] = to_display_format(surface)
+            return new
+
+        self.level_complete_overlay = self._create_overlay(180)
+        self.game_over_overlay = self._create_overlay(200)
+        self._build_end_screen_blits()
+        self.menu.invalidate()
+        self.pause_menu.invalidate()
+        self.transition_manager.clear_surface_pool()
+        self.block_editor.clear_text_cache()
+
+        self.sprite_manager.reconvert_cache(convert)
+        for key, image in Enemy._image_cache.items():
+            Enemy._image_cache[key] = convert(image)
+        for key, image in Platform._image_cache.items():
+            Platform._image_cache[key] = convert(image)
+
+        if self.player:
+            self.player.convert_frames(convert)
+        if self.level:
+            for group in (self.level.platforms, self.level.enemies, self.level.collectibles):
+                for sprite in group:
+                    sprite.image = convert(sprite.image)
+            if self.level.goal_image is not None:
+                self.level.goal_image = convert(self.level.goal_image)
+            self.level.invalidate_background()
+
     def load_level(self, level_number: int):
         """
         Load a level
@@ -83,8 +263,13 @@ class Game:
         transition = self.transition_manager.create_level_transition(600)
         transition.start(fade_out=False)  # Fade in from black
 
-        self.level = Level(level_number, self.sprite_manager)
-        self.player = Player(self.level.player_start_x, self.level.player_start_y, self.sprite_manager)
+        if self.level is not None and self.level.level_number == level_number:
+            # Replaying the same level: reset it and the player in place instead of rebuilding them
+            self.level.reset()
+            self.player.reset(self.level.player_start_x, self.level.player_start_y)
+        else:
+            self.level = Level(level_number, self.sprite_manager)
+            self.player = Player(self.level.player_start_x, self.level.player_start_y, self.sprite_manager)
 
     def handle_events(self):
         """Handle game events"""
@@ -96,251 +281,308 @@ class Game:
             if event.type == pygame.QUIT:
                 self.running = False
 
+            if event.type == pygame.VIDEOEXPOSE:
+                self.last_drawn_state = None  # Window contents were lost, repaint fully
+
             if event.type == pygame.KEYDOWN:
                 # Fullscreen toggle (F key)
                 if event.key == pygame.K_f:
                     self.toggle_fullscreen()
 
-                if self.state == STATE_MENU:
-                    if event.key == pygame.K_UP:
-                        self.menu.selected_button = (self.menu.selected_button - 1) % len(self.menu.buttons)
-                        self.audio_manager.play_menu_select()
-                    elif event.key == pygame.K_DOWN:
-                        self.menu.selected_button = (self.menu.selected_button + 1) % len(self.menu.buttons)
-                        self.audio_manager.play_menu_select()
-                    elif event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
-                        action = self.menu.buttons[self.menu.selected_button]['action']
-                        self.audio_manager.play_menu_select()
-                        if action == 'start':
-                            self.start_new_game()
-                        elif action == 'designer':
-                            self.state = STATE_EDITOR
-                        elif action == 'editor':
-                            self.state = 'block_editor'
-                        elif action == 'quit':
-                            self.running = False
-
-                elif self.state == STATE_EDITOR:
-                    if event.key == pygame.K_ESCAPE:
-                        self.state = STATE_MENU
-                        self.menu.selected_button = 0
-                    elif event.key == pygame.K_s:
-                        self.character_designer.save_design()
-
-                elif self.state == 'block_editor':
-                    if event.key == pygame.K_ESCAPE:
-                        self.state = STATE_MENU
-                        self.menu.selected_button = 0
-                    elif event.key == pygame.K_s:
-                        self.block_editor.save_ai()
-
-                elif self.state == STATE_PLAYING:
-                    if event.key == pygame.K_p or event.key == pygame.K_ESCAPE:
-                        self.state = STATE_PAUSED
-
-                elif self.state == STATE_PAUSED:
-                    if event.key == pygame.K_p or event.key == pygame.K_ESCAPE:
-                        self.state = STATE_PLAYING
-
-                elif self.state == STATE_BACKSTORY:
-                    # space advances lines or skips to menu
-                    if event.key == pygame.K_SPACE:
-                        if self.backstory_screen.finished:
-                            self.state = STATE_MENU
-                        else:
-                            # jump to next line immediately
-                            self.backstory_screen.current_line += 1
-                            self.backstory_screen.char_index = 0
-                            self.backstory_screen.display_text = ""
-                            self.backstory_screen.last_update = pygame.time.get_ticks()
+                handler = self._keydown_handlers.get(self.state)
+                if handler:
+                    handler(event)
+
+    def _keydown_menu(self, event):
+        """Handle a key press in the main menu"""
+        if event.key == pygame.K_UP:
+            self.menu.selected_button = (self.menu.selected_button - 1) % len(self.menu.buttons)
+            self.audio_manager.play_menu_select()
+        elif event.key == pygame.K_DOWN:
+            self.menu.selected_button = (self.menu.selected_button + 1) % len(self.menu.buttons)
+            self.audio_manager.play_menu_select()
+        elif event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
+            action = self.menu.buttons[self.menu.selected_button]['action']
+            self.audio_manager.play_menu_select()
+            if action == 'start':
+                self.start_new_game()
+            elif action == 'designer':
+                self.state = STATE_EDITOR
+            elif action == 'editor':
+                self.state = STATE_BLOCK_EDITOR
+            elif action == 'quit':
+                self.running = False
+
+    def _keydown_editor(self, event):
+        """Handle a key press in the character designer"""
+        if event.key == pygame.K_ESCAPE:
+            self.state = STATE_MENU
+            self.menu.selected_button = 0
+        elif event.key == pygame.K_s:
+            self.character_designer.save_design()
+
+    def _keydown_block_editor(self, event):
+        """Handle a key press in the block editor"""
+        if event.key == pygame.K_ESCAPE:
+            self.state = STATE_MENU
+            self.menu.selected_button = 0
+        elif event.key == pygame.K_s:
+            self.block_editor.save_ai()
+
+    def _keydown_playing(self, event):
+        """Handle a key press while playing"""
+        if event.key == pygame.K_p or event.key == pygame.K_ESCAPE:
+            self.state = STATE_PAUSED
+
+    def _keydown_paused(self, event):
+        """Handle a key press while paused"""
+        if event.key == pygame.K_p or event.key == pygame.K_ESCAPE:
+            self.state = STATE_PLAYING
+
+    def _keydown_backstory(self, event):
+        """Handle a key press on the backstory screen"""
+        # space advances lines or skips to menu
+        if event.key == pygame.K_SPACE:
+            if self.backstory_screen.finished:
+                self.state = STATE_MENU
+            else:
+                # jump to next line immediately
+                self.backstory_screen.current_line += 1
+                self.backstory_screen.char_index = 0
+                self.backstory_screen.display_text = ""
+                self.backstory_screen.last_update = pygame.time.get_ticks()
+
+    def _keydown_level_complete(self, event):
+        """Load the next level on SPACE or ENTER"""
+        if self.pending_level is not None:
+            return  # Already fading out to the next level
+        if event.key == pygame.K_SPACE or event.key == pygame.K_RETURN:
+            # Start fade out transition
+            transition = self.transition_manager.create_level_transition(500)
+            transition.start(fade_out=True)  # Fade to black
+
+            self.current_level_number += 1
+            if self.current_level_number >= NUM_LEVELS:
+                # Game complete - go to menu
+                self.end_game()
+            else:
+                # Load the level once the fade out finishes (see update)
+                self.pending_level = self.current_level_number
+
+    def _keydown_game_over(self, event):
+        """Restart the level on SPACE, go to the menu on ENTER"""
+        if event.key == pygame.K_SPACE:
+            self.load_level(self.current_level_number)
+            self.state = STATE_PLAYING
+        elif event.key == pygame.K_RETURN:
+            self.state = STATE_MENU
+            self.menu.selected_button = 0
 
     def update(self):
         """Update game logic"""
         # Update transitions
         self.transition_manager.update()
 
-        if self.state == STATE_MENU:
-            # Menu input handled in draw
-            pass
-
-        elif self.state == STATE_BACKSTORY:
-            self.backstory_screen.update()
-            if self.backstory_screen.finished:
-                # a short pause then return to menu
-                self.state = STATE_MENU
-                self.menu.selected_button = 0
-
-        elif self.state == STATE_EDITOR:
-            # Character designer update
-            keys = pygame.key.get_pressed()
-            self.character_designer.handle_input(keys, self.current_events)
-
-        elif self.state == 'block_editor':
-            # Block editor update
-            mouse_pos = pygame.mouse.get_pos()
-            mouse_buttons = pygame.mouse.get_pressed()
-            self.block_editor.handle_input(mouse_pos, mouse_buttons, self.current_events)
-
-        elif self.state == STATE_PLAYING:
-            # Get input
-            keys = pygame.key.get_pressed()
-            self.player.handle_input(keys)
-
-            # Update player
-            self.player.update(gravity=True)
-
-            # Play jump sound if jump just happened
-            if self.player.is_jumping and not self.player.jump_sound_played:
-                self.audio_manager.play_jump()
-                self.player.jump_sound_played = True
-
-            # Check platform collisions
-            self.level.platforms.check_collisions(self.player)
-
-            # Play land sound when landing (transition from not on ground to on ground)
-            if self.player.on_ground and not self.player.land_sound_played:
-                self.audio_manager.play_land()
-                self.player.land_sound_played = True
-
-            # Update level
-            self.level.update(self.player)
-
-            # Check level complete
-            if self.level.is_complete():
-                self.audio_manager.play_level_complete()
-                self.state = STATE_LEVEL_COMPLETE
-                return
-
-            # Check game over (fall off map)
-            if self.player.y > SCREEN_HEIGHT:
-                self.player.take_damage()
-                if self.player.health <= 0:
-                    self.audio_manager.play_game_over()
-                    self.state = STATE_GAME_OVER
-                else:
-                    # Reset to level start
-                    self.player.reset_position(self.level.player_start_x, self.level.player_start_y)
-
-            # Check enemy collisions
-            collided_enemies = self.level.enemies.check_collisions(self.player)
-            for enemy in collided_enemies:
-                self.player.take_damage()
-                self.audio_manager.play_enemy_defeat()
-                if self.player.health <= 0:
-                    self.audio_manager.play_game_over()
-                    self.state = STATE_GAME_OVER
-
-        elif self.state == STATE_LEVEL_COMPLETE:
-            # Wait for input, then load next level
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_SPACE] or keys[pygame.K_RETURN]:
-                # Start fade out transition
-                transition = self.transition_manager.create_level_transition(500)
-                transition.start(fade_out=True)  # Fade to black
-
-                self.current_level_number += 1
-                if self.current_level_number >= NUM_LEVELS:
-                    # Game complete - go to menu
-                    self.end_game()
-                else:
-                    # Give transition time to complete, then load level
-                    pygame.time.wait(300)  # Wait 300ms before loading
-                    self.load_level(self.current_level_number)
-                    self.state = STATE_PLAYING
-
-        elif self.state == STATE_GAME_OVER:
-            # Wait for input to restart or go to menu
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_SPACE]:
-                self.load_level(self.current_level_number)
-                self.state = STATE_PLAYING
-            elif keys[pygame.K_RETURN]:
-                self.state = STATE_MENU
-                self.menu.selected_button = 0
-
-    def draw(self):
-        """Draw everything"""
-        self.screen.fill(COLOR_SKY_BLUE)
-
-        if self.state == STATE_MENU:
-            self.menu.draw(self.screen)
-
-        elif self.state == STATE_EDITOR:
-            self.character_designer.draw(self.screen)
+        # Load the next level once its fade out has finished
+        if self.pending_level is not None and not self.transition_manager.has_active_transitions():
+            self.load_level(self.pending_level)
+            self.pending_level = None
+            self.state = STATE_PLAYING
+
+        # Menu, level complete and game over input is handled in handle_events,
+        # so those states have no update handler
+        handler = self._update_handlers.get(self.state)
+        if handler:
+            # One keyboard snapshot per frame, shared by everything the handler updates
+            self._keys_this_frame = pygame.key.get_pressed()
+            handler()
+            self._keys_this_frame = None
+
+    def _update_backstory(self):
+        """Update the backstory screen"""
+        self.backstory_screen.update()
+        if self.backstory_screen.finished:
+            # a short pause then return to menu
+            self.state = STATE_MENU
+            self.menu.selected_button = 0
+
+    def _update_editor(self):
+        """Update the character designer"""
+        self.character_designer.handle_input(self._keys_this_frame, self.current_events)
+
+    def _update_block_editor(self):
+        """Update the block editor"""
+        mouse_pos = pygame.mouse.get_pos()
+        mouse_buttons = pygame.mouse.get_pressed()
+        self.block_editor.handle_input(mouse_pos, mouse_buttons, self.current_events)
+
+    def _update_playing(self):
+        """Update gameplay, then play the sounds it queued"""
+        # Nothing is simulated while the screen fades; the transition is still drawn
+        if self.transition_manager.has_active_transitions():
+            return
 
-        elif self.state == 'block_editor':
-            self.block_editor.draw(self.screen)
+        sounds = self._sound_events
+        sounds.clear()
+        self._step_playing(sounds)
+        if sounds:
+            self.audio_manager.play_sounds(sounds)
 
-        elif self.state == STATE_PLAYING:
-            # Draw level
-            self.level.draw(self.screen)
+    def _step_playing(self, sounds: List[str]):
+        """
+        Advance gameplay by one frame
 
-            # Draw player
-            self.screen.blit(self.player.image, self.player.rect)
+        Args:
+            sounds: List to queue sound effects on; each is played once after the update
+        """
+        # Bind the objects used throughout the frame to locals once
+        player = self.player
+        level = self.level
 
-            # Draw HUD
-            self.hud.draw(self.screen, self.player, self.current_level_number, self.fps_clock.get_fps())
+        # Get input
+        player.handle_input(self._keys_this_frame)
 
-        elif self.state == STATE_PAUSED:
-            # Draw game behind pause menu
-            self.level.draw(self.screen)
-            self.screen.blit(self.player.image, self.player.rect)
-            self.pause_menu.draw(self.screen)
+        # Update player
+        player.update(gravity=True)
 
-        elif self.state == STATE_BACKSTORY:
-            self.backstory_screen.draw(self.screen)
+        # Play jump sound if jump just happened
+        if player.is_jumping and not player.jump_sound_played:
+            sounds.append(SND_JUMP)
+            player.jump_sound_played = True
 
-        elif self.state == STATE_LEVEL_COMPLETE:
-            # Draw completion screen
-            self.level.draw(self.screen)
-            self.screen.blit(self.player.image, self.player.rect)
+        # Check platform collisions
+        level.platforms.check_collisions(player)
 
-            # Overlay
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.set_alpha(180)
-            overlay.fill(COLOR_BLACK)
-            self.screen.blit(overlay, (0, 0))
+        # Play land sound when landing (transition from not on ground to on ground)
+        if player.on_ground and not player.land_sound_played:
+            sounds.append(SND_LAND)
+            player.land_sound_played = True
 
-            # Level complete message
-            font_large = pygame.font.Font(None, 72)
-            font_medium = pygame.font.Font(None, 48)
+        # Update level
+        level.update(player)
 
-            level_complete_text = font_large.render("LEVEL COMPLETE!", True, COLOR_YELLOW)
-            level_complete_rect = level_complete_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 100))
-            self.screen.blit(level_complete_text, level_complete_rect)
+        # Check level complete
+        if level.is_complete():
+            sounds.append(SND_LEVEL_COMPLETE)
+            self.state = STATE_LEVEL_COMPLETE
+            return
 
-            next_text = font_medium.render("Press SPACE for next level", True, COLOR_WHITE)
-            next_rect = next_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 100))
-            self.screen.blit(next_text, next_rect)
+        # Falling off the map and touching enemies both cost health; tally the damage
+        # and check for game over once
+        fell = player.y > SCREEN_HEIGHT
+        if fell and player.health > 1:
+            # Reset to level start (before the enemy check, which uses the new position)
+            player.reset_position(level.player_start_x, level.player_start_y)
+        hits = level.enemies.count_collisions(player)
+        if fell or hits:
+            player.take_damage(fell + hits)
+            if hits:
+                sounds.append(SND_ENEMY_DEFEAT)
+            if player.health <= 0:
+                sounds.append(SND_GAME_OVER)
+                self.state = STATE_GAME_OVER
+
+    def _static_frame_key(self):
+        """
+        Describe the current frame if it only changes on input
 
-        elif self.state == STATE_GAME_OVER:
-            # Draw game over screen
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.set_alpha(200)
-            overlay.fill(COLOR_BLACK)
-            self.screen.blit(overlay, (0, 0))
+        Returns:
+            Hashable key that changes whenever the frame would, or None if the frame animates
+        """
+        if self.transition_manager.has_active_transitions():
+            return None
+        if self.state == STATE_MENU:
+            return (self.state, self.menu.selected_button)
+        if self.state in (STATE_PAUSED, STATE_LEVEL_COMPLETE, STATE_GAME_OVER):
+            return (self.state,)
+        return None
 
-            # Game over message
-            font_large = pygame.font.Font(None, 96)
-            font_medium = pygame.font.Font(None, 48)
+    def draw(self):
+        """Draw everything"""
+        # The block editor repaints and presents only the areas that changed
+        if self.state == STATE_BLOCK_EDITOR and not self.transition_manager.has_active_transitions():
+            if self.last_drawn_state != self.state:
+                self.block_editor.invalidate()
+            self.last_drawn_state = self.state
+            dirty_rects = self.block_editor.draw(self.screen)
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
+            return
 
-            gameover_text = font_large.render("GAME OVER", True, COLOR_RED)
-            gameover_rect = gameover_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 150))
-            self.screen.blit(gameover_text, gameover_rect)
+        # Screens that only change on input keep the previous frame until something changes
+        frame_key = self._static_frame_key()
+        if frame_key is not None and frame_key == self.last_frame_key and self.last_drawn_state == self.state:
+            return
+        self.last_frame_key = frame_key
+        self.last_drawn_state = self.state
 
-            score_text = font_medium.render(f"Final Score: {self.player.score}", True, COLOR_WHITE)
-            score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
-            self.screen.blit(score_text, score_rect)
+        # The level paints its own pre-rendered sky, so only the other screens need clearing
+        if self.state not in (STATE_PLAYING, STATE_PAUSED, STATE_LEVEL_COMPLETE):
+            self.screen.fill(COLOR_SKY_BLUE)
 
-            restart_text = font_medium.render("Press SPACE to retry or ENTER for menu", True, COLOR_CYAN)
-            restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 100))
-            self.screen.blit(restart_text, restart_rect)
+        handler = self._draw_handlers.get(self.state)
+        if handler:
+            handler()
 
         # Draw any active transitions (on top of everything)
         self.transition_manager.draw(self.screen)
 
         pygame.display.flip()
 
+    def _draw_menu(self):
+        """Draw the main menu"""
+        self.menu.draw(self.screen)
+
+    def _draw_editor(self):
+        """Draw the character designer"""
+        self.character_designer.draw(self.screen)
+
+    def _draw_block_editor(self):
+        """Draw the block editor (full repaint, used while a transition is active)"""
+        self.block_editor.draw(self.screen)
+
+    def _draw_playing(self):
+        """Draw gameplay"""
+        # Draw level
+        self.level.draw(self.screen)
+
+        # Draw player
+        self.screen.blit(self.player.image, self.player.rect)
+
+        # Draw HUD
+        self.hud.draw(self.screen, self.player, self.current_level_number, self.clock.get_fps())
+
+    def _draw_paused(self):
+        """Draw game behind pause menu"""
+        self.level.draw(self.screen)
+        self.screen.blit(self.player.image, self.player.rect)
+        self.pause_menu.draw(self.screen)
+
+    def _draw_backstory(self):
+        """Draw the backstory screen"""
+        self.backstory_screen.draw(self.screen)
+
+    def _draw_level_complete(self):
+        """Draw completion screen"""
+        self.level.draw(self.screen)
+        self.screen.blit(self.player.image, self.player.rect)
+
+        # Overlay and level complete message
+        self.screen.blits(self.level_complete_blits, doreturn=False)
+
+    def _draw_game_over(self):
+        """Draw game over screen"""
+        # The score is the only changing text; re-render it only when it changes
+        score = self.player.score
+        if self.final_score_text is None or self.final_score_text[0] != score:
+            score_text = self.font_48.render(f"Final Score: {score}", True, COLOR_WHITE)
+            score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
+            self.final_score_text = (score, score_text, score_rect)
+
+        # Overlay, game over message and score
+        self.screen.blits(self.game_over_blits, doreturn=False)
+        self.screen.blit(self.final_score_text[1], self.final_score_text[2])
+
     def end_game(self):
         """End the game"""
         self.state = STATE_MENU
@@ -354,6 +596,7 @@ class Game:
             self.draw()
             self.clock.tick(FPS)
 
+        self.sprite_manager.close()
         pygame.quit()
         sys.exit()
 
@@ -0,0 +1,41 @@
+"""
+JSON Codec - Encode and decode the game's JSON files (levels, designs, block programs)
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the stdlib codec is the fallback
+    orjson = None
+
+
+def dump_json(data: Any) -> bytes:
+    """
+    Encode data as indented JSON, with orjson when it is installed
+
+    Args:
+        data: JSON-serializable data
+
+    Returns:
+        UTF-8 encoded JSON, to be written in binary mode
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+def load_json(raw: bytes) -> Any:
+    """
+    Decode JSON bytes, with orjson when it is installed
+
+    Args:
+        raw: File contents read in binary mode
+
+    Returns:
+        The decoded data
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
@@ -0,0 +1,84 @@
+"""
+Kernels - Choose how each compute kernel runs
+A kernel runs from the ahead-of-time extension built by src/build_kernels.py if
+there is one. Otherwise Numba JIT-compiles it when installed, and failing that the
+NumPy version runs.
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    import numba
+except ImportError:  # Numba is optional
+    numba = None
+
+try:
+    from src import _aot_kernels
+except ImportError:  # Built by src/build_kernels.py; optional
+    _aot_kernels = None
+
+HAVE_NUMBA = numba is not None
+
+# Loop for parallel kernels; a plain range when they run uncompiled
+prange = numba.prange if HAVE_NUMBA else range
+
+# Every kernel selected so far, by exported name: (loop function, signature string).
+# src/build_kernels.py compiles these, so AOT and JIT builds share one signature.
+KERNELS: Dict[str, Tuple[Callable, str]] = {}
+
+
+def aot_kernel(name: str) -> Optional[Callable]:
+    """
+    Look up a kernel in the ahead-of-time extension
+
+    Args:
+        name: Exported kernel name
+
+    Returns:
+        The compiled kernel, or None if the extension or the kernel is missing
+    """
+    return getattr(_aot_kernels, name, None)
+
+
+def jit(loop_fn: Callable, signature: Optional[str] = None, **options) -> Callable:
+    """
+    JIT-compile a kernel with Numba, which must be installed
+
+    Given a signature, the kernel is compiled (or loaded from the on-disk
+    cache) at import instead of on its first call mid-game.
+
+    Args:
+        loop_fn: Plain-Python loop version of the kernel
+        signature: Numba signature string, or None to compile on first call
+        **options: Extra numba.njit options (fastmath, parallel)
+
+    Returns:
+        The compiled kernel
+    """
+    if signature is None:
+        return numba.njit(cache=True, **options)(loop_fn)
+    return numba.njit(signature, cache=True, **options)(loop_fn)
+
+
+def select_kernel(aot_name: str, loop_fn: Callable, numpy_fn: Optional[Callable], signature: str,
+                  **options) -> Callable:
+    """
+    Pick the fastest available build of a kernel and register it for AOT builds
+
+    Args:
+        aot_name: Name the kernel is exported under in the AOT extension
+        loop_fn: Plain-Python loop version, compiled by Numba
+        numpy_fn: NumPy version used when nothing is compiled
+        signature: Numba signature string shared by the JIT and AOT builds
+        **options: Extra numba.njit options (fastmath, parallel)
+
+    Returns:
+        The AOT kernel, else the JIT-compiled loop, else numpy_fn
+    """
+    KERNELS[aot_name] = (loop_fn, signature)
+    kernel = aot_kernel(aot_name)
+    if kernel is not None:
+        return kernel
+    if HAVE_NUMBA:
+        return jit(loop_fn, signature, **options)
+    return numpy_fn
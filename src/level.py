@@ -3,18 +3,172 @@ Level - Level management and loading
 """
 
 import pygame
-import json
 import os
+from typing import Dict, Tuple
 from config.settings import *
 from src.platform import PlatformGroup
 from src.enemy import EnemyGroup, Enemy
-from src.sprite_manager import SpriteManager
-from src.ai_engine import AIEngine, AIType
+from src.sprite_manager import SpriteManager, to_display_format
+from src.ai_engine import AIType
+from src.json_codec import load_json
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; without it baked levels are ignored
+    msgpack = None
+
+LEVELS_DIR = "assets/levels"
+
+
+# Built-in level definitions as plain data
+# Platforms: (x, y, width, height, movement_type or None, move_range, move_speed)
+# Enemies: (x, y, width, height, ai_type, AIType or None)
+# Goal: (x, y, width, height)
+
+LEVEL_0_PLATFORMS = (
+    # Ground
+    (0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40, None, 0, 0),
+    # Starting platform
+    (50, 600, 150, 20, None, 0, 0),
+    # Close jump platforms - easy difficulty
+    (220, 550, 100, 20, None, 0, 0),
+    (340, 480, 100, 20, None, 0, 0),
+    (460, 420, 100, 20, None, 0, 0),
+    (580, 360, 100, 20, None, 0, 0),
+    (700, 300, 100, 20, None, 0, 0),
+    (820, 350, 100, 20, None, 0, 0),
+    (940, 280, 100, 20, None, 0, 0),
+    # Goal platform
+    (1050, 220, 150, 20, None, 0, 0),
+)
+LEVEL_0_ENEMIES = (
+    # Simple enemy with rule-based AI
+    (350, 500, ENEMY_WIDTH, ENEMY_HEIGHT, "patrol", AIType.RULE_BASED),
+)
+LEVEL_0_GOAL = (1050, 170, 150, 50)
+
+LEVEL_1_PLATFORMS = (
+    # Ground
+    (0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40, None, 0, 0),
+    # Starting platform
+    (50, 600, 120, 20, None, 0, 0),
+    # Ascending platforms - closer spacing
+    (180, 550, 100, 20, None, 0, 0),
+    (310, 500, 100, 20, None, 0, 0),
+    (440, 450, 100, 20, None, 0, 0),
+    (570, 400, 100, 20, None, 0, 0),
+    (700, 350, 100, 20, None, 0, 0),
+    # Moving platform for challenge
+    (750, 300, 150, 20, "horizontal", 150, 2),
+    # Approach to final platform
+    (880, 280, 100, 20, None, 0, 0),
+    # Final platform
+    (1050, 200, 120, 20, None, 0, 0),
+)
+LEVEL_1_ENEMIES = (
+    # Enemies with different AI types
+    (300, 500, ENEMY_WIDTH, ENEMY_HEIGHT, "patrol", AIType.RULE_BASED),
+    (750, 280, ENEMY_WIDTH, ENEMY_HEIGHT, "chase", AIType.BEHAVIOR_TREE),
+)
+LEVEL_1_GOAL = (1050, 150, 120, 50)
+
+LEVEL_2_PLATFORMS = (
+    # Ground
+    (0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40, None, 0, 0),
+    # Section 1 - Starting area
+    (50, 600, 100, 20, None, 0, 0),
+    (160, 550, 100, 20, None, 0, 0),
+    (270, 500, 100, 20, None, 0, 0),
+    # Section 2 - Moving platforms challenge
+    (380, 420, 100, 20, "vertical", 120, 1.5),
+    (490, 380, 100, 20, "vertical", 100, 1.8),
+    (600, 340, 100, 20, "horizontal", 150, 2),
+    # Section 3 - Final stretch
+    (710, 300, 100, 20, None, 0, 0),
+    (820, 340, 100, 20, None, 0, 0),
+    (930, 280, 100, 20, None, 0, 0),
+    (1050, 200, 120, 20, None, 0, 0),
+)
+LEVEL_2_ENEMIES = (
+    # Enemies - spread throughout
+    (200, 530, ENEMY_WIDTH, ENEMY_HEIGHT, "patrol", AIType.RULE_BASED),
+    (500, 350, ENEMY_WIDTH, ENEMY_HEIGHT, "chase", AIType.BEHAVIOR_TREE),
+    (850, 300, ENEMY_WIDTH, ENEMY_HEIGHT, "patrol", AIType.MACHINE_LEARNING),
+)
+LEVEL_2_GOAL = (1050, 150, 120, 50)
+
+BUILT_IN_LEVELS = {
+    0: (LEVEL_0_PLATFORMS, LEVEL_0_ENEMIES, LEVEL_0_GOAL),
+    1: (LEVEL_1_PLATFORMS, LEVEL_1_ENEMIES, LEVEL_1_GOAL),
+    2: (LEVEL_2_PLATFORMS, LEVEL_2_ENEMIES, LEVEL_2_GOAL),
+}
+
+
+# Parsed JSON levels by path: (st_mtime_ns, (platforms, enemies, goal, player_start))
+_LEVEL_TEMPLATE_CACHE: Dict[str, Tuple[int, tuple]] = {}
+
+
+def _load_level_template(filename: str) -> tuple:
+    """
+    Read a level file into the same rows as the built-in tables, once per file version
+
+    Args:
+        filename: Path to a JSON level, or a MessagePack one baked by src/bake_levels.py (.mpk)
+
+    Returns:
+        (platforms, enemies, goal, player_start) where player_start is (x, y)
+    """
+    mtime = os.stat(filename).st_mtime_ns
+    cached = _LEVEL_TEMPLATE_CACHE.get(filename)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(filename, 'rb') as f:
+        raw = f.read()
+    data = msgpack.unpackb(raw, raw=False) if filename.endswith('.mpk') else load_json(raw)
+
+    platforms = tuple(
+        (platform_data['x'], platform_data['y'], platform_data['width'], platform_data['height'],
+         platform_data.get('movement_type', 'horizontal') if platform_data.get('is_moving') else None,
+         platform_data.get('move_range', 100), platform_data.get('move_speed', 2))
+        for platform_data in data.get('platforms', [])
+    )
+    enemies = tuple(
+        (enemy_data['x'], enemy_data['y'],
+         enemy_data.get('width', ENEMY_WIDTH), enemy_data.get('height', ENEMY_HEIGHT),
+         enemy_data.get('ai_type', 'patrol'), None)
+        for enemy_data in data.get('enemies', [])
+    )
+    goal_data = data.get('goal', {})
+    goal = (goal_data['x'], goal_data['y'], goal_data['width'], goal_data['height'])
+    player_data = data.get('player_start', {})
+    player_start = (player_data.get('x', PLAYER_START_X), player_data.get('y', PLAYER_START_Y))
+
+    template = (platforms, enemies, goal, player_start)
+    _LEVEL_TEMPLATE_CACHE[filename] = (mtime, template)
+    return template
 
 
 class Level:
     """Represents a single game level"""
 
+    # Fixed attribute layout for the per-frame level lookups
+    __slots__ = (
+        'level_number',
+        'sprite_manager',
+        'platforms',
+        'enemies',
+        'collectibles',
+        'goal',
+        'goal_image',
+        'player_start_x',
+        'player_start_y',
+        'level_complete',
+        '_enemy_rows',
+        '_background',
+        '_background_key',
+    )
+
     def __init__(self, level_number: int, sprite_manager: SpriteManager):
         """
         Initialize level
@@ -29,18 +183,26 @@ class Level:
         self.enemies = EnemyGroup()
         self.collectibles = pygame.sprite.Group()
         self.goal = None
+        self.goal_image = None  # Pre-rendered goal marker, sized to the goal
         self.player_start_x = PLAYER_START_X
         self.player_start_y = PLAYER_START_Y
         self.level_complete = False
+        self._enemy_rows = ()  # Enemy table rows, to rebuild the enemies on reset
+        self._background = None  # Sky with the static platforms, see _get_background()
+        self._background_key = None
 
         # Load level data
         self.load_level()
 
     def load_level(self):
         """Load level from data"""
-        # Try to load from JSON file first
-        level_file = f"assets/levels/level_{self.level_number}.json"
-        if os.path.exists(level_file):
+        # Try to load from file first, preferring a baked copy that is up to date
+        level_file = os.path.join(LEVELS_DIR, f"level_{self.level_number}.json")
+        baked_file = os.path.join(LEVELS_DIR, f"level_{self.level_number}.mpk")
+        if msgpack is not None and os.path.exists(baked_file) and (
+                not os.path.exists(level_file) or os.stat(baked_file).st_mtime_ns >= os.stat(level_file).st_mtime_ns):
+            self.load_from_json(baked_file)
+        elif os.path.exists(level_file):
             self.load_from_json(level_file)
         else:
             # Use built-in level definitions
@@ -51,45 +213,14 @@ class Level:
         Load level from JSON file
 
         Args:
-            filename: Path to JSON file
+            filename: Path to JSON file (or its baked .mpk copy)
         """
         try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
-
-            # Load platforms
-            for platform_data in data.get('platforms', []):
-                platform = self.platforms.create_platform(
-                    platform_data['x'], platform_data['y'],
-                    platform_data['width'], platform_data['height'],
-                    self.sprite_manager,
-                    platform_data.get('is_moving', False)
-                )
-                if platform_data.get('is_moving'):
-                    platform.set_movement(
-                        platform_data.get('movement_type', 'horizontal'),
-                        platform_data.get('move_range', 100),
-                        platform_data.get('move_speed', 2)
-                    )
-
-            # Load enemies
-            for enemy_data in data.get('enemies', []):
-                self.enemies.create_enemy(
-                    enemy_data['x'], enemy_data['y'],
-                    enemy_data.get('width', ENEMY_WIDTH),
-                    enemy_data.get('height', ENEMY_HEIGHT),
-                    self.sprite_manager,
-                    enemy_data.get('ai_type', 'patrol')
-                )
-
-            # Load goal
-            goal_data = data.get('goal', {})
-            self.goal = pygame.Rect(goal_data['x'], goal_data['y'], goal_data['width'], goal_data['height'])
+            platforms, enemies, goal, player_start = _load_level_template(filename)
+            self._build_from_tables(platforms, enemies, goal)
 
             # Load player start position
-            player_data = data.get('player_start', {})
-            self.player_start_x = player_data.get('x', PLAYER_START_X)
-            self.player_start_y = player_data.get('y', PLAYER_START_Y)
+            self.player_start_x, self.player_start_y = player_start
 
         except Exception as e:
             print(f"Error loading level from JSON: {e}. Using built-in level.")
@@ -97,119 +228,57 @@ class Level:
 
     def load_built_in_level(self):
         """Load built-in level definition"""
-        if self.level_number == 0:
-            self.load_level_0()
-        elif self.level_number == 1:
-            self.load_level_1()
-        elif self.level_number == 2:
-            self.load_level_2()
-        else:
-            self.load_level_0()  # Default fallback
-
-    def load_level_0(self):
-        """Load level 0 - Introduction level"""
-        # Ground
-        self.platforms.create_platform(0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40, self.sprite_manager)
-
-        # Starting platform
-        self.platforms.create_platform(50, 600, 150, 20, self.sprite_manager)
-
-        # Close jump platforms - easy difficulty
-        self.platforms.create_platform(220, 550, 100, 20, self.sprite_manager)
-        self.platforms.create_platform(340, 480, 100, 20, self.sprite_manager)
-        self.platforms.create_platform(460, 420, 100, 20, self.sprite_manager)
-        self.platforms.create_platform(580, 360, 100, 20, self.sprite_manager)
-        self.platforms.create_platform(700, 300, 100, 20, self.sprite_manager)
-        self.platforms.create_platform(820, 350, 100, 20, self.sprite_manager)
-        self.platforms.create_platform(940, 280, 100, 20, self.sprite_manager)
-
-        # Goal platform
-        self.platforms.create_platform(1050, 220, 150, 20, self.sprite_manager)
-
-        # Simple enemy with rule-based AI
-        enemy = self.enemies.create_enemy(350, 500, ENEMY_WIDTH, ENEMY_HEIGHT, self.sprite_manager, "patrol")
-        enemy.ai_engine = AIEngine(enemy, AIType.RULE_BASED)
-
-        # Goal
-        self.goal = pygame.Rect(1050, 170, 150, 50)
-
-    def load_level_1(self):
-        """Load level 1 - Platform jumping"""
-        # Ground
-        self.platforms.create_platform(0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40, self.sprite_manager)
-
-        # Starting platform
-        self.platforms.create_platform(50, 600, 120, 20, self.sprite_manager)
-
-        # Ascending platforms - closer spacing
-        platforms_data = [
-            (180, 550),
-            (310, 500),
-            (440, 450),
-            (570, 400),
-            (700, 350),
-        ]
-        for x, y in platforms_data:
-            self.platforms.create_platform(x, y, 100, 20, self.sprite_manager)
-
-        # Moving platform for challenge
-        moving_plat = self.platforms.create_platform(750, 300, 150, 20, self.sprite_manager, True)
-        moving_plat.set_movement("horizontal", 150, 2)
-
-        # Approach to final platform
-        self.platforms.create_platform(880, 280, 100, 20, self.sprite_manager)
-
-        # Final platform
-        self.platforms.create_platform(1050, 200, 120, 20, self.sprite_manager)
-
-        # Enemies with different AI types
-        patrol_enemy = self.enemies.create_enemy(300, 500, ENEMY_WIDTH, ENEMY_HEIGHT, self.sprite_manager, "patrol")
-        patrol_enemy.ai_engine = AIEngine(patrol_enemy, AIType.RULE_BASED)
-
-        chase_enemy = self.enemies.create_enemy(750, 280, ENEMY_WIDTH, ENEMY_HEIGHT, self.sprite_manager, "chase")
-        chase_enemy.ai_engine = AIEngine(chase_enemy, AIType.BEHAVIOR_TREE)
-
-        # Goal
-        self.goal = pygame.Rect(1050, 150, 120, 50)
-
-    def load_level_2(self):
-        """Load level 2 - Advanced challenge"""
-        # Ground
-        self.platforms.create_platform(0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40, self.sprite_manager)
-
-        # Section 1 - Starting area
-        self.platforms.create_platform(50, 600, 100, 20, self.sprite_manager)
-        self.platforms.create_platform(160, 550, 100, 20, self.sprite_manager)
-        self.platforms.create_platform(270, 500, 100, 20, self.sprite_manager)
+        # Unknown level numbers fall back to level 0
+        platforms, enemies, goal = BUILT_IN_LEVELS.get(self.level_number, BUILT_IN_LEVELS[0])
+        self._build_from_tables(platforms, enemies, goal)
 
-        # Section 2 - Moving platforms challenge
-        moving1 = self.platforms.create_platform(380, 420, 100, 20, self.sprite_manager, True)
-        moving1.set_movement("vertical", 120, 1.5)
+    def _build_from_tables(self, platforms: tuple, enemies: tuple, goal: tuple):
+        """
+        Create the level's objects from table rows
 
-        moving2 = self.platforms.create_platform(490, 380, 100, 20, self.sprite_manager, True)
-        moving2.set_movement("vertical", 100, 1.8)
+        Args:
+            platforms: (x, y, width, height, movement_type, move_range, move_speed) rows;
+                movement_type is None for static platforms
+            enemies: (x, y, width, height, ai_type, engine_type) rows; engine_type is an
+                AIType, or None for the legacy AI only
+            goal: (x, y, width, height) of the goal area
+        """
+        sprite_manager = self.sprite_manager
+        for x, y, width, height, movement_type, move_range, move_speed in platforms:
+            platform = self.platforms.create_platform(x, y, width, height, sprite_manager, movement_type is not None)
+            if movement_type is not None:
+                platform.set_movement(movement_type, move_range, move_speed)
 
-        moving3 = self.platforms.create_platform(600, 340, 100, 20, self.sprite_manager, True)
-        moving3.set_movement("horizontal", 150, 2)
+        self._enemy_rows = enemies
+        self._build_enemies()
 
-        # Section 3 - Final stretch
-        self.platforms.create_platform(710, 300, 100, 20, self.sprite_manager)
-        self.platforms.create_platform(820, 340, 100, 20, self.sprite_manager)
-        self.platforms.create_platform(930, 280, 100, 20, self.sprite_manager)
-        self.platforms.create_platform(1050, 200, 120, 20, self.sprite_manager)
+        self.goal = pygame.Rect(*goal)
+        self.goal_image = self._build_goal_image(self.goal.size)
 
-        # Enemies - spread throughout
-        enemy1 = self.enemies.create_enemy(200, 530, ENEMY_WIDTH, ENEMY_HEIGHT, self.sprite_manager, "patrol")
-        enemy1.ai_engine = AIEngine(enemy1, AIType.RULE_BASED)
+    @staticmethod
+    def _build_goal_image(size) -> pygame.Surface:
+        """
+        Render the goal marker: a border with a filled inner rectangle
 
-        enemy2 = self.enemies.create_enemy(500, 350, ENEMY_WIDTH, ENEMY_HEIGHT, self.sprite_manager, "chase")
-        enemy2.ai_engine = AIEngine(enemy2, AIType.BEHAVIOR_TREE)
+        Args:
+            size: (width, height) of the goal
 
-        enemy3 = self.enemies.create_enemy(850, 300, ENEMY_WIDTH, ENEMY_HEIGHT, self.sprite_manager, "patrol")
-        enemy3.ai_engine = AIEngine(enemy3, AIType.MACHINE_LEARNING)
-
-        # Goal
-        self.goal = pygame.Rect(1050, 150, 120, 50)
+        Returns:
+            Goal surface with a transparent gap between border and fill
+        """
+        image = pygame.Surface(size, pygame.SRCALPHA)
+        rect = image.get_rect()
+        pygame.draw.rect(image, COLOR_YELLOW, rect, 3)
+        pygame.draw.rect(image, COLOR_YELLOW, rect.inflate(-20, -20))
+        return to_display_format(image)
+
+    def _build_enemies(self):
+        """Create the level's enemies from its enemy table rows"""
+        sprite_manager = self.sprite_manager
+        for x, y, width, height, ai_type, engine_type in self._enemy_rows:
+            enemy = self.enemies.create_enemy(x, y, width, height, sprite_manager, ai_type)
+            # The AIEngine is built on the enemy's first update
+            enemy.pending_ai_type = engine_type
 
     def update(self, player):
         """
@@ -219,11 +288,11 @@ class Level:
             player: Player object
         """
         # Update platforms
-        for platform in self.platforms:
-            platform.update()
+        self.platforms.update_all()
 
-        # Check goal collision
-        if self.goal and player.rect.colliderect(self.goal):
+        # Check goal collision (nothing left to check once the level is complete)
+        goal = self.goal
+        if not self.level_complete and goal is not None and player.rect.colliderect(goal):
             self.level_complete = True
 
         # Update enemies
@@ -236,24 +305,52 @@ class Level:
         Args:
             surface: Pygame surface to draw on
         """
-        # Draw platforms
-        for platform in self.platforms:
-            surface.blit(platform.image, platform.rect)
+        # Sky and static platforms in one blit, then the moving platforms on top
+        surface.blit(self._get_background(surface), (0, 0))
+        self.platforms.draw_moving(surface)
 
         # Draw goal
         if self.goal:
-            pygame.draw.rect(surface, COLOR_YELLOW, self.goal, 3)
-            pygame.draw.rect(surface, COLOR_YELLOW, (self.goal.x + 10, self.goal.y + 10, self.goal.width - 20, self.goal.height - 20))
+            surface.blit(self.goal_image, self.goal)
 
         # Draw enemies
-        for enemy in self.enemies:
-            if enemy.is_alive:
-                surface.blit(enemy.image, enemy.rect)
+        self.enemies.draw_alive(surface)
 
     def is_complete(self):
         """Check if level is complete"""
         return self.level_complete
 
+    def _get_background(self, surface: pygame.Surface) -> pygame.Surface:
+        """
+        Get the sky with the static platforms pre-rendered on it, rebuilt when the platforms change
+
+        Args:
+            surface: Surface the level is drawn on
+
+        Returns:
+            Opaque surface the size of the target
+        """
+        key = (self.platforms.layout_version, surface.get_size())
+        if self._background is None or self._background_key != key:
+            background = pygame.Surface(surface.get_size())
+            background.fill(COLOR_SKY_BLUE)
+            background.blits([(p.image, p.rect) for p in self.platforms.static_platforms()], doreturn=False)
+            self._background = to_display_format(background)
+            self._background_key = key
+        return self._background
+
+    def invalidate_background(self):
+        """Render the static background again on the next draw (e.g. after the display mode changed)"""
+        self._background = None
+
     def reset(self):
-        """Reset level state"""
+        """Reset level state so the level can be replayed without rebuilding it"""
         self.level_complete = False
+
+        # Platforms (and their sprites) are reused; only moving ones have drifted
+        for platform in self.platforms:
+            platform.reset()
+
+        # Enemies carry AI state (engines, chase targets), so they are built again
+        self.enemies.empty()
+        self._build_enemies()
@@ -0,0 +1,137 @@
+"""
+Neural Network Kernels - Forward and backward passes of the enemies' SimpleNeuralNet
+"""
+
+import math
+import numpy as np
+
+from src.kernels import select_kernel
+
+_MATRIX = "f4[:, ::1]"
+NN_FORWARD_SIGNATURE = f"void({', '.join([_MATRIX] * 7)})"
+NN_BACKWARD_SIGNATURE = f"void({', '.join([_MATRIX] * 7)}, f8)"
+
+
+def _forward_numpy(x, w1, b1, w2, b2, a1, a2):
+    """
+    Forward pass writing into caller-provided buffers
+
+    Bias add and activation run in place over each layer's buffer, so no
+    separate pre-activation arrays are materialized. All arrays are
+    contiguous 2-D float32.
+
+    Args:
+        x: Input rows
+        w1, b1, w2, b2: Layer weights and biases
+        a1: Hidden activations, filled in place
+        a2: Output activations, filled in place
+    """
+    np.dot(x, w1, out=a1)
+    a1 += b1
+    np.tanh(a1, out=a1)  # Tanh activation
+    np.dot(a1, w2, out=a2)
+    a2 += b2
+    # Sigmoid activation
+    np.negative(a2, out=a2)
+    np.exp(a2, out=a2)
+    a2 += 1
+    np.reciprocal(a2, out=a2)
+
+
+def _forward_loop(x, w1, b1, w2, b2, a1, a2):
+    """Single-pass version of _forward_numpy, compiled by Numba"""
+    for r in range(x.shape[0]):
+        for j in range(w1.shape[1]):
+            total = b1[0, j]
+            for k in range(x.shape[1]):
+                total += x[r, k] * w1[k, j]
+            a1[r, j] = math.tanh(total)
+        for j in range(w2.shape[1]):
+            total = b2[0, j]
+            for k in range(w2.shape[0]):
+                total += a1[r, k] * w2[k, j]
+            a2[r, j] = 1.0 / (1.0 + math.exp(-total))
+
+
+def _backward_numpy(x, a1, output, w1, b1, w2, b2, learning_rate):
+    """
+    Simple backpropagation, updating the weight arrays in place
+
+    Args:
+        x: Input rows of the forward pass
+        a1: Hidden activations of the forward pass
+        output: Output activations of the forward pass
+        w1, b1, w2, b2: Layer weights and biases, updated in place
+        learning_rate: Step size
+    """
+    m = x.shape[0]
+
+    # Output layer error: output * (1 - output)
+    dz2 = 1 - output
+    dz2 *= output
+    dw2 = np.dot(a1.T, dz2) / m
+    db2 = np.sum(dz2, axis=0, keepdims=True) / m
+
+    # Hidden layer error: da1 * (1 - a1^2), reusing the da1 buffer
+    dz1 = np.dot(dz2, w2.T)
+    tanh_grad = a1 * a1
+    np.subtract(1, tanh_grad, out=tanh_grad)
+    dz1 *= tanh_grad
+    dw1 = np.dot(x.T, dz1) / m
+    db1 = np.sum(dz1, axis=0, keepdims=True) / m
+
+    # Update weights
+    w1 -= learning_rate * dw1
+    b1 -= learning_rate * db1
+    w2 -= learning_rate * dw2
+    b2 -= learning_rate * db2
+
+
+def _backward_loop(x, a1, output, w1, b1, w2, b2, learning_rate):
+    """Loop version of _backward_numpy, compiled by Numba"""
+    m = x.shape[0]
+    hidden = w1.shape[1]
+    outputs = w2.shape[1]
+    step = learning_rate / m
+
+    # Both layer errors come from the weights before this update
+    dz2 = np.empty((m, outputs), dtype=np.float32)
+    dz1 = np.empty((m, hidden), dtype=np.float32)
+    for r in range(m):
+        for o in range(outputs):
+            dz2[r, o] = (1 - output[r, o]) * output[r, o]
+        for j in range(hidden):
+            total = 0.0
+            for o in range(outputs):
+                total += dz2[r, o] * w2[j, o]
+            dz1[r, j] = total * (1 - a1[r, j] * a1[r, j])
+
+    # Update weights
+    for j in range(hidden):
+        for o in range(outputs):
+            total = 0.0
+            for r in range(m):
+                total += a1[r, j] * dz2[r, o]
+            w2[j, o] -= step * total
+    for o in range(outputs):
+        total = 0.0
+        for r in range(m):
+            total += dz2[r, o]
+        b2[0, o] -= step * total
+    for k in range(x.shape[1]):
+        for j in range(hidden):
+            total = 0.0
+            for r in range(m):
+                total += x[r, k] * dz1[r, j]
+            w1[k, j] -= step * total
+    for j in range(hidden):
+        total = 0.0
+        for r in range(m):
+            total += dz1[r, j]
+        b1[0, j] -= step * total
+
+
+# A (1, 6) forward pass is a handful of multiply-adds; the compiled loop does it in one
+# call where NumPy dispatches nine ufuncs
+nn_forward = select_kernel('nn_forward', _forward_loop, _forward_numpy, NN_FORWARD_SIGNATURE)
+nn_backward = select_kernel('nn_backward', _backward_loop, _backward_numpy, NN_BACKWARD_SIGNATURE)
@@ -3,13 +3,21 @@ Platform - Platform class for level design
 """
 
 import pygame
+import numpy as np
+from typing import Dict, List, Tuple
 from config.settings import *
-from src.sprite_manager import SpriteManager
+from src.sprite_manager import SpriteManager, to_display_format
+from bisect import bisect_right
+from src.collision_kernels import COMPILED, first_overlap_in
+from src.platform_kernels import step_platforms
 
 
 class Platform(pygame.sprite.Sprite):
     """Static or moving platform"""
 
+    # Rendered sprites shared by all platforms, keyed by (width, height, uses sprite manager)
+    _image_cache: Dict[Tuple[int, int, bool], pygame.Surface] = {}
+
     def __init__(self, x: float, y: float, width: int, height: int, sprite_manager: SpriteManager = None, is_moving: bool = False, move_range: int = 0, move_speed: float = 2):
         """
         Initialize platform
@@ -35,36 +43,70 @@ class Platform(pygame.sprite.Sprite):
         self.move_range = move_range
         self.move_speed = move_speed
         self.move_direction = 1  # 1 for right/down, -1 for left/up
+        self._step = move_speed  # Signed move per frame, move_speed * move_direction
         self.movement_type = "horizontal"  # or "vertical"
 
-        # Create platform sprite
-        if sprite_manager:
-            self.image = sprite_manager.create_placeholder_sprite(width, height, (100, 200, 100))
-        else:
-            self.image = pygame.Surface((width, height))
-            pygame.draw.rect(self.image, (100, 200, 100), (0, 0, width, height))
-            pygame.draw.rect(self.image, (50, 150, 50), (0, 0, width, height), 2)
+        # Share one platform sprite per size and style; the image is never modified
+        key = (width, height, sprite_manager is not None)
+        self.image = Platform._image_cache.get(key)
+        if self.image is None:
+            self.image = Platform._image_cache[key] = self._build_image(width, height, sprite_manager)
 
         self.rect = self.image.get_rect(topleft=(x, y))
 
+    @staticmethod
+    def _build_image(width: int, height: int, sprite_manager: SpriteManager = None) -> pygame.Surface:
+        """
+        Render the platform sprite
+
+        Args:
+            width: Width
+            height: Height
+            sprite_manager: SpriteManager instance
+
+        Returns:
+            Platform sprite surface
+        """
+        if sprite_manager:
+            return sprite_manager.create_placeholder_sprite(width, height, (100, 200, 100))
+        image = pygame.Surface((width, height))
+        pygame.draw.rect(image, (100, 200, 100), (0, 0, width, height))
+        pygame.draw.rect(image, (50, 150, 50), (0, 0, width, height), 2)
+        return to_display_format(image)
+
     def update(self):
         """Update platform position if moving"""
         if self.is_moving:
             if self.movement_type == "horizontal":
-                self.x += self.move_speed * self.move_direction
+                self.x += self._step
                 # Check bounds
                 if abs(self.x - self.start_x) > self.move_range:
-                    self.move_direction *= -1
+                    self._step = -self._step
+                    self.move_direction = -self.move_direction
                     self.x = self.start_x + self.move_range * self.move_direction
             elif self.movement_type == "vertical":
-                self.y += self.move_speed * self.move_direction
+                self.y += self._step
                 # Check bounds
                 if abs(self.y - self.start_y) > self.move_range:
-                    self.move_direction *= -1
+                    self._step = -self._step
+                    self.move_direction = -self.move_direction
                     self.y = self.start_y + self.move_range * self.move_direction
 
             self.rect.topleft = (self.x, self.y)
 
+    def reset(self):
+        """Move the platform back to its start, as when the level was built"""
+        self.x = self.start_x
+        self.y = self.start_y
+        self.move_direction = 1
+        self._step = self.move_speed
+        self.rect.topleft = (self.x, self.y)
+
+        # Groups keep their own copy of moving platform state for the batched update
+        for group in self.groups():
+            if isinstance(group, PlatformGroup):
+                group.invalidate_motion()
+
     def get_position(self):
         """Get platform position"""
         return (self.x, self.y)
@@ -81,16 +123,206 @@ class Platform(pygame.sprite.Sprite):
         self.movement_type = movement_type
         self.move_range = move_range
         self.move_speed = move_speed
+        self._step = move_speed * self.move_direction
         self.is_moving = True
 
+        # Groups track which platforms move to keep their collision bounds current
+        for group in self.groups():
+            if isinstance(group, PlatformGroup):
+                group.invalidate_bounds()
+
 
 class PlatformGroup(pygame.sprite.Group):
     """Group of platforms for easy management"""
 
+    # Spatial hash cell size for static platforms, in pixels
+    CELL_SIZE = 128
+
+    # Below this many moving platforms the per-sprite update is cheaper than the array step
+    VECTOR_MIN_MOVING = 8
+
     def __init__(self):
         """Initialize platform group"""
+        self._platform_list = []  # Platforms in insertion (collision) order
+        self._bounds = None  # int64 rows: lefts, tops, rights, bottoms
+        self._moving = []  # (index, platform) of moving platforms, refreshed every check
+        self._static_hash: Dict[Tuple[int, int], List[int]] = {}  # Cell -> static platform indices
+        self._window_candidates: Dict[Tuple[int, int, int, int], np.ndarray] = {}
+        self._window_rects: Dict[Tuple[int, int, int, int], Tuple[List[int], List[pygame.Rect]]] = {}
+        self._movers = None  # Platforms that move, see _get_movers()
+        self._motion = None  # Their state as arrays, see _get_motion()
+        self.layout_version = 0  # Bumped whenever platforms are added, removed or start moving
         super().__init__()
 
+    def add_internal(self, sprite, layer=None):
+        """Rebuild the collision bounds after platforms are added"""
+        super().add_internal(sprite, layer)
+        self.invalidate_bounds()
+
+    def remove_internal(self, sprite):
+        """Rebuild the collision bounds after platforms are removed"""
+        super().remove_internal(sprite)
+        self.invalidate_bounds()
+
+    def invalidate_bounds(self):
+        """Rebuild the collision bounds on the next check (e.g. a platform started moving)"""
+        self._bounds = None
+        self.layout_version += 1
+        self.invalidate_motion()
+
+    def invalidate_motion(self):
+        """Gather the moving platform state again before the next update (e.g. after a reset)"""
+        self._movers = None
+        self._motion = None
+
+    def _get_movers(self) -> List[Platform]:
+        """Get the platforms that actually move, in group order"""
+        if self._movers is None:
+            self._movers = [p for p in self.sprites()
+                            if p.is_moving and p.movement_type in ("horizontal", "vertical")]
+        return self._movers
+
+    def _get_motion(self):
+        """
+        Get the state of the moving platforms as arrays
+
+        The arrays are the authoritative state between invalidations and are
+        written back to the sprites after every update.
+
+        Returns:
+            (horizontal flags, position along the axis, start, signed step, range, direction)
+        """
+        if self._motion is None:
+            platforms = self._get_movers()
+            horizontal = [p.movement_type == "horizontal" for p in platforms]
+            self._motion = (
+                horizontal,
+                np.array([p.x if h else p.y for p, h in zip(platforms, horizontal)], dtype=np.float64),
+                np.array([p.start_x if h else p.start_y for p, h in zip(platforms, horizontal)], dtype=np.float64),
+                np.array([p._step for p in platforms], dtype=np.float64),
+                np.array([p.move_range for p in platforms], dtype=np.float64),
+                np.array([p.move_direction for p in platforms], dtype=np.int64),
+            )
+        return self._motion
+
+    def static_platforms(self) -> List[Platform]:
+        """Get the platforms that never move, in group order"""
+        movers = set(self._get_movers())
+        return [p for p in self.sprites() if p not in movers]
+
+    def draw_moving(self, surface: pygame.Surface):
+        """
+        Draw only the moving platforms, in one batched blit call
+
+        Args:
+            surface: Pygame surface to draw on
+        """
+        surface.blits([(p.image, p.rect) for p in self._get_movers()], doreturn=False)
+
+    def update_all(self):
+        """Move all moving platforms one step, as Platform.update does for each"""
+        platforms = self._get_movers()
+        if len(platforms) < self.VECTOR_MIN_MOVING:
+            for platform in platforms:
+                platform.update()
+            return
+
+        horizontal, position, start, step, move_range, direction = self._get_motion()
+
+        # Step along the axis and reverse at the range limits
+        step_platforms(position, start, step, move_range, direction)
+
+        # Write the new state back to the sprites for collisions and drawing
+        for platform, is_horizontal, value, move_step, move_direction in zip(
+                platforms, horizontal, position.tolist(), step.tolist(), direction.tolist()):
+            if is_horizontal:
+                platform.x = value
+            else:
+                platform.y = value
+            platform._step = move_step
+            platform.move_direction = move_direction
+            platform.rect.topleft = (platform.x, platform.y)
+
+    def _get_bounds(self) -> np.ndarray:
+        """
+        Get the platform bounds as structure-of-arrays, current for this frame
+
+        Returns:
+            4 x N int64 array of lefts, tops, rights, bottoms
+        """
+        if self._bounds is None:
+            self._platform_list = self.sprites()
+            self._bounds = np.array([(p.rect.left, p.rect.top, p.rect.right, p.rect.bottom)
+                                     for p in self._platform_list], dtype=np.int64).reshape(-1, 4).T.copy()
+            self._moving = [(i, p) for i, p in enumerate(self._platform_list) if p.is_moving]
+            self._build_static_hash()
+        else:
+            bounds = self._bounds
+            for i, platform in self._moving:
+                rect = platform.rect
+                bounds[0, i] = rect.left
+                bounds[1, i] = rect.top
+                bounds[2, i] = rect.right
+                bounds[3, i] = rect.bottom
+        return self._bounds
+
+    def _build_static_hash(self):
+        """Bucket every static platform into the cells its rect covers"""
+        size = self.CELL_SIZE
+        self._static_hash = {}
+        self._window_candidates = {}
+        self._window_rects = {}
+        for i, platform in enumerate(self._platform_list):
+            rect = platform.rect
+            if platform.is_moving or rect.width <= 0 or rect.height <= 0:
+                continue
+            for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+                for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                    self._static_hash.setdefault((cx, cy), []).append(i)
+
+    def _cell_window(self, rect: pygame.Rect) -> Tuple[int, int, int, int]:
+        """Range of cells (first x, first y, last x, last y) covered by a rect"""
+        size = self.CELL_SIZE
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def _candidates(self, window: Tuple[int, int, int, int]) -> np.ndarray:
+        """
+        Get the platforms that can overlap a rect in a cell window
+
+        Args:
+            window: Cell window from _cell_window()
+
+        Returns:
+            Ascending int64 indices of the static platforms in the window plus all moving platforms
+        """
+        candidates = self._window_candidates.get(window)
+        if candidates is None:
+            indices = {i for i, _ in self._moving}
+            static_hash = self._static_hash
+            for cx in range(window[0], window[2] + 1):
+                for cy in range(window[1], window[3] + 1):
+                    indices.update(static_hash.get((cx, cy), ()))
+            candidates = self._window_candidates[window] = np.array(sorted(indices), dtype=np.int64)
+        return candidates
+
+    def _candidate_rects(self, window: Tuple[int, int, int, int]) -> Tuple[List[int], List[pygame.Rect]]:
+        """
+        Get the platforms that can overlap a rect in a cell window, with their live rects
+
+        Args:
+            window: Cell window from _cell_window()
+
+        Returns:
+            Ascending platform indices and the platforms' own Rect objects, in the same order
+        """
+        entry = self._window_rects.get(window)
+        if entry is None:
+            indices = self._candidates(window).tolist()
+            platforms = self._platform_list
+            entry = self._window_rects[window] = (indices, [platforms[i].rect for i in indices])
+        return entry
+
     def create_platform(self, x: float, y: float, width: int, height: int, sprite_manager: SpriteManager = None, is_moving: bool = False):
         """
         Create and add a platform
@@ -117,5 +349,55 @@ class PlatformGroup(pygame.sprite.Group):
         Args:
             player: Player object
         """
-        for platform in self:
-            player.check_collision_with_platform(platform)
+        lefts, tops, rights, bottoms = self._get_bounds()
+        platforms = self._platform_list
+        if not COMPILED:
+            self._check_collisions_rects(player)
+            return
+
+        # Only platforms sharing a cell with the player can overlap it, and only overlapping
+        # ones need resolving. Resolving one moves the player, so search on from the next
+        # platform with the player's updated rect (and its cells, if it left them).
+        rect = player.rect
+        window = self._cell_window(rect)
+        candidates = self._candidates(window)
+        k = first_overlap_in(rect.left, rect.top, rect.right, rect.bottom,
+                             lefts, tops, rights, bottoms, candidates, 0)
+        while k >= 0:
+            i = int(candidates[k])
+            player.check_collision_with_platform(platforms[i])
+            rect = player.rect
+            start = k + 1
+            new_window = self._cell_window(rect)
+            if new_window != window:
+                window = new_window
+                candidates = self._candidates(window)
+                start = int(np.searchsorted(candidates, i + 1))
+            k = first_overlap_in(rect.left, rect.top, rect.right, rect.bottom,
+                                 lefts, tops, rights, bottoms, candidates, start)
+
+    def _check_collisions_rects(self, player):
+        """
+        check_collisions without the compiled kernel, testing rects with Rect.collidelist
+
+        Args:
+            player: Player object
+        """
+        platforms = self._platform_list
+        rect = player.rect
+        window = self._cell_window(rect)
+        indices, rects = self._candidate_rects(window)
+        k = rect.collidelist(rects)
+        while k >= 0:
+            i = indices[k]
+            player.check_collision_with_platform(platforms[i])
+            rect = player.rect
+            start = k + 1
+            new_window = self._cell_window(rect)
+            if new_window != window:
+                window = new_window
+                indices, rects = self._candidate_rects(window)
+                start = bisect_right(indices, i)
+            k = rect.collidelist(rects[start:])
+            if k >= 0:
+                k += start
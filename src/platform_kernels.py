@@ -0,0 +1,47 @@
+"""
+Platform Kernels - Batched step for moving platforms
+"""
+
+import numpy as np
+
+from src.kernels import select_kernel
+
+STEP_PLATFORMS_SIGNATURE = "void(f8[::1], f8[::1], f8[::1], f8[::1], i8[::1])"
+
+
+def _step_platforms_numpy(position, start, step, move_range, direction):
+    """
+    Move many platforms one step along their axis at once
+
+    Same rule as Platform.update. position, start, step and move_range are
+    contiguous float64 and direction contiguous int64, one entry per platform;
+    position, step and direction are updated in place.
+
+    Args:
+        position: Position along each platform's axis
+        start: Start position along the axis
+        step: Signed move per frame (move_speed * move_direction)
+        move_range: Distance from start at which the platform turns around
+        direction: Move direction, 1 or -1
+    """
+    position += step
+    flip = np.abs(position - start) > move_range
+    np.negative(step, out=step, where=flip)
+    np.negative(direction, out=direction, where=flip)
+    np.copyto(position, start + move_range * direction, where=flip)
+
+
+def _step_platforms_loop(position, start, step, move_range, direction):
+    """Single-pass version of _step_platforms_numpy, compiled by Numba"""
+    for i in range(position.shape[0]):
+        value = position[i] + step[i]
+        # Reverse at the range limits
+        if abs(value - start[i]) > move_range[i]:
+            step[i] = -step[i]
+            direction[i] = -direction[i]
+            value = start[i] + move_range[i] * direction[i]
+        position[i] = value
+
+
+step_platforms = select_kernel('step_platforms', _step_platforms_loop, _step_platforms_numpy,
+                               STEP_PLATFORMS_SIGNATURE, fastmath=True)
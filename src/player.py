@@ -3,6 +3,7 @@ Player - Player character class with movement, jumping, and animation
 """
 
 import pygame
+from typing import Dict, Sequence
 from config.settings import *
 from src.sprite_manager import AnimatedSprite, SpriteManager
 
@@ -20,10 +21,36 @@ class Player(pygame.sprite.Sprite):
             sprite_manager: SpriteManager instance
         """
         super().__init__()
-        self.x = x
-        self.y = y
         self.width = PLAYER_WIDTH
         self.height = PLAYER_HEIGHT
+        self.move_speed = MOVE_SPEED
+        self.jump_power = JUMP_POWER
+        self.sprite_manager = sprite_manager
+
+        # Create player animation frames; the idle ones are shown at once, the rest on first use
+        self.idle_frames = sprite_manager.create_animated_sprite(self.width, self.height, 4, (100, 150, 255))
+        self._run_frames = None
+        self._jump_frame = None
+        self._fall_frame = None
+        self._flipped: Dict[int, pygame.Surface] = {}  # Mirrored frames for facing left, by id of the frame
+        # Draw the jump and fall sprites in the background so the first jump does not stall
+        sprite_manager.prefetch_placeholders([(self.width, self.height, (150, 150, 255)),
+                                              (self.width, self.height, (100, 100, 200))])
+
+        self.image = self.idle_frames[0]
+        self.rect = self.image.get_rect(topleft=(x, y))
+        self.reset(x, y)
+
+    def reset(self, x: float, y: float):
+        """
+        Put the player back in its starting state (full health, no score), keeping its sprites
+
+        Args:
+            x: Starting X position
+            y: Starting Y position
+        """
+        self.x = x
+        self.y = y
         self.velocity_x = 0
         self.velocity_y = 0
         self.is_jumping = False
@@ -35,45 +62,79 @@ class Player(pygame.sprite.Sprite):
         self.health = PLAYER_HEALTH
         self.score = 0
         self.facing_right = True
-        self.move_speed = MOVE_SPEED
-        self.jump_power = JUMP_POWER
-        self.sprite_manager = sprite_manager
         self.animation_frame = 0
         self.animation_counter = 0
         self.jump_sound_played = False  # Track if jump sound was played
         self.land_sound_played = False  # Track if land sound was played
 
-        # Create player animation frames
-        self.idle_frames = sprite_manager.create_animated_sprite(self.width, self.height, 4, (100, 150, 255))
-        self.run_frames = sprite_manager.create_animated_sprite(self.width, self.height, 6, (100, 200, 255))
-        self.jump_frame = sprite_manager.create_placeholder_sprite(self.width, self.height, (150, 150, 255))
-        self.fall_frame = sprite_manager.create_placeholder_sprite(self.width, self.height, (100, 100, 200))
-
         self.image = self.idle_frames[0]
-        self.rect = self.image.get_rect(topleft=(self.x, self.y))
+        self.rect.topleft = (self.x, self.y)
         self.current_animation = 'idle'
+        self._animation_key = None  # (state, frame, facing right) of self.image
+
+    @property
+    def run_frames(self):
+        """Running animation frames, created the first time the player runs"""
+        if self._run_frames is None:
+            self._run_frames = self.sprite_manager.create_animated_sprite(self.width, self.height, 6, (100, 200, 255))
+        return self._run_frames
+
+    @property
+    def jump_frame(self):
+        """Jumping sprite, created the first time the player jumps"""
+        if self._jump_frame is None:
+            self._jump_frame = self.sprite_manager.create_placeholder_sprite(self.width, self.height, (150, 150, 255))
+        return self._jump_frame
+
+    @property
+    def fall_frame(self):
+        """Falling sprite, created the first time the player falls"""
+        if self._fall_frame is None:
+            self._fall_frame = self.sprite_manager.create_placeholder_sprite(self.width, self.height, (100, 100, 200))
+        return self._fall_frame
+
+    def convert_frames(self, convert):
+        """
+        Convert the animation frames created so far, e.g. after the display mode changed
 
-    def handle_input(self, keys):
+        Args:
+            convert: Function mapping a surface to its converted copy
+        """
+        self.idle_frames = [convert(frame) for frame in self.idle_frames]
+        if self._run_frames is not None:
+            self._run_frames = [convert(frame) for frame in self._run_frames]
+        if self._jump_frame is not None:
+            self._jump_frame = convert(self._jump_frame)
+        if self._fall_frame is not None:
+            self._fall_frame = convert(self._fall_frame)
+        self._flipped.clear()
+        self.image = convert(self.image)
+        self._animation_key = None  # Pick the converted frame on the next update
+
+    def handle_input(self, pressed: Sequence[bool],
+                     # Key codes bound as locals once, this runs every frame
+                     _K_RIGHT=pygame.K_RIGHT, _K_d=pygame.K_d, _K_LEFT=pygame.K_LEFT, _K_a=pygame.K_a,
+                     _K_SPACE=pygame.K_SPACE, _K_UP=pygame.K_UP, _K_w=pygame.K_w):
         """
         Handle keyboard input for player movement
 
         Args:
-            keys: Pygame keys tuple from pygame.key.get_pressed()
+            pressed: Keyboard state from pygame.key.get_pressed(), taken once per frame
         """
         self.velocity_x = 0
 
         # Right movement
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        if pressed[_K_RIGHT] or pressed[_K_d]:
             self.velocity_x = self.move_speed
             self.facing_right = True
 
         # Left movement
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        if pressed[_K_LEFT] or pressed[_K_a]:
             self.velocity_x = -self.move_speed
             self.facing_right = False
 
         # Jump
-        if keys[pygame.K_SPACE] or keys[pygame.K_UP] or keys[pygame.K_w]:
+        if pressed[_K_SPACE] or pressed[_K_UP] or pressed[_K_w]:
             if self.on_ground and not self.is_jumping:
                 self.jump()
             elif self.can_double_jump and not self.on_ground and not self.on_wall:
@@ -95,12 +156,12 @@ class Player(pygame.sprite.Sprite):
         self.jump_sound_played = False  # Reset for next jump sound
         self.land_sound_played = False  # Will need to play land sound later
 
-    def apply_gravity(self):
-        """Apply gravity to player"""
+    def apply_gravity(self, _GRAVITY=GRAVITY, _MAX_FALL_SPEED=MAX_FALL_SPEED):
+        """Apply gravity to player (settings bound as locals, this runs every frame)"""
         if not self.on_ground:
-            self.velocity_y += GRAVITY
-            if self.velocity_y > MAX_FALL_SPEED:
-                self.velocity_y = MAX_FALL_SPEED
+            self.velocity_y += _GRAVITY
+            if self.velocity_y > _MAX_FALL_SPEED:
+                self.velocity_y = _MAX_FALL_SPEED
 
         # Wall slide
         if self.on_wall and self.velocity_y > 0 and not self.on_ground:
@@ -145,10 +206,10 @@ class Player(pygame.sprite.Sprite):
                 frames = self.idle_frames
         elif self.velocity_y < 0:
             new_animation = 'jump'
-            frames = [self.jump_frame]
+            frames = (self.jump_frame,)
         else:
             new_animation = 'fall'
-            frames = [self.fall_frame]
+            frames = (self.fall_frame,)
 
         # Reset animation frame if animation state changed
         if new_animation != self.current_animation:
@@ -161,16 +222,23 @@ class Player(pygame.sprite.Sprite):
         if self.animation_counter >= 1:
             self.animation_counter = 0
             self.animation_frame = (self.animation_frame + 1) % len(frames)
-
-        if self.animation_frame < len(frames):
-            self.image = frames[self.animation_frame]
-        else:
+        if self.animation_frame >= len(frames):
             self.animation_frame = 0
-            self.image = frames[0]
 
-        # Flip sprite if facing left
+        # The shown image only depends on state, frame and facing; keep it if none changed
+        key = (new_animation, self.animation_frame, self.facing_right)
+        if key == self._animation_key:
+            return
+        self._animation_key = key
+        image = frames[self.animation_frame]
+
+        # Use the mirrored frame if facing left, flipping each frame only once
         if not self.facing_right:
-            self.image = pygame.transform.flip(self.image, True, False)
+            flipped = self._flipped.get(id(image))
+            if flipped is None:
+                flipped = self._flipped[id(image)] = pygame.transform.flip(image, True, False)
+            image = flipped
+        self.image = image
 
     def check_collision_with_platform(self, platform):
         """
@@ -205,9 +273,9 @@ class Player(pygame.sprite.Sprite):
                 self.velocity_x = 0
                 self.on_wall = True
 
-    def take_damage(self):
+    def take_damage(self, amount: int = 1):
         """Reduce health"""
-        self.health -= 1
+        self.health -= amount
 
     def heal(self):
         """Increase health"""
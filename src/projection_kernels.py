@@ -0,0 +1,57 @@
+"""
+Projection Kernels - Batched perspective projection of box corners for the character designer
+"""
+
+import numpy as np
+
+from src.kernels import select_kernel
+
+PROJECT_CORNERS_SIGNATURE = "void(f8[:, ::1], f8[:, ::1], f8, i8[:, :, ::1])"
+
+
+# Box corners relative to the center, in units of the box size (same order as Box3D.project_2d)
+CORNER_OFFSETS = np.array([
+    (-0.5, -0.5, -0.5), (0.5, -0.5, -0.5), (0.5, 0.5, -0.5), (-0.5, 0.5, -0.5),
+    (-0.5, -0.5, 0.5), (0.5, -0.5, 0.5), (0.5, 0.5, 0.5), (-0.5, 0.5, 0.5),
+])
+
+# Screen position of the projection origin
+ORIGIN_X = 640
+ORIGIN_Y = 360
+
+
+def _project_corners_numpy(centers, sizes, camera_distance, out):
+    """
+    Project the 8 corners of many boxes to 2D screen space
+
+    Same rule as Box3D.project_2d, truncating to ints. centers and sizes are
+    contiguous float64 N x 3 arrays; out is a contiguous int64 N x 8 x 2
+    array, filled in place.
+
+    Args:
+        centers: Box centers (x, y, z)
+        sizes: Box sizes (width, height, depth)
+        camera_distance: Distance from camera
+        out: Projected corner points
+    """
+    corners = centers[:, None, :] + CORNER_OFFSETS * sizes[:, None, :]
+    scale = camera_distance / (camera_distance - corners[..., 2])
+    out[..., 0] = ORIGIN_X + corners[..., 0] * scale
+    out[..., 1] = ORIGIN_Y + corners[..., 1] * scale
+
+
+def _project_corners_loop(centers, sizes, camera_distance, out):
+    """Single-pass version of _project_corners_numpy without temporaries, compiled by Numba"""
+    for i in range(centers.shape[0]):
+        for k in range(8):
+            cx = centers[i, 0] + CORNER_OFFSETS[k, 0] * sizes[i, 0]
+            cy = centers[i, 1] + CORNER_OFFSETS[k, 1] * sizes[i, 1]
+            cz = centers[i, 2] + CORNER_OFFSETS[k, 2] * sizes[i, 2]
+            scale = camera_distance / (camera_distance - cz)
+            out[i, k, 0] = int(ORIGIN_X + cx * scale)
+            out[i, k, 1] = int(ORIGIN_Y + cy * scale)
+
+
+# No fastmath: the corner sums must round exactly as project_2d's do
+project_corners = select_kernel('project_corners', _project_corners_loop, _project_corners_numpy,
+                                PROJECT_CORNERS_SIGNATURE)
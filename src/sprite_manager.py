@@ -4,21 +4,170 @@ Sprite Manager - Handles sprite loading, caching, and animation
 
 import os
 import pygame
+import numpy as np
+from collections import OrderedDict
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, partial
 from typing import Dict, List, Tuple, Optional
 from PIL import Image, ImageDraw
 import io
 
+
+def to_display_format(surface: pygame.Surface) -> pygame.Surface:
+    """
+    Convert a surface to the display's pixel format so blits skip per-pixel translation
+
+    Args:
+        surface: Surface to convert
+
+    Returns:
+        Converted surface, or the surface itself if no display mode is set yet
+    """
+    if pygame.display.get_surface() is None:
+        return surface
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+    return surface.convert()
+
+
+@lru_cache(maxsize=64)
+def _iso_geometry(width: int, height: int):
+    """
+    Get the isometric cube outline for a sprite size
+
+    Args:
+        width: Width of sprite
+        height: Height of sprite
+
+    Returns:
+        (front points, top points, left points, shine start, shine end)
+    """
+    front_points = (
+        (width * 0.3, height * 0.7),      # bottom-left
+        (width * 0.3, height * 0.2),      # top-left
+        (width * 0.85, height * 0.2),     # top-right
+        (width * 0.85, height * 0.7),     # bottom-right
+    )
+    top_points = (
+        (width * 0.3, height * 0.2),      # left
+        (width * 0.15, height * 0.05),    # top (receding)
+        (width * 0.7, height * 0.05),     # right
+        (width * 0.85, height * 0.2),     # bottom
+    )
+    left_points = (
+        (width * 0.3, height * 0.2),      # top
+        (width * 0.15, height * 0.05),    # back-top
+        (width * 0.15, height * 0.5),     # back-bottom
+        (width * 0.3, height * 0.7),      # front-bottom
+    )
+    return front_points, top_points, left_points, (width * 0.2, height * 0.1), (width * 0.6, height * 0.08)
+
+
+@lru_cache(maxsize=64)
+def _animated_colors(frames: int, color: Tuple[int, int, int]):
+    """
+    Get the face colors of every frame of an animated cube, computed as one array step
+
+    Args:
+        frames: Number of animation frames
+        color: RGB color tuple
+
+    Returns:
+        Per frame, (front color, top color, left color, shine color) as RGB tuples
+    """
+    # Vary color brightness for animation effect, from 0.8 to 1.2
+    brightness_factor = 0.8 + np.arange(frames) / frames * 0.4
+    front = np.clip((np.array(color, dtype=np.int64)[None, :] * brightness_factor[:, None]).astype(np.int64), 0, 255)
+    top = np.minimum(front + 70, 255)
+    left = np.maximum(front - 70, 0)
+    shine = np.minimum(top + 100, 255)
+    colors = np.stack((front, top, left, shine), axis=1).tolist()
+    return tuple(tuple(tuple(c) for c in frame) for frame in colors)
+
+
+class _LazyFrameList(Sequence):
+    """Read-only list of animation frames that builds each frame the first time it is accessed"""
+
+    def __init__(self, build_frame, count: int):
+        """
+        Initialize lazy frame list
+
+        Args:
+            build_frame: Function mapping a frame index to its surface
+            count: Number of frames
+        """
+        self._build_frame = build_frame
+        self._frames: List[Optional[pygame.Surface]] = [None] * count
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._frames)))]
+        frame = self._frames[index]
+        if frame is None:
+            frame = self._frames[index] = self._build_frame(index % len(self._frames))
+        return frame
+
+    def reconvert(self, convert):
+        """
+        Convert the frames built so far; frames built later already use the current display format
+
+        Args:
+            convert: Function mapping a surface to its converted copy
+        """
+        self._frames = [None if frame is None else convert(frame) for frame in self._frames]
+
+
 class SpriteManager:
     """Manages sprite loading, caching, and animation"""
 
+    # Pixel memory the loaded sprite cache may hold before evicting its least recently used entries
+    SPRITE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
     def __init__(self):
         """Initialize sprite manager"""
-        self.sprite_cache: Dict[str, pygame.Surface] = {}
+        # filename (unscaled) or (filename, width, height) -> sprite, least recently used first
+        self.sprite_cache: Dict[object, pygame.Surface] = OrderedDict()
+        self._sprite_cache_bytes = 0  # Pixel memory held by sprite_cache
         self.animation_cache: Dict[str, List[pygame.Surface]] = {}
+        # Generated placeholders, keyed by (width, height, color) and (width, height, frames, color)
+        self._placeholder_cache: Dict[Tuple[int, int, Tuple[int, int, int]], pygame.Surface] = {}
+        self._anim_placeholder_cache: Dict[Tuple[int, int, int, Tuple[int, int, int]], _LazyFrameList] = {}
+        self._pending_placeholders: Dict[Tuple[int, int, Tuple[int, int, int]], Future] = {}
         self.sprites_dir = "assets/sprites"
 
         # Ensure sprites directory exists
         os.makedirs(self.sprites_dir, exist_ok=True)
+        self.refresh_files()
+
+    def refresh_files(self):
+        """List the sprites directory again (e.g. after sprite files were added while running)"""
+        self._file_set = set(os.listdir(self.sprites_dir))
+
+        # Forget placeholder animations whose files are there now, so the next load reads them
+        stale = [name for name, frames in self.animation_cache.items()
+                 if isinstance(frames, _LazyFrameList)
+                 and (self._has_file(f"{name}_sheet.png") or self._has_file(f"{name}_0.png"))]
+        for name in stale:
+            del self.animation_cache[name]
+
+    def _has_file(self, filename: str) -> bool:
+        """
+        Check whether a file exists in the sprites directory without a stat per probe
+
+        Args:
+            filename: Path relative to the sprites directory
+
+        Returns:
+            True if the file was there when the directory was last listed
+        """
+        if os.path.dirname(filename):
+            # Only the top level is listed
+            return os.path.exists(os.path.join(self.sprites_dir, filename))
+        return filename in self._file_set
 
     def load_sprite(self, filename: str, width: int = None, height: int = None) -> pygame.Surface:
         """
@@ -32,27 +181,102 @@ class SpriteManager:
         Returns:
             Loaded pygame.Surface
         """
-        # Check cache first
-        cache_key = f"{filename}_{width}_{height}"
-        if cache_key in self.sprite_cache:
-            return self.sprite_cache[cache_key]
+        # Check cache first; unscaled sprites, the common case, are keyed by the filename alone
+        unscaled = width is None and height is None
+        cache_key = filename if unscaled else (filename, width, height)
+        sprite = self.sprite_cache.get(cache_key)
+        if sprite is not None:
+            self.sprite_cache.move_to_end(cache_key)
+            return sprite
 
         # Try to load from file
-        filepath = os.path.join(self.sprites_dir, filename)
-        if os.path.exists(filepath):
-            sprite = pygame.image.load(filepath).convert_alpha()
-            if width and height:
-                sprite = pygame.transform.scale(sprite, (width, height))
-            self.sprite_cache[cache_key] = sprite
-            return sprite
+        if self._has_file(filename):
+            if unscaled:
+                sprite = pygame.image.load(os.path.join(self.sprites_dir, filename)).convert_alpha()
+            else:
+                # Sized variants scale the cached unscaled sprite, so the file is decoded only once
+                sprite = self.load_sprite(filename)
+                if width and height:
+                    sprite = pygame.transform.scale(sprite, (width, height))
         else:
-            # Return a placeholder if file not found
+            # Return a placeholder if file not found. It is not cached here (create_placeholder_sprite
+            # shares one surface per size), so the file is picked up once refresh_files() sees it.
             return self.create_placeholder_sprite(width or 32, height or 32)
+        self._cache_sprite(cache_key, sprite)
+        return sprite
+
+    def _cache_sprite(self, cache_key, sprite: pygame.Surface):
+        """
+        Add a sprite to the cache, evicting the least recently used ones beyond the memory budget
+
+        Args:
+            cache_key: Key the sprite was requested by
+            sprite: Sprite surface
+        """
+        cache = self.sprite_cache
+        cache[cache_key] = sprite
+        self._sprite_cache_bytes += sprite.get_width() * sprite.get_height() * sprite.get_bytesize()
+        # Always keep the sprite just added, even if it alone exceeds the budget
+        while self._sprite_cache_bytes > self.SPRITE_CACHE_MAX_BYTES and len(cache) > 1:
+            _, evicted = cache.popitem(last=False)
+            self._sprite_cache_bytes -= evicted.get_width() * evicted.get_height() * evicted.get_bytesize()
 
     def create_placeholder_sprite(self, width: int, height: int, color: Tuple[int, int, int] = (200, 200, 200)) -> pygame.Surface:
         """
         Create a true 3D-style isometric cube sprite
 
+        Args:
+            width: Width of sprite
+            height: Height of sprite
+            color: RGB color tuple
+
+        Returns:
+            pygame.Surface with 3D isometric cube, shared by all calls with the same arguments
+        """
+        key = (width, height, tuple(color))
+        cached = self._placeholder_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Take the prefetched drawing if there is one; converting needs the display, so it happens here
+        future = self._pending_placeholders.pop(key, None)
+        surface = future.result() if future is not None else self._draw_placeholder(width, height, color)
+        surface = self._placeholder_cache[key] = to_display_format(surface)
+        return surface
+
+    def prefetch_placeholders(self, specs):
+        """
+        Draw placeholder sprites on a worker thread ahead of their first use
+
+        The game thread's idle time in Clock.tick is enough to finish them, so
+        create_placeholder_sprite later only converts the result.
+
+        Args:
+            specs: (width, height, color) of each placeholder
+        """
+        pool = None
+        for width, height, color in specs:
+            key = (width, height, tuple(color))
+            if key in self._placeholder_cache or key in self._pending_placeholders:
+                continue
+            if pool is None:
+                pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sprite-prefetch")
+            self._pending_placeholders[key] = pool.submit(self._draw_placeholder, width, height, color)
+        if pool is not None:
+            # The worker finishes the submitted drawings and then exits
+            pool.shutdown(wait=False)
+
+    def close(self):
+        """Cancel prefetched placeholders that have not started drawing (call on quit)"""
+        for future in self._pending_placeholders.values():
+            future.cancel()
+        self._pending_placeholders.clear()
+
+    @staticmethod
+    def _draw_placeholder(width: int, height: int, color: Tuple[int, int, int]) -> pygame.Surface:
+        """
+        Draw the isometric cube placeholder, without converting it (safe off the game thread)
+
         Args:
             width: Width of sprite
             height: Height of sprite
@@ -62,49 +286,37 @@ class SpriteManager:
             pygame.Surface with 3D isometric cube
         """
         surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        front_points, top_points, left_points, shine_start, shine_end = _iso_geometry(width, height)
+
+        # One lock for all the draw calls instead of one per call
+        surface.lock()
+        try:
+            # Create an isometric 3D box effect using 3 visible faces
+
+            # Main face (front-right) - the main colored side
+            front_color = color
+            pygame.draw.polygon(surface, front_color, front_points)
+            pygame.draw.polygon(surface, (0, 0, 0), front_points, 3)
+
+            # Top face (darker - isometric top) - creates 3D depth
+            top_color = tuple(min(255, c + 60) for c in color)
+            pygame.draw.polygon(surface, top_color, top_points)
+            pygame.draw.polygon(surface, (0, 0, 0), top_points, 2)
+
+            # Left side face (darker for shadow)
+            left_color = tuple(max(0, c - 60) for c in color)
+            pygame.draw.polygon(surface, left_color, left_points)
+            pygame.draw.polygon(surface, (0, 0, 0), left_points, 2)
 
-        # Create an isometric 3D box effect using 3 visible faces
-
-        # Main face (front-right) - the main colored side
-        front_color = color
-        front_points = [
-            (width * 0.3, height * 0.7),      # bottom-left
-            (width * 0.3, height * 0.2),      # top-left
-            (width * 0.85, height * 0.2),     # top-right
-            (width * 0.85, height * 0.7),     # bottom-right
-        ]
-        pygame.draw.polygon(surface, front_color, front_points)
-        pygame.draw.polygon(surface, (0, 0, 0), front_points, 3)
-
-        # Top face (darker - isometric top) - creates 3D depth
-        top_color = tuple(min(255, c + 60) for c in color)
-        top_points = [
-            (width * 0.3, height * 0.2),      # left
-            (width * 0.15, height * 0.05),    # top (receding)
-            (width * 0.7, height * 0.05),     # right
-            (width * 0.85, height * 0.2),     # bottom
-        ]
-        pygame.draw.polygon(surface, top_color, top_points)
-        pygame.draw.polygon(surface, (0, 0, 0), top_points, 2)
-
-        # Left side face (darker for shadow)
-        left_color = tuple(max(0, c - 60) for c in color)
-        left_points = [
-            (width * 0.3, height * 0.2),      # top
-            (width * 0.15, height * 0.05),    # back-top
-            (width * 0.15, height * 0.5),     # back-bottom
-            (width * 0.3, height * 0.7),      # front-bottom
-        ]
-        pygame.draw.polygon(surface, left_color, left_points)
-        pygame.draw.polygon(surface, (0, 0, 0), left_points, 2)
-
-        # Add highlight/shine on top for reflective effect
-        shine_color = tuple(min(255, c + 100) for c in top_color)
-        pygame.draw.line(surface, shine_color, (width * 0.2, height * 0.1), (width * 0.6, height * 0.08), 2)
+            # Add highlight/shine on top for reflective effect
+            shine_color = tuple(min(255, c + 100) for c in top_color)
+            pygame.draw.line(surface, shine_color, shine_start, shine_end, 2)
+        finally:
+            surface.unlock()
 
         return surface
 
-    def create_animated_sprite(self, width: int, height: int, frames: int = 4, color: Tuple[int, int, int] = (100, 150, 255)) -> List[pygame.Surface]:
+    def create_animated_sprite(self, width: int, height: int, frames: int = 4, color: Tuple[int, int, int] = (100, 150, 255)) -> Sequence:
         """
         Create an animated 3D isometric cube sprite with animation frames
 
@@ -115,65 +327,64 @@ class SpriteManager:
             color: RGB color tuple
 
         Returns:
-            List of pygame.Surface frames
+            Read-only sequence of pygame.Surface frames, each drawn the first time it is used;
+            shared by all calls with the same arguments
         """
-        frame_list = []
-        for i in range(frames):
-            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        key = (width, height, frames, tuple(color))
+        frame_list = self._anim_placeholder_cache.get(key)
+        if frame_list is None:
+            frame_list = self._anim_placeholder_cache[key] = _LazyFrameList(
+                partial(self._build_animated_frame, width, height, frames, color), frames)
+        return frame_list
+
+    @staticmethod
+    def _build_animated_frame(width: int, height: int, frames: int, color: Tuple[int, int, int], i: int) -> pygame.Surface:
+        """
+        Draw one frame of an animated 3D isometric cube sprite
 
-            # Vary color brightness for animation effect
-            brightness_factor = 0.8 + (i / frames) * 0.4  # Range from 0.8 to 1.2
-            color_frame = tuple(int(c * brightness_factor) for c in color)
-            color_frame = tuple(min(255, max(0, c)) for c in color_frame)
+        Args:
+            width: Width of the frame
+            height: Height of the frame
+            frames: Number of animation frames
+            color: RGB color tuple
+            i: Index of the frame to draw
+
+        Returns:
+            pygame.Surface frame
+        """
+        # The outline is the same in every frame; only colors change (with brightness)
+        front_points, top_points, left_points, shine_start, shine_end = _iso_geometry(width, height)
+        front_color, top_color, left_color, shine_color = _animated_colors(frames, tuple(color))[i]
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
 
+        # One lock for all the draw calls instead of one per call
+        surface.lock()
+        try:
             # Draw 3D isometric cube with varying brightness
             # Front face
-            front_color = color_frame
-            front_points = [
-                (width * 0.3, height * 0.7),
-                (width * 0.3, height * 0.2),
-                (width * 0.85, height * 0.2),
-                (width * 0.85, height * 0.7),
-            ]
             pygame.draw.polygon(surface, front_color, front_points)
             pygame.draw.polygon(surface, (0, 0, 0), front_points, 3)
 
             # Top face
-            top_color = tuple(min(255, c + 70) for c in color_frame)
-            top_points = [
-                (width * 0.3, height * 0.2),
-                (width * 0.15, height * 0.05),
-                (width * 0.7, height * 0.05),
-                (width * 0.85, height * 0.2),
-            ]
             pygame.draw.polygon(surface, top_color, top_points)
             pygame.draw.polygon(surface, (0, 0, 0), top_points, 2)
 
             # Left side face
-            left_color = tuple(max(0, c - 70) for c in color_frame)
-            left_points = [
-                (width * 0.3, height * 0.2),
-                (width * 0.15, height * 0.05),
-                (width * 0.15, height * 0.5),
-                (width * 0.3, height * 0.7),
-            ]
             pygame.draw.polygon(surface, left_color, left_points)
             pygame.draw.polygon(surface, (0, 0, 0), left_points, 2)
 
             # Highlight on top
-            shine_color = tuple(min(255, c + 100) for c in top_color)
-            pygame.draw.line(surface, shine_color, (width * 0.2, height * 0.1), (width * 0.6, height * 0.08), 2)
+            pygame.draw.line(surface, shine_color, shine_start, shine_end, 2)
 
             # Add animation indicator - multiple dots showing motion
             indicator_color = (255, 100 + int(i * 20), 50)
+            dot_y = int(height * 0.85 + int((i / frames) * 15) % 15)
             for dot_i in range(3):
-                dot_x = width * 0.4 + (dot_i * 8)
-                dot_y = height * 0.85 + int((i / frames) * 15) % 15
-                pygame.draw.circle(surface, indicator_color, (int(dot_x), int(dot_y)), 2)
-
-            frame_list.append(surface)
+                pygame.draw.circle(surface, indicator_color, (int(width * 0.4 + dot_i * 8), dot_y), 2)
+        finally:
+            surface.unlock()
 
-        return frame_list
+        return to_display_format(surface)
 
     def load_animation(self, name: str, frames: int = 4) -> List[pygame.Surface]:
         """
@@ -189,14 +400,23 @@ class SpriteManager:
         if name in self.animation_cache:
             return self.animation_cache[name]
 
-        # Try to load from file first
+        # Prefer a spritesheet (frames side by side in one image): one decode for all frames
         frame_list = []
-        for i in range(frames):
-            filename = f"{name}_{i}.png"
-            filepath = os.path.join(self.sprites_dir, filename)
-            if os.path.exists(filepath):
-                surface = pygame.image.load(filepath).convert_alpha()
-                frame_list.append(surface)
+        sheet_name = f"{name}_sheet.png"
+        if self._has_file(sheet_name):
+            sheet = pygame.image.load(os.path.join(self.sprites_dir, sheet_name)).convert_alpha()
+            frame_width = sheet.get_width() // frames
+            frame_height = sheet.get_height()
+            frame_list = [sheet.subsurface((i * frame_width, 0, frame_width, frame_height)).copy()
+                          for i in range(frames)]
+
+        # Otherwise try one file per frame
+        if not frame_list:
+            for i in range(frames):
+                filename = f"{name}_{i}.png"
+                if self._has_file(filename):
+                    surface = pygame.image.load(os.path.join(self.sprites_dir, filename)).convert_alpha()
+                    frame_list.append(surface)
 
         # If no files found, create placeholder
         if not frame_list:
@@ -205,6 +425,27 @@ class SpriteManager:
         self.animation_cache[name] = frame_list
         return frame_list
 
+    def reconvert_cache(self, convert=to_display_format):
+        """
+        Convert cached sprites again after the display mode changed
+
+        Args:
+            convert: Function mapping a surface to its converted copy
+        """
+        for key, sprite in self.sprite_cache.items():
+            self.sprite_cache[key] = convert(sprite)
+        # The converted copies may use a different pixel size
+        self._sprite_cache_bytes = sum(sprite.get_width() * sprite.get_height() * sprite.get_bytesize()
+                                       for sprite in self.sprite_cache.values())
+        for name, frame_list in self.animation_cache.items():
+            # Generated placeholders are shared with _anim_placeholder_cache and converted below
+            if not isinstance(frame_list, _LazyFrameList):
+                self.animation_cache[name] = [convert(frame) for frame in frame_list]
+        for key, sprite in self._placeholder_cache.items():
+            self._placeholder_cache[key] = convert(sprite)
+        for frame_list in self._anim_placeholder_cache.values():
+            frame_list.reconvert(convert)
+
 
 class AnimatedSprite(pygame.sprite.Sprite):
     """Base class for animated sprites"""
@@ -221,24 +462,129 @@ class AnimatedSprite(pygame.sprite.Sprite):
         """
         super().__init__()
         self.frames = frames
+        self._n_frames = len(frames)  # Cached for the wrap in update()
         self.current_frame = 0
         self.animation_speed = animation_speed
         self.animation_counter = 0
+        self._visible = True  # See the visible property
         self.image = frames[0]
         self.rect = self.image.get_rect(topleft=(x, y))
         self.x = x
         self.y = y
 
+    @property
+    def visible(self) -> bool:
+        """Whether the sprite is on screen; hidden sprites do not animate"""
+        return self._visible
+
+    @visible.setter
+    def visible(self, visible: bool):
+        visible = bool(visible)
+        if visible != self._visible:
+            self._visible = visible
+            # Batched groups keep their own copy of which sprites animate
+            for group in self.groups():
+                if isinstance(group, AnimatedSpriteGroup):
+                    group.invalidate()
+
     def update(self):
         """Update animation frame"""
+        if not self._visible:
+            return
         self.animation_counter += self.animation_speed
         if self.animation_counter >= 1:
             self.animation_counter = 0
-            self.current_frame = (self.current_frame + 1) % len(self.frames)
-            self.image = self.frames[self.current_frame]
+            # Frames advance by one, so wrapping needs a compare, not a modulo
+            next_frame = self.current_frame + 1
+            if next_frame == self._n_frames:
+                next_frame = 0
+            self.current_frame = next_frame
+            self.image = self.frames[next_frame]
 
     def set_position(self, x: float, y: float):
         """Update position"""
         self.x = x
         self.y = y
         self.rect.topleft = (x, y)
+
+
+class AnimatedSpriteGroup(pygame.sprite.Group):
+    """Group of animated sprites, advanced together as one array step"""
+
+    # Below this many sprites the per-sprite update is cheaper than the array step
+    VECTOR_MIN_SPRITES = 32
+
+    def __init__(self, *sprites):
+        """
+        Initialize animated sprite group
+
+        Args:
+            sprites: AnimatedSprite objects to add
+        """
+        self._members = None  # Sprites in the order of the state arrays
+        self._state = None  # Their animation state as arrays, see _get_state()
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        """Gather the animation state again after sprites are added"""
+        self.invalidate()
+        super().add_internal(sprite, layer)
+
+    def remove_internal(self, sprite):
+        """Gather the animation state again after sprites are removed"""
+        self.invalidate()
+        super().remove_internal(sprite)
+
+    def invalidate(self):
+        """Gather the animation state again before the next update (e.g. a sprite's frames changed)"""
+        if self._state is not None:
+            # Hand the counters kept in the arrays back to the sprites
+            for sprite, counter in zip(self._members, self._state[0].tolist()):
+                sprite.animation_counter = counter
+        self._members = None
+        self._state = None
+
+    def _get_state(self):
+        """
+        Get the animation state of the sprites as arrays
+
+        The arrays are the authoritative state between invalidations. A sprite's
+        current_frame and image are written back whenever it advances; its
+        animation_counter is written back by invalidate().
+
+        Returns:
+            (counters, speeds, current frames, frame counts); hidden sprites get speed 0
+        """
+        if self._state is None:
+            sprites = self._members = self.sprites()
+            self._state = (
+                np.array([s.animation_counter for s in sprites], dtype=np.float64),
+                np.array([s.animation_speed if s.visible else 0.0 for s in sprites], dtype=np.float64),
+                np.array([s.current_frame for s in sprites], dtype=np.int64),
+                np.array([len(s.frames) for s in sprites], dtype=np.int64),
+            )
+        return self._state
+
+    def update(self, *args, **kwargs):
+        """Advance every sprite's animation, as AnimatedSprite.update does for each"""
+        if args or kwargs or len(self) < self.VECTOR_MIN_SPRITES:
+            self.invalidate()
+            super().update(*args, **kwargs)
+            return
+
+        counters, speeds, current, counts = self._get_state()
+        counters += speeds
+        advance = counters >= 1
+        if not advance.any():
+            return
+        counters[advance] = 0
+        current[advance] += 1
+        current[current >= counts] = 0
+
+        # Show the new frame of the sprites that advanced
+        members = self._members
+        advanced = np.flatnonzero(advance)
+        for i, frame in zip(advanced.tolist(), current[advanced].tolist()):
+            sprite = members[i]
+            sprite.current_frame = frame
+            sprite.image = sprite.frames[frame]
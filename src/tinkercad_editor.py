@@ -4,11 +4,88 @@ Allows creating custom 3D characters and enemies that convert to 2D sprites
 """
 
 import pygame
-import json
 import math
 import os
+import numpy as np
+from functools import lru_cache
 from typing import List, Dict, Tuple
 from config.settings import *
+from src.json_codec import dump_json, load_json
+from src.ui import get_font
+from src.projection_kernels import project_corners
+
+
+@lru_cache(maxsize=32)
+def _cos_sin(angle: float) -> Tuple[float, float]:
+    """Cosine and sine of an angle in degrees, shared by every box rotated by that angle"""
+    rad = math.radians(angle)
+    return math.cos(rad), math.sin(rad)
+
+
+def _rotation_matrix(angle_x: float, angle_y: float, angle_z: float) -> np.ndarray:
+    """
+    Build the matrix of Box3D.rotate_x, rotate_y and rotate_z applied in that order
+
+    Args:
+        angle_x, angle_y, angle_z: Rotation angles in degrees
+
+    Returns:
+        3x3 matrix R; rotated points are R @ (x, y, z)
+    """
+    cx, sx = _cos_sin(angle_x)
+    cy, sy = _cos_sin(angle_y)
+    cz, sz = _cos_sin(angle_z)
+    rx = np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]])
+    ry = np.array([[cy, 0, -sy], [0, 1, 0], [sy, 0, cy]])
+    rz = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]])
+    return rz @ ry @ rx
+
+
+def project_boxes(boxes: List['Box3D'], camera_distance: float = 500) -> np.ndarray:
+    """
+    Project the corners of many boxes to 2D screen space at once, as Box3D.project_2d does for one
+
+    Args:
+        boxes: Boxes to project
+        camera_distance: Distance from camera
+
+    Returns:
+        N x 8 x 2 int array of projected corner points
+    """
+    centers = np.array([(b.x, b.y, b.z) for b in boxes], dtype=np.float64).reshape(-1, 3)
+    sizes = np.array([(b.width, b.height, b.depth) for b in boxes], dtype=np.float64).reshape(-1, 3)
+    projected = np.empty((len(boxes), 8, 2), dtype=np.int64)
+    project_corners(centers, sizes, float(camera_distance), projected)
+    return projected
+
+
+# Corner index pairs of the box edges, and the corners of the front face
+_FRONT_FACE_IDX = (0, 1, 2, 3)
+_BACK_FACE_IDX = (4, 5, 6, 7)
+_CONNECTING_EDGES = ((0, 4), (1, 5), (2, 6), (3, 7))
+
+
+def _fill_quad(surface: pygame.Surface, color, quad):
+    """
+    Fill a projected face, as pygame.draw.polygon would
+
+    An unrotated front face projects to an axis-aligned rectangle, which a
+    rect fill covers without scanline rasterizing. The rect is clipped to the
+    surface first: Surface.fill keeps the full size of a rect that starts left
+    of or above the surface, where draw.polygon cuts it off.
+
+    Args:
+        surface: Surface to draw on
+        color: Fill color
+        quad: The face's four corner points, in _FRONT_FACE_IDX order
+    """
+    (x0, y0), (x1, y1), (x2, y2), (x3, y3) = quad
+    if y0 == y1 and x1 == x2 and y2 == y3 and x3 == x0:
+        left, right = (x0, x1) if x0 <= x1 else (x1, x0)
+        top, bottom = (y0, y2) if y0 <= y2 else (y2, y0)
+        surface.fill(color, pygame.Rect(left, top, right - left + 1, bottom - top + 1).clip(surface.get_rect()))
+    else:
+        pygame.draw.polygon(surface, color, quad)
 
 
 class Box3D:
@@ -34,25 +111,25 @@ class Box3D:
 
     def rotate_x(self, angle: float):
         """Rotate around X axis"""
-        rad = math.radians(angle)
-        new_y = self.y * math.cos(rad) - self.z * math.sin(rad)
-        new_z = self.y * math.sin(rad) + self.z * math.cos(rad)
+        c, s = _cos_sin(angle)
+        new_y = self.y * c - self.z * s
+        new_z = self.y * s + self.z * c
         self.y = new_y
         self.z = new_z
 
     def rotate_y(self, angle: float):
         """Rotate around Y axis"""
-        rad = math.radians(angle)
-        new_x = self.x * math.cos(rad) - self.z * math.sin(rad)
-        new_z = self.x * math.sin(rad) + self.z * math.cos(rad)
+        c, s = _cos_sin(angle)
+        new_x = self.x * c - self.z * s
+        new_z = self.x * s + self.z * c
         self.x = new_x
         self.z = new_z
 
     def rotate_z(self, angle: float):
         """Rotate around Z axis"""
-        rad = math.radians(angle)
-        new_x = self.x * math.cos(rad) - self.y * math.sin(rad)
-        new_y = self.x * math.sin(rad) + self.y * math.cos(rad)
+        c, s = _cos_sin(angle)
+        new_x = self.x * c - self.y * s
+        new_y = self.x * s + self.y * c
         self.x = new_x
         self.y = new_y
 
@@ -127,9 +204,9 @@ class CharacterDesigner:
         self.camera_distance = 500
         self.current_design_name = "Custom Character"
         self.mode = 'view'  # 'view' or 'edit'
-        self.font_large = pygame.font.Font(None, 48)
-        self.font_medium = pygame.font.Font(None, 32)
-        self.font_small = pygame.font.Font(None, 24)
+        self.font_large = get_font(48)
+        self.font_medium = get_font(32)
+        self.font_small = get_font(24)
 
         # Default starter design
         self.create_default_character()
@@ -221,49 +298,68 @@ class CharacterDesigner:
         pygame.draw.rect(surface, COLOR_BLACK, (50, 100, 800, 500))
         pygame.draw.rect(surface, COLOR_LIGHT_GRAY, (50, 100, 800, 500), 2)
 
-        # Apply rotations to all boxes
-        for box in self.boxes:
-            box.rotate_x(self.rotation_x / 100)
-            box.rotate_y(self.rotation_y / 100)
-            box.rotate_z(self.rotation_z / 100)
+        # Rotate, depth-sort and project all boxes as one pass over their arrays
+        centers, sizes, visible = self._rotated_box_arrays()
+        order = np.argsort(centers[:, 2], kind='stable')
+        order = order[visible[order]]  # Hidden boxes are sorted but not drawn
+        projected = np.empty((len(order), 8, 2), dtype=np.int64)
+        project_corners(centers[order], sizes[order], float(self.camera_distance), projected)
 
-        # Draw boxes (sorted by depth for proper rendering)
-        boxes_sorted = sorted(self.boxes, key=lambda b: b.z)
-        for box in boxes_sorted:
-            if box.visible:
-                self.draw_3d_box(surface, box)
+        # Draw boxes back to front
+        boxes = self.boxes
+        for i, points in zip(order.tolist(), projected.tolist()):
+            self.draw_3d_box(surface, boxes[i], points)
 
         # Draw controls
         self.draw_controls(surface)
 
-    def draw_3d_box(self, surface: pygame.Surface, box: Box3D):
+    def _rotated_box_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Gather every box in one pass and rotate the positions by the current rotation speeds
+
+        Returns:
+            (centers, sizes, visible): N x 3 positions after the rotation, N x 3 sizes
+            and N visibility flags, in box order
+        """
+        rows = np.array([(box.x, box.y, box.z, box.width, box.height, box.depth, box.visible)
+                         for box in self.boxes], dtype=np.float64).reshape(-1, 7)
+        centers = np.ascontiguousarray(rows[:, :3])
+        sizes = np.ascontiguousarray(rows[:, 3:6])
+        visible = rows[:, 6] != 0
+        if not self.boxes or not (self.rotation_x or self.rotation_y or self.rotation_z):
+            return centers, sizes, visible
+        rotation = _rotation_matrix(self.rotation_x / 100, self.rotation_y / 100, self.rotation_z / 100)
+        centers = centers @ rotation.T
+        for box, (x, y, z) in zip(self.boxes, centers.tolist()):
+            box.x = x
+            box.y = y
+            box.z = z
+        return centers, sizes, visible
+
+    def draw_3d_box(self, surface: pygame.Surface, box: Box3D, points=None):
         """
         Draw a 3D box on screen
 
         Args:
             surface: Pygame surface
             box: Box3D object to draw
+            points: The box's projected corners, if already computed
         """
         # Get 2D projection
-        points = box.project_2d(self.camera_distance)
+        if points is None:
+            points = box.project_2d(self.camera_distance)
 
         # Draw box edges
-        edges = [
-            (0, 1), (1, 2), (2, 3), (3, 0),  # Front face
-            (4, 5), (5, 6), (6, 7), (7, 4),  # Back face
-            (0, 4), (1, 5), (2, 6), (3, 7),  # Connecting edges
-        ]
-
         line_color = COLOR_YELLOW if box == self.selected_box else box.color
-        for edge in edges:
-            p1 = points[edge[0]]
-            p2 = points[edge[1]]
-            pygame.draw.line(surface, line_color, p1, p2, 2)
+        # One closed polyline per face, then the four connecting edges
+        front_face = [points[i] for i in _FRONT_FACE_IDX]
+        pygame.draw.lines(surface, line_color, True, front_face, 2)
+        pygame.draw.lines(surface, line_color, True, [points[i] for i in _BACK_FACE_IDX], 2)
+        for a, b in _CONNECTING_EDGES:
+            pygame.draw.line(surface, line_color, points[a], points[b], 2)
 
         # Draw filled face (front)
-        front_face = [points[0], points[1], points[2], points[3]]
-        face_color = box.color
-        pygame.draw.polygon(surface, face_color, front_face)
+        _fill_quad(surface, box.color, front_face)
 
     def draw_controls(self, surface: pygame.Surface):
         """Draw control instructions and buttons"""
@@ -306,26 +402,18 @@ class CharacterDesigner:
         # Create a temporary surface for rendering
         sprite = pygame.Surface((width, height), pygame.SRCALPHA)
 
-        # Render from current angle
-        scale_x = width / 800
-        scale_y = height / 500
-
-        for box in self.boxes:
-            if box.visible:
-                points = box.project_2d(self.camera_distance)
-                # Scale points to sprite size
-                scaled_points = [
-                    (int((p[0] - 50) * scale_x), int((p[1] - 100) * scale_y))
-                    for p in points
-                ]
-
-                # Draw on sprite
-                if any(0 <= p[0] < width and 0 <= p[1] < height for p in scaled_points):
-                    front_face = [scaled_points[0], scaled_points[1], scaled_points[2], scaled_points[3]]
-                    try:
-                        pygame.draw.polygon(sprite, box.color, front_face)
-                    except:
-                        pass
+        # Render from current angle: map the design area onto the sprite in one array step
+        visible_boxes = [box for box in self.boxes if box.visible]
+        points = project_boxes(visible_boxes, self.camera_distance)
+        scaled = ((points - (50, 100)) * (width / 800, height / 500)).astype(np.int64)
+
+        # Draw the front face of every box with a corner on the sprite
+        on_sprite = ((scaled[..., 0] >= 0) & (scaled[..., 0] < width) &
+                     (scaled[..., 1] >= 0) & (scaled[..., 1] < height)).any(axis=1)
+        front_faces = scaled[:, list(_FRONT_FACE_IDX)].tolist()
+        for box, front_face, draw in zip(visible_boxes, front_faces, on_sprite.tolist()):
+            if draw:
+                _fill_quad(sprite, box.color, front_face)
 
         return sprite
 
@@ -353,8 +441,8 @@ class CharacterDesigner:
         }
 
         filepath = os.path.join(designs_dir, f"{filename}.json")
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        with open(filepath, 'wb') as f:
+            f.write(dump_json(data))
 
         print(f"Design saved: {filepath}")
 
@@ -369,8 +457,8 @@ class CharacterDesigner:
         filepath = os.path.join(designs_dir, f"{filename}.json")
 
         if os.path.exists(filepath):
-            with open(filepath, 'r') as f:
-                data = json.load(f)
+            with open(filepath, 'rb') as f:
+                data = load_json(f.read())
 
             self.current_design_name = data['name']
             self.boxes = [Box3D.from_dict(box_data) for box_data in data['boxes']]
@@ -384,7 +472,10 @@ class CharacterDesigner:
 
     def get_list_of_designs(self) -> List[str]:
         """Get list of saved designs"""
-        designs_dir = "assets/designs"
-        if os.path.exists(designs_dir):
-            return [f[:-5] for f in os.listdir(designs_dir) if f.endswith('.json')]
-        return []
+        # One scandir pass; a missing folder just means nothing has been saved yet
+        try:
+            with os.scandir("assets/designs") as entries:
+                return [entry.name[:-5] for entry in entries
+                        if entry.name.endswith('.json') and entry.is_file()]
+        except FileNotFoundError:
+            return []
@@ -4,7 +4,9 @@ Provides smooth fading between game states
 """
 
 import pygame
+from typing import List, Optional, Tuple
 from config.settings import *
+from src.sprite_manager import to_display_format
 
 
 class ScreenTransition:
@@ -22,6 +24,8 @@ class ScreenTransition:
         self.is_active = False
         self.fade_out = False  # True for fade out, False for fade in
         self.overlay_color = COLOR_BLACK
+        self.overlay: Optional[pygame.Surface] = None  # Reused fade surface
+        self._overlay_color = None  # Color the overlay is currently filled with
 
     def start(self, fade_out: bool = True, color=None):
         """
@@ -58,6 +62,27 @@ class ScreenTransition:
 
         return False
 
+    def attach_overlay(self, overlay: pygame.Surface):
+        """
+        Give the transition a surface to draw its fade with
+
+        Args:
+            overlay: Surface the size of the screen
+        """
+        self.overlay = overlay
+        self._overlay_color = None
+
+    def detach_overlay(self) -> Optional[pygame.Surface]:
+        """
+        Take back the fade surface
+
+        Returns:
+            The attached surface, or None
+        """
+        overlay = self.overlay
+        self.overlay = None
+        return overlay
+
     def get_alpha(self) -> int:
         """
         Get current overlay alpha value (0-255)
@@ -84,23 +109,56 @@ class ScreenTransition:
         Args:
             surface: Surface to draw on
         """
-        if self.elapsed_ms == 0 and not self.fade_out:
-            # Full black at start of fade in
-            surface.fill(self.overlay_color)
-        elif self.is_active or (not self.fade_out and self.elapsed_ms < self.duration_ms):
-            overlay = pygame.Surface((surface.get_width(), surface.get_height()))
+        # Nothing to draw between transitions or while the fade is fully transparent
+        if not self.is_active:
+            return
+        alpha = self.get_alpha()
+        if alpha == 0:
+            return
+
+        # The start of a fade in is the overlay at alpha 255, no separate fill needed
+        if self.overlay is None or self.overlay.get_size() != surface.get_size():
+            self.attach_overlay(to_display_format(pygame.Surface(surface.get_size())))
+        overlay = self.overlay
+        if self._overlay_color != self.overlay_color:
             overlay.fill(self.overlay_color)
-            overlay.set_alpha(self.get_alpha())
-            surface.blit(overlay, (0, 0))
+            self._overlay_color = self.overlay_color
+        overlay.set_alpha(alpha)
+        surface.blit(overlay, (0, 0))
 
 
 class TransitionManager:
     """Manages multiple screen transitions"""
 
+    # Longest step a single update may advance transitions, so a stalled frame does not skip a fade
+    MAX_DELTA_MS = 100
+
     def __init__(self):
         """Initialize transition manager"""
         self.transitions = []
-        self.delta_clock = pygame.time.Clock()
+        self._last_ms = None  # Ticks at the previous update while transitions were running
+        self._surface_pool: List[pygame.Surface] = []  # Free fade surfaces, reused by new transitions
+
+    def _acquire_overlay(self, size: Tuple[int, int]) -> pygame.Surface:
+        """
+        Take a fade surface from the pool, allocating one only if none fits
+
+        Args:
+            size: Required surface size
+
+        Returns:
+            Surface of the given size
+        """
+        pool = self._surface_pool
+        for i, overlay in enumerate(pool):
+            if overlay.get_size() == size:
+                return pool.pop(i)
+        return to_display_format(pygame.Surface(size))
+
+    def _release_overlay(self, overlay: Optional[pygame.Surface]):
+        """Return a fade surface to the pool"""
+        if overlay is not None:
+            self._surface_pool.append(overlay)
 
     def create_level_transition(self, duration_ms: int = 800) -> ScreenTransition:
         """
@@ -116,19 +174,28 @@ class TransitionManager:
         self.transitions.append(transition)
         return transition
 
+    def clear_surface_pool(self):
+        """Drop pooled fade surfaces (e.g. after the display format changed)"""
+        self._surface_pool.clear()
+
     def update(self):
-        """Update all active transitions"""
-        completed = []
+        """Update all active transitions by the real time since the previous update"""
+        if not self.transitions:
+            self._last_ms = None  # Idle time must not count towards the next transition
+            return
 
-        for transition in self.transitions:
-            if transition.is_active:
-                delta_ms = 16  # ~60 FPS
-                if transition.update(delta_ms):
-                    completed.append(transition)
+        now = pygame.time.get_ticks()
+        delta_ms = 0 if self._last_ms is None else min(now - self._last_ms, self.MAX_DELTA_MS)
+        self._last_ms = now
 
-        # Remove completed transitions
-        for transition in completed:
-            self.transitions.remove(transition)
+        # Keep running transitions; completed ones give their surfaces back for the next ones
+        running = []
+        for transition in self.transitions:
+            if transition.is_active and transition.update(delta_ms):
+                self._release_overlay(transition.detach_overlay())
+            else:
+                running.append(transition)
+        self.transitions = running
 
     def draw(self, surface: pygame.Surface):
         """
@@ -137,7 +204,11 @@ class TransitionManager:
         Args:
             surface: Surface to draw on
         """
+        size = surface.get_size()
         for transition in self.transitions:
+            if transition.overlay is None or transition.overlay.get_size() != size:
+                self._release_overlay(transition.detach_overlay())
+                transition.attach_overlay(self._acquire_overlay(size))
             transition.draw(surface)
 
     def has_active_transitions(self) -> bool:
@@ -3,8 +3,28 @@ UI - User interface and HUD system
 """
 
 import pygame
+from typing import Dict, Tuple
 from config.settings import *
 
+# Default-font instances by point size, shared by every screen
+_FONT_CACHE: Dict[int, pygame.font.Font] = {}
+
+
+def get_font(size: int) -> pygame.font.Font:
+    """
+    Get the default font at a size, loading it only the first time
+
+    Args:
+        size: Font size in points
+
+    Returns:
+        Shared pygame.font.Font; callers must not change its style
+    """
+    font = _FONT_CACHE.get(size)
+    if font is None:
+        font = _FONT_CACHE[size] = pygame.font.Font(None, size)
+    return font
+
 
 class HUD:
     """Head-Up Display showing game information"""
@@ -19,11 +39,35 @@ class HUD:
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.font_large = pygame.font.Font(None, 48)
-        self.font_medium = pygame.font.Font(None, 36)
-        self.font_small = pygame.font.Font(None, 24)
+        self.font_large = get_font(48)
+        self.font_medium = get_font(36)
+        self.font_small = get_font(24)
         self.padding = 20
 
+        # Rendered HUD texts by slot: (value shown, surface); re-rendered only when the value changes
+        self._text_slots: Dict[str, Tuple[object, pygame.Surface]] = {}
+        self.fps_update_ms = 100  # The FPS readout changes at most 10 times per second
+        self._fps_last_update = -self.fps_update_ms
+
+    def _slot_text(self, slot: str, value, text: str, font: pygame.font.Font, color) -> pygame.Surface:
+        """
+        Get the rendered text for a HUD slot, rendering it only if its value changed
+
+        Args:
+            slot: Name of the HUD element
+            value: Value the text shows
+            text: Text to render
+            font: Font to render with
+            color: Text color
+
+        Returns:
+            Rendered text surface
+        """
+        cached = self._text_slots.get(slot)
+        if cached is None or cached[0] != value:
+            cached = self._text_slots[slot] = (value, font.render(text, True, color))
+        return cached[1]
+
     def draw(self, surface: pygame.Surface, player, level_number: int = 0, fps: float = 0):
         """
         Draw HUD elements
@@ -73,7 +117,8 @@ class HUD:
         pygame.draw.rect(surface, COLOR_WHITE, (bar_x, bar_y, bar_width, bar_height), 2)
 
         # Health text
-        health_text = self.font_small.render(f"Health: {player.health}/{max_health}", True, COLOR_WHITE)
+        health_text = self._slot_text('health', player.health, f"Health: {player.health}/{max_health}",
+                                      self.font_small, COLOR_WHITE)
         surface.blit(health_text, (bar_x + bar_width + 10, bar_y + 5))
 
     def draw_score(self, surface: pygame.Surface, player):
@@ -84,7 +129,7 @@ class HUD:
             surface: Pygame surface
             player: Player object
         """
-        score_text = self.font_medium.render(f"Score: {player.score}", True, COLOR_YELLOW)
+        score_text = self._slot_text('score', player.score, f"Score: {player.score}", self.font_medium, COLOR_YELLOW)
         score_rect = score_text.get_rect()
         score_rect.topright = (self.screen_width - self.padding, self.padding)
         surface.blit(score_text, score_rect)
@@ -97,7 +142,7 @@ class HUD:
             surface: Pygame surface
             level_number: Level number
         """
-        level_text = self.font_small.render(f"Level: {level_number + 1}", True, COLOR_CYAN)
+        level_text = self._slot_text('level', level_number, f"Level: {level_number + 1}", self.font_small, COLOR_CYAN)
         level_rect = level_text.get_rect()
         level_rect.topright = (self.screen_width - self.padding, self.padding + 40)
         surface.blit(level_text, level_rect)
@@ -110,7 +155,15 @@ class HUD:
             surface: Pygame surface
             fps: Current FPS
         """
-        fps_text = self.font_small.render(f"FPS: {int(fps)}", True, COLOR_WHITE)
+        # Keep showing the last value between updates
+        now = pygame.time.get_ticks()
+        cached = self._text_slots.get('fps')
+        if cached is None or now - self._fps_last_update >= self.fps_update_ms:
+            self._fps_last_update = now
+            value = int(fps)
+            fps_text = self._slot_text('fps', value, f"FPS: {value}", self.font_small, COLOR_WHITE)
+        else:
+            fps_text = cached[1]
         fps_rect = fps_text.get_rect()
         fps_rect.bottomright = (self.screen_width - self.padding, self.screen_height - self.padding)
         surface.blit(fps_text, fps_rect)
@@ -129,49 +182,55 @@ class Menu:
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.font_large = pygame.font.Font(None, 96)
-        self.font_medium = pygame.font.Font(None, 48)
-        self.font_small = pygame.font.Font(None, 32)
+        self.font_large = get_font(96)
+        self.font_medium = get_font(48)
+        self.font_small = get_font(32)
         self.buttons = []
         self.selected_button = 0
+        self._background = None  # Screen with the unselected buttons, built on first draw
         self.setup_buttons()
 
+    def invalidate(self):
+        """Rebuild the background on the next draw (e.g. after the display mode changed)"""
+        self._background = None
+
     def setup_buttons(self):
-        """Setup menu buttons"""
-        button_width = 300
-        button_height = 60
-        button_y_start = self.screen_height // 2 + 50
-
-        self.buttons = [
-            {
-                'text': 'Start Game',
-                'rect': pygame.Rect(self.screen_width // 2 - button_width // 2, button_y_start, button_width, button_height),
-                'action': 'start'
-            },
-            {
-                'text': 'Character Designer',
-                'rect': pygame.Rect(self.screen_width // 2 - button_width // 2, button_y_start + 100, button_width, button_height),
-                'action': 'designer'
-            },
-            {
-                'text': 'Block Editor',
-                'rect': pygame.Rect(self.screen_width // 2 - button_width // 2, button_y_start + 200, button_width, button_height),
-                'action': 'editor'
-            },
-            {
-                'text': 'Quit',
-                'rect': pygame.Rect(self.screen_width // 2 - button_width // 2, button_y_start + 300, button_width, button_height),
-                'action': 'quit'
-            }
-        ]
+        """Setup menu buttons, with their final rects and labels rendered once"""
+        self.invalidate()
+        button_width = 350
+        button_height = 70
+        button_x = self.screen_width // 2 - button_width // 2
+        button_y_start = 350
 
-    def draw(self, surface: pygame.Surface):
+        self.buttons = []
+        for i, (text, action) in enumerate((('Start Game', 'start'),
+                                            ('Character Designer', 'designer'),
+                                            ('Block Editor', 'editor'),
+                                            ('Quit', 'quit'))):
+            rect = pygame.Rect(button_x, button_y_start + i * 100, button_width, button_height)
+            label = self.font_medium.render(text, True, COLOR_WHITE)
+            selected_label = self.font_medium.render(text, True, COLOR_YELLOW)
+            self.buttons.append({
+                'text': text,
+                'rect': rect,
+                'action': action,
+                'label': label,
+                'label_rect': label.get_rect(center=rect.center),
+                'selected_label': selected_label,
+                'selected_label_rect': selected_label.get_rect(center=rect.center),
+            })
+
+    def _build_background(self, size):
         """
-        Draw menu
+        Render everything but the selection highlight once
 
         Args:
-            surface: Pygame surface to draw on
+            size: (width, height) of the target surface
         """
+        surface = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+
         # Draw background with gradient-like effect
         surface.fill(COLOR_DARK_GRAY)
 
@@ -188,28 +247,31 @@ class Menu:
         subtitle_rect = subtitle_text.get_rect(center=(self.screen_width // 2, 250))
         surface.blit(subtitle_text, subtitle_rect)
 
-        # Draw buttons with better spacing
-        button_width = 350
-        button_height = 70
-        button_x = self.screen_width // 2 - button_width // 2
-        button_y_start = 350
+        # Draw the buttons unselected; rects and labels come from setup_buttons
+        for button in self.buttons:
+            pygame.draw.rect(surface, (50, 50, 50), button['rect'])
+            pygame.draw.rect(surface, COLOR_WHITE, button['rect'], 3)
+            surface.blit(button['label'], button['label_rect'])
 
-        for i, button in enumerate(self.buttons):
-            button_y = button_y_start + (i * 100)
-            button_rect = pygame.Rect(button_x, button_y, button_width, button_height)
-            button['rect'] = button_rect
+        self._background = surface
 
-            button_color = COLOR_YELLOW if i == self.selected_button else COLOR_WHITE
-            button_bg_color = (100, 100, 0) if i == self.selected_button else (50, 50, 50)
+    def draw(self, surface: pygame.Surface):
+        """
+        Draw menu
 
-            # Button background
-            pygame.draw.rect(surface, button_bg_color, button_rect)
-            pygame.draw.rect(surface, button_color, button_rect, 3)
+        Args:
+            surface: Pygame surface to draw on
+        """
+        if self._background is None or self._background.get_size() != surface.get_size():
+            self._build_background(surface.get_size())
+        surface.blit(self._background, (0, 0))
 
-            # Button text
-            button_text = self.font_medium.render(button['text'], True, button_color)
-            button_text_rect = button_text.get_rect(center=button_rect.center)
-            surface.blit(button_text, button_text_rect)
+        # Only the selected button differs from the background
+        if 0 <= self.selected_button < len(self.buttons):
+            button = self.buttons[self.selected_button]
+            pygame.draw.rect(surface, (100, 100, 0), button['rect'])
+            pygame.draw.rect(surface, COLOR_YELLOW, button['rect'], 3)
+            surface.blit(button['selected_label'], button['selected_label_rect'])
 
     def handle_input(self, keys):
         """
@@ -262,31 +324,43 @@ class PauseMenu:
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.font_large = pygame.font.Font(None, 72)
-        self.font_medium = pygame.font.Font(None, 48)
+        self.font_large = get_font(72)
+        self.font_medium = get_font(48)
+        self._blits = None  # Overlay and texts, built on first draw
 
-    def draw(self, surface: pygame.Surface):
-        """
-        Draw pause menu
+    def invalidate(self):
+        """Rebuild the overlay and texts on the next draw (e.g. after the display mode changed)"""
+        self._blits = None
 
-        Args:
-            surface: Pygame surface to draw on
-        """
+    def _build_blits(self):
+        """Render the overlay and texts once"""
         # Semi-transparent overlay
         overlay = pygame.Surface((self.screen_width, self.screen_height))
+        if pygame.display.get_surface() is not None:
+            overlay = overlay.convert()
         overlay.set_alpha(200)
         overlay.fill(COLOR_BLACK)
-        surface.blit(overlay, (0, 0))
 
         # Pause text
         pause_text = self.font_large.render("PAUSED", True, COLOR_YELLOW)
         pause_rect = pause_text.get_rect(center=(self.screen_width // 2, self.screen_height // 2 - 100))
-        surface.blit(pause_text, pause_rect)
 
         # Resume instructions
         resume_text = self.font_medium.render("Press P or ESC to Resume", True, COLOR_WHITE)
         resume_rect = resume_text.get_rect(center=(self.screen_width // 2, self.screen_height // 2 + 50))
-        surface.blit(resume_text, resume_rect)
+
+        self._blits = [(overlay, (0, 0)), (pause_text, pause_rect), (resume_text, resume_rect)]
+
+    def draw(self, surface: pygame.Surface):
+        """
+        Draw pause menu
+
+        Args:
+            surface: Pygame surface to draw on
+        """
+        if self._blits is None:
+            self._build_blits()
+        surface.blits(self._blits, doreturn=False)
 
 
 class BackstoryScreen:
@@ -302,9 +376,9 @@ class BackstoryScreen:
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.font_large = pygame.font.Font(None, 48)
-        self.font_medium = pygame.font.Font(None, 36)
-        self.font_small = pygame.font.Font(None, 24)
+        self.font_large = get_font(48)
+        self.font_medium = get_font(36)
+        self.font_small = get_font(24)
         self.text_lines = BACKSTORY_TEXT
         self.current_line = 0
         self.char_index = 0